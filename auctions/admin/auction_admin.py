@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from ..models.auction_document_model import AuctionDocument
-from .base_admin import BaseModelAdmin
+from .base_admin import BaseModelAdmin, FoldedSearchMixin
 
 class AuctionDocumentInline(admin.TabularInline):
     model = AuctionDocument.auctions.through
@@ -22,7 +22,7 @@ class AuctionDocumentInline(admin.TabularInline):
         return ""
     get_file.short_description = _("File")
 
-class AuctionAdmin(BaseModelAdmin):
+class AuctionAdmin(FoldedSearchMixin, BaseModelAdmin):
     list_display = ('title', 'sale_number', 'is_active', 'starting_price', 
                     'start_time', 
                    'category')
@@ -30,8 +30,6 @@ class AuctionAdmin(BaseModelAdmin):
     list_filter = ('category', 'location', 'publication_date', 
                   'start_time', 'end_time')
     
-    search_fields = BaseModelAdmin.search_fields + ('code',)
-    
     readonly_fields = BaseModelAdmin.readonly_fields + ('code', 'url')
     filter_horizontal = ('tags',)
     date_hierarchy = 'publication_date'
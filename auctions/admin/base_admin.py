@@ -1,6 +1,7 @@
 # auctions/admin/base_admin.py
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+from ..utils.content_utils import SerbianTextConverter
 
 class BaseModelAdmin(admin.ModelAdmin):
     fieldsets = (
@@ -28,3 +29,12 @@ class BaseModelAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title_lat',)}    
     list_display = ('title_sr', 'title_lat', 'updated_at', 'slug')
     search_fields = ('title_sr', 'title_lat', 'description_sr', 'description_lat')
+
+class FoldedSearchMixin:
+    """Admin search on the folded search_text column: one lookup per word, in any script"""
+    search_fields = ('search_text',)
+
+    def get_search_results(self, request, queryset, search_term):
+        for term in SerbianTextConverter.fold(search_term).split():
+            queryset = queryset.filter(search_text__contains=term)
+        return queryset, False
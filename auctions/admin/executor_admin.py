@@ -1,7 +1,7 @@
 # auctions/admin/executor_admin.py
 from django.contrib import admin
+from .base_admin import FoldedSearchMixin
 
-class ExecutorAdmin(admin.ModelAdmin):
+class ExecutorAdmin(FoldedSearchMixin, admin.ModelAdmin):
     list_display = ('title', 'slug')
-    search_fields = ('title',)
     readonly_fields = ('slug',)
\ No newline at end of file
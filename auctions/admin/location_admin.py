@@ -1,8 +1,8 @@
 # auctions/admin/location_admin.py
 from django.contrib import admin
+from .base_admin import FoldedSearchMixin
 
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(FoldedSearchMixin, admin.ModelAdmin):
     list_display = ('municipality', 'city', 'cadastral_municipality', 'slug')
-    search_fields = ('municipality', 'city', 'cadastral_municipality')
     list_filter = ('municipality', 'city')
     readonly_fields = ('slug',)
\ No newline at end of file
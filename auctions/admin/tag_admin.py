@@ -1,7 +1,7 @@
 # auctions/admin/tag_admin.py
 from django.contrib import admin
+from .base_admin import FoldedSearchMixin
 
-class TagAdmin(admin.ModelAdmin):
+class TagAdmin(FoldedSearchMixin, admin.ModelAdmin):
     list_display = ('title', 'slug')
-    search_fields = ('titles',)
     readonly_fields = ('slug',)
\ No newline at end of file
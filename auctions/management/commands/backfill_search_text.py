@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from auctions.models import Auction, AuctionDocument, Executor, Location, Tag
+from auctions.utils.cache_utils import PageCache
+from auctions.utils.search_utils import backfill_search_text
+
+
+class Command(BaseCommand):
+    help = 'Fills the folded search text of auctions, documents, locations, executors and tags'
+
+    MODELS = (Auction, AuctionDocument, Location, Executor, Tag)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows read and updated per query (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for model in self.MODELS:
+            updated = backfill_search_text(model, batch_size=max(options['batch_size'], 1))
+            total += updated
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {updated} updated")
+        if total:
+            PageCache.invalidate('auction', 'document', 'location', 'executor', 'tag')
+        self.stdout.write(self.style.SUCCESS(f"Search text updated on {total} rows"))
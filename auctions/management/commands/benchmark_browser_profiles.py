@@ -0,0 +1,146 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from auctions.utils.metrics_utils import RunMetrics
+from auctions.utils.scraper_utils import BrowserProfile, PageReadiness
+
+
+class Command(BaseCommand):
+    help = 'Compares bytes transferred and page-ready latency of the scraper browser profiles'
+
+    # Page and the element that marks it ready for extraction
+    TARGETS = {
+        'auctions': ("https://eaukcija.sud.rs/#/?stranica=1", By.CLASS_NAME, "auction-list-item"),
+        'auction': ("https://eaukcija.sud.rs/#/aukcije/{code}", By.CLASS_NAME, "auction-info"),
+        'katastar': (
+            "https://katastar.rgz.gov.rs/eKatastarPublic/PublicAccess.aspx",
+            By.ID, "ContentPlaceHolder1_getOpstinaKO_dropOpstina",
+        ),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=3,
+            help='Cold page loads per target and profile (default: 3)'
+        )
+        parser.add_argument(
+            '--target',
+            action='append',
+            choices=list(self.TARGETS),
+            help='Page to load; may be repeated (default: auctions and katastar)'
+        )
+        parser.add_argument(
+            '--auction-code',
+            help='Auction code used for the auction target'
+        )
+        parser.add_argument(
+            '--no-headless',
+            action='store_true',
+            help='Run Chrome in visible mode (default: headless)'
+        )
+        parser.add_argument(
+            '--report',
+            metavar='PATH',
+            help='Write the measurements of every profile as JSON'
+        )
+
+    def transferred(self, performance_log):
+        """Sum encoded bytes and count requests from Chrome's performance log."""
+        stats = {'bytes': 0, 'requests': 0, 'blocked': 0}
+        for entry in performance_log:
+            message = json.loads(entry['message'])['message']
+            method = message.get('method')
+            if method == 'Network.loadingFinished':
+                stats['bytes'] += message['params'].get('encodedDataLength', 0)
+            elif method == 'Network.requestWillBeSent':
+                stats['requests'] += 1
+            elif method == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+                stats['blocked'] += 1
+        return stats
+
+    def load(self, driver, readiness, url, by, selector):
+        """Load url with an empty cache; returns the seconds until the page is ready."""
+        driver.get("about:blank")
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        driver.get_log('performance')
+        started = time.perf_counter()
+        driver.get(url)
+        readiness.element(driver, 'ready', by, selector, timeout=30)
+        readiness.settle(driver)
+        return time.perf_counter() - started
+
+    def benchmark(self, profile_name, targets, runs, headless):
+        metrics = RunMetrics(f'browser_profile_{profile_name}')
+        readiness = PageReadiness()
+        profile = BrowserProfile(
+            profile_name,
+            headless=headless,
+            arguments=["--disable-gpu", "--no-sandbox"],
+            performance_log=True,
+        )
+        driver = profile.start()
+        PageReadiness.install(driver)
+        try:
+            for target, (url, by, selector) in targets.items():
+                for run in range(1, runs + 1):
+                    try:
+                        latency = self.load(driver, readiness, url, by, selector)
+                    except (TimeoutException, WebDriverException) as e:
+                        self.stdout.write(self.style.WARNING(f"{profile_name} {target} run {run} failed: {str(e)}"))
+                        metrics.increment(f'{target}_failures')
+                        continue
+                    stats = self.transferred(driver.get_log('performance'))
+                    metrics.stages.record(target, latency)
+                    metrics.observe(f'{target}_bytes', stats['bytes'])
+                    metrics.observe(f'{target}_requests', stats['requests'])
+                    metrics.observe(f'{target}_blocked', stats['blocked'])
+                    self.stdout.write(
+                        f"{profile_name} {target} run {run}: ready in {latency:.2f}s, "
+                        f"{stats['bytes'] / 1024:.0f} KB in {stats['requests']} requests, {stats['blocked']} blocked"
+                    )
+        finally:
+            driver.quit()
+            metrics.finish()
+        return metrics
+
+    def handle(self, *args, **options):
+        names = options['target'] or ['auctions', 'katastar']
+        targets = {}
+        for name in names:
+            url, by, selector = self.TARGETS[name]
+            if name == 'auction':
+                if not options['auction_code']:
+                    self.stdout.write(self.style.WARNING("Skipping auction target: no --auction-code given"))
+                    continue
+                url = url.format(code=options['auction_code'])
+            targets[name] = (url, by, selector)
+
+        results = {
+            profile_name: self.benchmark(profile_name, targets, max(options['runs'], 1), not options['no_headless'])
+            for profile_name in BrowserProfile.CHOICES
+        }
+
+        self.stdout.write("\nProfile comparison:")
+        for target in targets:
+            for profile_name, metrics in results.items():
+                latency = metrics.stages.summary().get(target)
+                samples = metrics.samples.summary()
+                if not latency:
+                    self.stdout.write(f"  {target} [{profile_name}]: no successful runs")
+                    continue
+                self.stdout.write(
+                    f"  {target} [{profile_name}]: ready p50 {latency['p50']:.2f}s, p95 {latency['p95']:.2f}s, "
+                    f"{samples[f'{target}_bytes']['avg'] / 1024:.0f} KB, "
+                    f"{samples[f'{target}_requests']['avg']:.0f} requests"
+                )
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump({name: metrics.report() for name, metrics in results.items()}, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Benchmark report written to {options['report']}"))
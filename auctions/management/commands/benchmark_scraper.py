@@ -0,0 +1,128 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from auctions.utils.metrics_utils import PeakMemory
+from auctions.utils.replay_utils import ReplayCorpus, ReplayServer, scratch_database
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks scrape_auctions end to end against a recorded corpus served locally'
+
+    # scrape_auctions options of each benchmarked mode
+    MODES = {
+        'serial': {'engine': 'selenium', 'workers': 1},
+        'parallel': {'engine': 'selenium'},
+        'http': {'engine': 'http'},
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--corpus',
+            required=True,
+            help='Directory written by record_scrape_corpus'
+        )
+        parser.add_argument(
+            '--mode',
+            action='append',
+            choices=list(self.MODES),
+            help='Mode to benchmark; may be repeated (default: serial, parallel and http)'
+        )
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=2,
+            help='Number of listing pages to scrape (default: 2)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Concurrency of the parallel and http modes (default: 4)'
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.05,
+            help='Seconds added to every replayed response to model the remote site (default: 0.05)'
+        )
+        parser.add_argument(
+            '--report',
+            metavar='PATH',
+            help='Write the results of every mode as JSON'
+        )
+        parser.add_argument(
+            '--show-output',
+            action='store_true',
+            help='Print the output of the scraper runs'
+        )
+
+    def run_mode(self, mode, server, options, report_dir):
+        report_path = Path(report_dir) / f"{mode}.json"
+        scrape_options = {'workers': options['workers'], 'rate': 0, **self.MODES[mode]}
+        output = self.stdout if options['show_output'] else StringIO()
+
+        call_command('flush', interactive=False, verbosity=0)
+        misses_before = server.counts['misses']
+        with PeakMemory() as memory:
+            call_command(
+                'scrape_auctions',
+                base_url=server.url,
+                pages=options['pages'],
+                report=str(report_path),
+                stdout=output,
+                **scrape_options,
+            )
+
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+        counters = report['counters']
+        saved = sum(counters.get(f'auctions_{outcome}', 0) for outcome in ('created', 'updated', 'unchanged'))
+        duration = report['duration_seconds']
+        auction_latency = report['stages'].get('auction', {})
+        return {
+            'mode': mode,
+            **scrape_options,
+            'auctions': saved,
+            'seconds': duration,
+            'auctions_per_second': saved / duration if duration else 0,
+            'queries_per_auction': counters.get('db_queries', 0) / saved if saved else 0,
+            'auction_latency_p50': auction_latency.get('p50'),
+            'auction_latency_p95': auction_latency.get('p95'),
+            'peak_rss_mb': memory.peak / (1024 * 1024),
+            'replay_misses': server.counts['misses'] - misses_before,
+            'webdriver_restarts': counters.get('webdriver_restarts', 0),
+        }
+
+    def handle(self, *args, **options):
+        corpus = ReplayCorpus(options['corpus'])
+        if not len(corpus):
+            raise CommandError(f"No recorded responses in {options['corpus']}, run record_scrape_corpus first")
+
+        results = []
+        with scratch_database(), ReplayServer(corpus, latency=options['latency']) as server, \
+                tempfile.TemporaryDirectory() as report_dir:
+            self.stdout.write(f"Replaying {len(corpus)} recorded responses from {server.url}")
+            for mode in options['mode'] or list(self.MODES):
+                self.stdout.write(f"Running {mode}...")
+                result = self.run_mode(mode, server, options, report_dir)
+                results.append(result)
+                self.stdout.write(self.style.SUCCESS(
+                    f"{mode}: {result['auctions']} auctions in {result['seconds']:.1f}s "
+                    f"({result['auctions_per_second']:.2f}/s), "
+                    f"{result['queries_per_auction']:.1f} queries per auction, "
+                    f"peak RSS {result['peak_rss_mb']:.0f} MB"
+                ))
+                if result['replay_misses']:
+                    self.stdout.write(self.style.WARNING(
+                        f"{mode}: {result['replay_misses']} requests were not in the corpus"
+                    ))
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Benchmark report written to {options['report']}"))
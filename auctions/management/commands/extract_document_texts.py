@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from auctions.utils.document_utils import DocumentTextExtractor
+
+
+class Command(BaseCommand):
+    help = 'Extracts the text of downloaded auction documents for the auction search'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Number of processes parsing PDFs at once (default: 2)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of files extracted and saved per batch (default: 50)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Extract every document again, even when its text is up to date'
+        )
+
+    def handle(self, *args, **options):
+        extractor = DocumentTextExtractor(
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            force=options['force'],
+            log=self.stdout.write,
+        )
+        counts = extractor.run()
+        if counts['failed']:
+            self.stdout.write(self.style.WARNING(f"Could not extract {counts['failed']} files"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Document texts updated: {counts['extracted']} extracted, {counts['cached']} reused from identical files"
+        ))
@@ -0,0 +1,85 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auctions.utils.katastar_utils import KatastarImporter, KatastarResolver
+
+
+class Command(BaseCommand):
+    help = 'Imports a scrape_katastar snapshot into the municipality and cadastral municipality tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default='katastar_data.json',
+            help='Snapshot written by scrape_katastar (default: katastar_data.json)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Municipalities written per batch (default: 50)'
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Delete stored rows that are missing from the snapshot'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report the differences without changing the database'
+        )
+        parser.add_argument(
+            '--report',
+            metavar='PATH',
+            help='Write the diff against the stored rows as JSON'
+        )
+
+    @staticmethod
+    def format_value(value):
+        # Cadastral municipalities are keyed by the municipality and their own code
+        return '/'.join(value) if isinstance(value, (list, tuple)) else value
+
+    def write_diff(self, label, diff):
+        self.stdout.write(
+            f"{label}: {len(diff['added'])} added, {len(diff['renamed'])} renamed, "
+            f"{len(diff['removed'])} removed, {diff['unchanged']} unchanged"
+        )
+        if self.verbosity >= 2:
+            for entry in diff['added']:
+                self.stdout.write(f"  + {self.format_value(entry['value'])} {entry['name']}")
+            for entry in diff['renamed']:
+                self.stdout.write(f"  ~ {self.format_value(entry['value'])} {entry['old_name']} -> {entry['name']}")
+            for entry in diff['removed']:
+                self.stdout.write(f"  - {self.format_value(entry['value'])} {entry['name']}")
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        importer = KatastarImporter(
+            batch_size=options['batch_size'],
+            prune=options['prune'],
+            log=(lambda message: self.stdout.write(message)) if self.verbosity >= 2 else None,
+        )
+        try:
+            diff = importer.run(options['path'], dry_run=options['dry_run'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not import {options['path']}: {e}")
+
+        self.write_diff('Municipalities', diff['municipalities'])
+        self.write_diff('Cadastral municipalities', diff['cadastral_municipalities'])
+        removed = diff['municipalities']['removed'] or diff['cadastral_municipalities']['removed']
+        if removed and not options['prune']:
+            self.stdout.write(self.style.WARNING("Rows missing from the snapshot were kept, use --prune to delete them"))
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(diff, f, ensure_ascii=False, indent=2)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING("Dry run, no changes were saved"))
+            return
+
+        linked = KatastarResolver.link_locations()
+        self.stdout.write(self.style.SUCCESS(f"Katastar data imported, {linked} locations linked"))
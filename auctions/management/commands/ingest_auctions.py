@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from auctions.utils.metrics_utils import RunMetrics
+from auctions.utils.persistence_utils import AuctionBulkWriter, LookupCache
+from auctions.utils.stream_utils import iter_records
+
+
+class Command(BaseCommand):
+    help = 'Loads auctions streamed by scrape_auctions --output=jsonl into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='+',
+            metavar='PATH',
+            help='JSONL files to ingest, plain or gzip compressed; - reads stdin'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of auctions written to the database per transaction (default: 50)'
+        )
+        parser.add_argument(
+            '--skip-unchanged',
+            action='store_true',
+            help='Skip auctions whose content fingerprint matches the stored one'
+        )
+        parser.add_argument(
+            '--warm-cache',
+            action='store_true',
+            help='Preload all categories, executors, locations and tags into the lookup cache'
+        )
+        parser.add_argument(
+            '--report',
+            metavar='PATH',
+            help='Write a JSON run report with stage timings and counters'
+        )
+
+    def save_one(self, details):
+        """Writer fallback: write a record of a failed batch on its own."""
+        created = self.single.counts['created']
+        if not self.single.write_batch([details]):
+            raise ValueError("Record has no code or title")
+        return self.single.counts['created'] > created
+
+    def log_invalid(self, path, number, error):
+        self.invalid += 1
+        self.stdout.write(self.style.WARNING(f"{path}:{number}: skipping invalid record: {str(error)}"))
+
+    def handle(self, *args, **options):
+        metrics = RunMetrics('ingest_auctions')
+        cache = LookupCache()
+        if options['warm_cache']:
+            cache.warm()
+        self.single = AuctionBulkWriter(batch_size=1, cache=cache, skip_unchanged=options['skip_unchanged'])
+        writer = AuctionBulkWriter(
+            batch_size=max(options['batch_size'], 1),
+            cache=cache,
+            skip_unchanged=options['skip_unchanged'],
+            fallback=self.save_one,
+            log=lambda message: self.stdout.write(self.style.WARNING(message)),
+            metrics=metrics,
+        )
+        self.invalid = 0
+
+        for path in options['paths']:
+            read = 0
+            try:
+                for number, details in iter_records(
+                    path, on_error=lambda number, error: self.log_invalid(path, number, error)
+                ):
+                    writer.add(details)
+                    read += 1
+            except (OSError, EOFError, UnicodeDecodeError) as e:
+                writer.flush()
+                raise CommandError(f"Could not read {path}: {e}")
+            writer.flush()
+            metrics.increment('records_read', read)
+            self.stdout.write(f"{path}: {read} records")
+
+        counts = writer.counts
+        for outcome, count in counts.items():
+            metrics.increment(f'auctions_{outcome}', count)
+        metrics.increment('records_invalid', self.invalid)
+        metrics.finish()
+        if options['report']:
+            metrics.write_report(options['report'])
+
+        if counts['failed'] or self.invalid:
+            self.stdout.write(self.style.WARNING(
+                f"Failed to save {counts['failed']} auctions, {self.invalid} lines could not be decoded"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingest completed: {counts['created']} created, {counts['updated']} updated, "
+            f"{counts['unchanged']} unchanged"
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from auctions.utils.search_utils import AuctionSearch
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the auction search index from the auction and document tables'
+
+    def handle(self, *args, **options):
+        if AuctionSearch.rebuild():
+            self.stdout.write(self.style.SUCCESS("Search index rebuilt"))
+        else:
+            self.stdout.write(self.style.SUCCESS("The search index is maintained by the database, nothing to rebuild"))
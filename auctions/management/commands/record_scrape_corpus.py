@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from auctions.utils.replay_utils import ReplayCorpus, ReplayServer, scratch_database
+
+
+class Command(BaseCommand):
+    help = 'Records the pages and API responses of a scrape into a local corpus for offline replay'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--corpus',
+            required=True,
+            help='Directory the recorded responses are written to'
+        )
+        parser.add_argument(
+            '--upstream',
+            default='https://eaukcija.sud.rs',
+            help='Site to record (default: https://eaukcija.sud.rs)'
+        )
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=2,
+            help='Number of listing pages to record (default: 2)'
+        )
+        parser.add_argument(
+            '--engine',
+            action='append',
+            choices=['selenium', 'http'],
+            help='Scrape with this engine while recording; may be repeated (default: both)'
+        )
+        parser.add_argument(
+            '--no-headless',
+            action='store_true',
+            help='Run Chrome in visible mode (default: headless)'
+        )
+
+    def handle(self, *args, **options):
+        corpus = ReplayCorpus(options['corpus'])
+        engines = options['engine'] or ['selenium', 'http']
+
+        # Scrape into a throwaway database: only the HTTP traffic is kept
+        with scratch_database(), ReplayServer(corpus, upstream=options['upstream'], record=True) as server:
+            self.stdout.write(f"Recording {options['upstream']} through {server.url}")
+            for engine in engines:
+                output = StringIO()
+                call_command(
+                    'scrape_auctions',
+                    base_url=server.url,
+                    pages=options['pages'],
+                    engine=engine,
+                    no_headless=options['no_headless'],
+                    stdout=output,
+                )
+                self.stdout.write(
+                    f"{engine}: {server.counts['recorded']} responses recorded, "
+                    f"{server.counts['hits']} served from the corpus"
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Corpus of {len(corpus)} responses saved to {options['corpus']}"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from auctions.utils.refresh_utils import AuctionRefreshScheduler
+
+
+class Command(BaseCommand):
+    help = 'Runs one pass of the auction refresh scheduler, re-fetching the most urgent auctions within the budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--budget',
+            type=int,
+            help='Page fetches allowed per hour (default: AUCTION_REFRESH_BUDGET_PER_HOUR)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            help='Seconds between passes, which sets the share of the budget per pass (default: AUCTION_REFRESH_INTERVAL)'
+        )
+
+    def handle(self, *args, **options):
+        scheduler = AuctionRefreshScheduler(
+            budget_per_hour=options['budget'],
+            interval=options['interval'],
+            log=self.stdout.write,
+        )
+        counts = scheduler.run()
+        self.stdout.write(self.style.SUCCESS(
+            f"Refresh pass done: {counts['refreshed']} refreshed, {counts['failed']} failed, "
+            f"{counts['scheduled']} newly scheduled"
+        ))
@@ -1,4 +1,5 @@
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from auctions.models import (
     Auction,
@@ -6,22 +7,78 @@ from auctions.models import (
     Tag,
     Executor,
     Location,
-    AuctionDocument
+    AuctionDocument,
+    CrawlState
 )
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from django.db import connection
 from datetime import datetime
-import time
+import threading
 from django.utils import timezone
+from ...utils.checkpoint_utils import ScrapeCheckpoint
+from ...utils.concurrency_utils import AsyncDetailScraper, TokenBucket, call_with_retry
 from ...utils.content_utils import SerbianTextConverter
+from ...utils.document_utils import DocumentFetcher
+from ...utils.metrics_utils import RunMetrics
+from ...utils.persistence_utils import AuctionBulkWriter, LookupCache
+from ...utils.stream_utils import AuctionJsonlWriter
+from ...utils.scraper_utils import (
+    AuctionApiClient,
+    BrowserProfile,
+    LazyWebDriver,
+    ListingTracker,
+    PageReadiness,
+    ScraperError,
+    details_fingerprint,
+)
 
 class Command(BaseCommand):
     help = 'Scrapes auction data from eaukcija.sud.rs and populates the database'
+    CRAWL_NAME = 'scrape_auctions'
+    SITE_URL = "https://eaukcija.sud.rs"
+
+    # Tabs read from their info-label-row lines and from their category-name entries
+    ROW_TABS = ("Детаљи", "Локација")
+    NAME_TABS = ("Категорија", "Тагови", "Јавни извршитељ", "Документи")
+
+    # Collects the text of every field on an auction page in one round trip.
+    # Hidden panes are shown for the read so innerText keeps the line breaks
+    # WebElement.text would return.
+    EXTRACT_SCRIPT = """
+        var text = function (el) { return el ? el.innerText : ''; };
+        var first = function (root, cls) { return root.getElementsByClassName(cls)[0]; };
+        var all = function (root, cls) {
+            return Array.prototype.map.call(root.getElementsByClassName(cls), text);
+        };
+        var nav = first(document, 'ant-tabs-nav');
+        var tabs = nav ? nav.getElementsByClassName('ant-tabs-tab') : [];
+        var panes = document.getElementsByClassName('ant-tabs-tabpane');
+        var result = {
+            code: text(first(document, 'auction-list-item__code')),
+            status: text(first(document, 'auction-list-item__status')),
+            title: text(first(document, 'auction-item-title')),
+            stateLines: all(document, 'auction-state-info__line'),
+            tabs: []
+        };
+        for (var i = 0; i < tabs.length; i++) {
+            var pane = panes[i];
+            var entry = {name: text(tabs[i]), rendered: !!(pane && pane.childElementCount), rows: [], names: [], links: []};
+            if (entry.rendered) {
+                var display = pane.style.display;
+                pane.style.display = 'block';
+                entry.rows = all(pane, 'info-label-row');
+                entry.names = all(pane, 'category-name');
+                entry.links = Array.prototype.map.call(pane.querySelectorAll('a[href]'), function (a) {
+                    return [text(a), a.href];
+                });
+                pane.style.display = display;
+            }
+            result.tabs.push(entry);
+        }
+        return result;
+    """
 
     def add_arguments(self, parser):
         # Create a mutually exclusive group for pages
@@ -42,6 +99,116 @@ class Command(BaseCommand):
             action='store_true',
             help='Run Chrome in visible mode (default: headless)'
         )
+        parser.add_argument(
+            '--base-url',
+            default=self.SITE_URL,
+            help='Fetch pages from this address instead of the live site, e.g. a local replay server'
+        )
+        parser.add_argument(
+            '--browser-profile',
+            choices=BrowserProfile.CHOICES,
+            default='full',
+            help='lean blocks images, fonts and analytics, uses a small viewport and eager page loads (default: full)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of auctions fetched concurrently, each with its own browser session when rendering (default: 1)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=2.0,
+            help='Maximum requests per second sent to the site, 0 for no limit (default: 2)'
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=3,
+            help='Attempts per auction before giving up, with jittered backoff between them (default: 3)'
+        )
+        # The JSON API is not confirmed against the live site, so the http engine
+        # is only offered once AUCTION_API_ENABLED is set; record_scrape_corpus
+        # still runs it to record the API for checking
+        parser.add_argument(
+            '--engine',
+            choices=['selenium', 'http'] if settings.AUCTION_API_ENABLED else ['selenium'],
+            default='selenium',
+            help='Fetch auctions by rendering pages in Chrome or, with AUCTION_API_ENABLED, '
+                 'from the JSON API with browser fallback (default: selenium)'
+        )
+        parser.add_argument(
+            '--extraction',
+            choices=['script', 'webdriver'],
+            default='script',
+            help='Read an auction page with one injected script or element by element (default: script)'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Stop paging at already known auctions and skip saving auctions whose content has not changed'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue the last interrupted crawl from its checkpoint'
+        )
+        parser.add_argument(
+            '--drift-check',
+            action='store_true',
+            help='Re-read the previous listing page after every page, not only when the listing is seen to shift'
+        )
+        parser.add_argument(
+            '--warm-cache',
+            action='store_true',
+            help='Preload all categories, executors, locations and tags into the lookup cache'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of auctions written to the database per transaction (default: 50)'
+        )
+        parser.add_argument(
+            '--documents',
+            action='store_true',
+            help='Download the PDF documents of the saved auctions; unchanged files are skipped'
+        )
+        parser.add_argument(
+            '--document-workers',
+            type=int,
+            default=4,
+            help='Number of documents downloaded concurrently (default: 4)'
+        )
+        parser.add_argument(
+            '--output',
+            choices=['db', 'jsonl'],
+            default='db',
+            help='Save auctions to the database or stream them as JSON lines for ingest_auctions (default: db)'
+        )
+        parser.add_argument(
+            '--output-file',
+            default='auctions.jsonl',
+            help='File the jsonl output is written to, gzip compressed with a .gz suffix (default: auctions.jsonl)'
+        )
+        parser.add_argument(
+            '--wait-timeout',
+            action='append',
+            default=[],
+            metavar='STAGE=SECONDS',
+            help='Override the timeout of a readiness stage (detail, element, listing, tab, settle); may be repeated'
+        )
+        parser.add_argument(
+            '--report',
+            metavar='PATH',
+            help='Write a JSON run report with stage timings, latency percentiles and counters'
+        )
+        parser.add_argument(
+            '--metrics',
+            metavar='PATH',
+            help='Write the run metrics in Prometheus text format (e.g. for the node_exporter textfile collector)'
+        )
 
     def get_total_pages(self, driver):
         """
@@ -49,7 +216,7 @@ class Command(BaseCommand):
         """
         try:
             # Wait for pagination to load
-            pagination = self.wait_for_element_load(driver, By.CLASS_NAME, "ant-pagination", timeout=10)
+            pagination = self.wait_for_element_load(driver, By.CLASS_NAME, "ant-pagination", stage='listing')
             # Find all pagination items
             page_items = pagination.find_elements(By.CLASS_NAME, "ant-pagination-item")
             if page_items:
@@ -62,18 +229,23 @@ class Command(BaseCommand):
             return 1
 
     def setup_webdriver(self, no_headless=False):
-        service = Service("/usr/bin/chromedriver")
-        options = Options()
-        if not no_headless:  # Run headless by default
-            options.add_argument("--headless")
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.maximize_window()
+        # Run headless by default
+        driver = BrowserProfile(self.browser_profile, headless=not no_headless).start()
+        PageReadiness.install(driver)
         return driver
 
-    def wait_for_element_load(self, driver, by, selector, timeout=10):
-        return WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((by, selector))
-        )
+    def parse_wait_timeouts(self, values):
+        timeouts = {}
+        for value in values:
+            stage, _, seconds = value.partition('=')
+            try:
+                timeouts[stage.strip()] = float(seconds)
+            except ValueError:
+                raise CommandError(f"Invalid --wait-timeout value: {value}")
+        return timeouts
+
+    def wait_for_element_load(self, driver, by, selector, timeout=None, stage='element'):
+        return self.readiness.element(driver, stage, by, selector, timeout)
 
     def wait_for_url_change(self, driver, old_url):
         def url_changed(driver):
@@ -120,6 +292,25 @@ class Command(BaseCommand):
         return docs
 
 
+    def get_cached_or_create(self, model, lookup, defaults):
+        """
+        Resolve a lookup row through the run's identity cache. The database is
+        only queried on a cache miss and a slug is only generated when the row
+        does not exist yet.
+        """
+        key = tuple(lookup.values())
+        obj = self.lookup_cache.get(model, key)
+        if obj is not None:
+            return obj
+
+        obj = model.objects.filter(**lookup).order_by('pk').first()
+        if obj is None:
+            # Generate slug from Latin version
+            slug = SerbianTextConverter.generate_unique_slug(SerbianTextConverter.normalize(defaults['title_sr']), model)
+            obj = model.objects.create(**{**defaults, **lookup}, slug=slug)
+        self.lookup_cache.put(model, key, obj)
+        return obj
+
     def get_or_create_category(self, name_sr):
         """
         Get or create a category with both Cyrillic and Latin titles
@@ -127,25 +318,9 @@ class Command(BaseCommand):
         if not name_sr:
             return None
         
-        # Create Latin version
-        name_lat = SerbianTextConverter.to_latin(name_sr)
-        
-        # Generate slug from Latin version
-        slug = SerbianTextConverter.generate_unique_slug(SerbianTextConverter.normalize(name_sr), Category)
-        
-        # Create or update with both versions
-        category, _ = Category.objects.get_or_create(
-            title_sr=name_sr,
-            defaults={
-                'title_lat': name_lat,
-                'slug': slug,
-                'meta_title_sr': name_sr,
-                'meta_title_lat': name_lat,
-                'meta_description_sr': name_sr,
-                'meta_description_lat': name_lat
-            }
+        return self.get_cached_or_create(
+            Category, {'title_sr': name_sr}, AuctionBulkWriter.lookup_defaults(name_sr)
         )
-        return category
 
     def get_or_create_executor(self, name_sr):
         """
@@ -156,28 +331,11 @@ class Command(BaseCommand):
             return None
         
         # Convert to Cyrillic if the input is in Latin
-        if not SerbianTextConverter.is_cyrillic(name_sr):
-            name_sr = SerbianTextConverter.to_cyrillic(name_sr)
+        name_sr = AuctionBulkWriter.executor_name(name_sr)
         
-        # Create Latin version from the (now definitely) Cyrillic name
-        name_lat = SerbianTextConverter.to_latin(name_sr)
-        
-        # Generate slug from Latin version
-        slug = SerbianTextConverter.generate_unique_slug(SerbianTextConverter.normalize(name_sr), Executor)
-        
-        # Create or update with both versions
-        executor, _ = Executor.objects.get_or_create(
-            title_sr=name_sr,
-            defaults={
-                'title_lat': name_lat,
-                'slug': slug,
-                'meta_title_sr': name_sr,
-                'meta_title_lat': name_lat,
-                'meta_description_sr': name_sr,
-                'meta_description_lat': name_lat
-            }
+        return self.get_cached_or_create(
+            Executor, {'title_sr': name_sr}, AuctionBulkWriter.lookup_defaults(name_sr)
         )
-        return executor
 
     def get_or_create_location(self, location_data):
         """
@@ -186,80 +344,35 @@ class Command(BaseCommand):
         if not location_data:
             return None
         
-        # Get location components
-        municipality_sr = location_data.get('municipality', '')
-        city_sr = location_data.get('city', '')
-        cadastral_municipality_sr = location_data.get('cadastral_municipality', '')
-        
-        # Transliterate components to Latin
-        municipality_lat = SerbianTextConverter.to_latin(municipality_sr)
-        city_lat = SerbianTextConverter.to_latin(city_sr)
-        cadastral_municipality_lat = SerbianTextConverter.to_latin(cadastral_municipality_sr)
-        
-        # Create combined titles
-        name_parts_sr = [municipality_sr, city_sr, cadastral_municipality_sr]
-        name_parts_lat = [municipality_lat, city_lat, cadastral_municipality_lat]
-        
-        title_sr = ' '.join(filter(None, name_parts_sr))
-        title_lat = ' '.join(filter(None, name_parts_lat))
-        
-        # Generate slug from Latin version
-        slug = SerbianTextConverter.generate_unique_slug(SerbianTextConverter.normalize(title_sr), Location)
-        
-        # Create or update with both versions
-        location, _ = Location.objects.get_or_create(
-            municipality=municipality_sr,
-            city=city_sr,
-            cadastral_municipality=cadastral_municipality_sr,
-            defaults={
-                'title_sr': title_sr,
-                'title_lat': title_lat,
-                'slug': slug,
-                'meta_title_sr': title_sr,
-                'meta_title_lat': title_lat,
-                'meta_description_sr': title_sr,
-                'meta_description_lat': title_lat
-            }
-        )
-        return location
+        key = AuctionBulkWriter.location_key(location_data)
+        defaults = AuctionBulkWriter.location_defaults(key)
+        lookup = {field: defaults.pop(field) for field in ('municipality', 'city', 'cadastral_municipality')}
+        return self.get_cached_or_create(Location, lookup, defaults)
 
     def get_or_create_tags(self, tag_names_sr):
         """
         Get or create tags with both Cyrillic and Latin titles
         """
-        tags = []
-        for name_sr in tag_names_sr:
-            if name_sr:
-                # Create Latin version
-                name_lat = SerbianTextConverter.to_latin(name_sr)
-                
-                # Generate slug from Latin version
-                slug = SerbianTextConverter.generate_unique_slug(SerbianTextConverter.normalize(name_sr), Tag)
-                
-                # Create or update with both versions
-                tag, _ = Tag.objects.get_or_create(
-                    title_sr=name_sr,
-                    defaults={
-                        'title_lat': name_lat,
-                        'slug': slug,
-                        'meta_title_sr': name_sr,
-                        'meta_title_lat': name_lat,
-                        'meta_description_sr': name_sr,
-                        'meta_description_lat': name_lat
-                    }
-                )
-                tags.append(tag)
-        return tags
+        return [
+            self.get_cached_or_create(Tag, {'title_sr': name_sr}, AuctionBulkWriter.lookup_defaults(name_sr))
+            for name_sr in tag_names_sr
+            if name_sr
+        ]
 
-    def create_or_update_documents(self, auction, document_names_sr):
+    def create_or_update_documents(self, auction, document_names_sr, document_urls=None):
         """
         Create or update documents with both Cyrillic and Latin titles
         """
+        document_urls = document_urls or {}
         existing_docs = {doc.title_sr: doc for doc in auction.documents.all()}
         
         # Create new documents
         for name_sr in document_names_sr:
-            if name_sr not in existing_docs:
+            if name_sr in existing_docs:
+                url = document_urls.get(name_sr)
+                if url and existing_docs[name_sr].source_url != url:
+                    AuctionDocument.objects.filter(pk=existing_docs[name_sr].pk).update(source_url=url)
+            else:
                 # Create Latin version
                 name_lat = SerbianTextConverter.to_latin(name_sr)
                 
@@ -267,7 +380,8 @@ class Command(BaseCommand):
                 doc = AuctionDocument.objects.create(
                     title_sr=name_sr,
                     title_lat=name_lat,
-                    file=f'auction_documents/{auction.code}/{name_sr}'
+                    file=f'auction_documents/{auction.code}/{name_sr}',
+                    source_url=document_urls.get(name_sr, '')
                 )
                 auction.documents.add(doc)
         
@@ -276,137 +390,222 @@ class Command(BaseCommand):
             if doc_name not in document_names_sr:
                 auction.documents.remove(existing_docs[doc_name])
 
-    def extract_details(self, driver, auction_code, current_url):
+    def extract_details(self, driver, auction_code):
+        """
+        Extract auction details by opening the detail page directly; the
+        driver is left there for the next auction instead of going back.
+        """
         details = {}
         try:
             self.stdout.write(f"\nStarting to process auction {auction_code}")
             
-            detail_url = f"https://eaukcija.sud.rs/#/aukcije/{auction_code}"
-            self.stdout.write(f"Navigating to URL: {detail_url}")
-            driver.get(detail_url)
+            detail_url = f"{self.SITE_URL}/#/aukcije/{auction_code}"
+            page_url = f"{self.base_url}/#/aukcije/{auction_code}"
+            self.stdout.write(f"Navigating to URL: {page_url}")
+            with self.metrics.measure('page_load'):
+                driver.get(page_url)
             
             try:
-                self.wait_for_element_load(driver, By.CLASS_NAME, "auction-info", timeout=20)
-                time.sleep(2)
+                self.wait_for_element_load(driver, By.CLASS_NAME, "auction-info", stage='detail')
+                self.readiness.settle(driver)
+
+                if self.extraction == 'script':
+                    try:
+                        with self.metrics.measure('script_extraction'):
+                            return self.extract_details_in_page(driver, detail_url)
+                    except (ScraperError, WebDriverException) as e:
+                        self.stdout.write(self.style.WARNING(
+                            f"Single-pass extraction failed, reading element by element: {str(e)}"
+                        ))
                 
                 # Extract basic details
-                details["code"] = self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item__code", timeout=10).text
-                details["status"] = self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item__status", timeout=10).text
-                details["title"] = self.wait_for_element_load(driver, By.CLASS_NAME, "auction-item-title", timeout=10).text
+                details["code"] = self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item__code").text
+                details["status"] = self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item__status").text
+                details["title"] = self.wait_for_element_load(driver, By.CLASS_NAME, "auction-item-title").text
                 details["url"] = detail_url
 
                 # Extract detail lines
-                detail_lines = driver.find_elements(By.CLASS_NAME, "auction-state-info__line")
-                for line in detail_lines:
-                    text = line.text
-                    if "Датум објаве" in text:
-                        date_str = text.split("еАукције")[1].strip()
-                        details["publication_date"] = self.parse_serbian_date(date_str)
-                    elif "Почетак еАукције" in text:
-                        date_str = text.split("еАукције")[1].strip()
-                        details["start_time"] = self.parse_serbian_date(date_str)
-                    elif "Крај еАукције" in text:
-                        date_str = text.split("еАукције")[1].strip()
-                        details["end_time"] = self.parse_serbian_date(date_str)
-                    elif "Почетна цена" in text:
-                        details["pricing"] = details.get("pricing", {})
-                        details["pricing"]["starting_price"] = self.parse_price(text.split("Почетна цена")[1].strip())
-                    elif "Процењена вредност" in text:
-                        details["pricing"] = details.get("pricing", {})
-                        details["pricing"]["estimated_value"] = self.parse_price(text.split("Процењена вредност")[1].strip())
-                    elif "Лицитациони корак" in text:
-                        details["pricing"] = details.get("pricing", {})
-                        details["pricing"]["bidding_step"] = self.parse_price(text.split("Лицитациони корак")[1].strip())
+                with self.metrics.measure('parse'):
+                    self.extract_state_lines(driver, details)
 
                 # Process tabs
                 additional_info = {}
-                tabs = self.wait_for_element_load(driver, By.CLASS_NAME, "ant-tabs-nav", timeout=10).find_elements(By.CLASS_NAME, "ant-tabs-tab")
+                tabs = self.wait_for_element_load(driver, By.CLASS_NAME, "ant-tabs-nav").find_elements(By.CLASS_NAME, "ant-tabs-tab")
                 
                 for tab in tabs:
-                    tab_name = tab.text.strip()
-                    self.stdout.write(f"Processing tab: {tab_name}")
-                    
-                    # Click tab with retry
-                    max_retries = 3
-                    for attempt in range(max_retries):
-                        try:
-                            driver.execute_script("arguments[0].click();", tab)
-                            time.sleep(1)
-                            break
-                        except Exception as e:
-                            if attempt == max_retries - 1:
-                                raise
-                            time.sleep(1)
-                    
-                    tab_content = self.wait_for_element_load(driver, By.CLASS_NAME, "ant-tabs-tabpane-active", timeout=10)
-                    
-                    if tab_name == "Детаљи":
-                        detail_lines = tab_content.find_elements(By.CLASS_NAME, "info-label-row")
-                        for line in detail_lines:
-                            text = line.text.strip()
-                            if "Опис:" in text:
-                                additional_info["description"] = text.replace("Опис:", "").strip()
-                            elif "Продаја:" in text:
-                                additional_info["sale_number"] = text.replace("Продаја:", "").strip()
-                    
-                    elif tab_name == "Локација":
-                        location = {}
-                        location_lines = tab_content.find_elements(By.CLASS_NAME, "info-label-row")
-                        for line in location_lines:
-                            text = line.text.strip()
-                            if "Општина:" in text:
-                                location["municipality"] = text.replace("Општина:", "").strip()
-                            elif "Место:" in text:
-                                location["city"] = text.replace("Место:", "").strip()
-                            elif "Катастарска општина:" in text:
-                                location["cadastral_municipality"] = text.replace("Катастарска општина:", "").strip()
-                        additional_info["location"] = location
-                    
-                    elif tab_name == "Категорија":
-                        category_element = tab_content.find_element(By.CLASS_NAME, "category-name")
-                        additional_info["categories"] = category_element.text.strip()
-                    
-                    elif tab_name == "Тагови":
-                        tags_elements = tab_content.find_elements(By.CLASS_NAME, "category-name")
-                        additional_info["tags"] = [tag.text.strip() for tag in tags_elements if tag.text.strip()]
-                    
-                    elif tab_name == "Јавни извршитељ":
-                        executor_element = tab_content.find_element(By.CLASS_NAME, "category-name")
-                        additional_info["executor"] = executor_element.text.strip()
-                    
-                    elif tab_name == "Документи":
-                        document_elements = tab_content.find_elements(By.CLASS_NAME, "category-name")
-                        doc_text = "".join([doc.text.strip() for doc in document_elements if doc.text.strip()])
-                        additional_info["documents"] = self.split_pdf_documents(doc_text)
+                    with self.metrics.measure('tab_extraction'):
+                        self.extract_tab(driver, tab, additional_info)
 
                 details["additional_info"] = additional_info
 
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f"Error during content extraction: {str(e)}"))
             
-            finally:
-                self.stdout.write("Returning to listing page...")
-                driver.get(current_url)
-                self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item", timeout=10)
-                time.sleep(1)
-            
             return details
             
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Critical error processing auction {auction_code}: {str(e)}"))
-            try:
-                driver.get(current_url)
-                self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item", timeout=10)
-                time.sleep(1)
-            except Exception as nav_error:
-                self.stdout.write(self.style.ERROR(f"Error navigating back: {str(nav_error)}"))
             return None
 
+    def extract_state_lines(self, driver, details):
+        """Read the dates and prices of the auction state box into details."""
+        detail_lines = driver.find_elements(By.CLASS_NAME, "auction-state-info__line")
+        for line in detail_lines:
+            self.parse_state_line(line.text, details)
+
+    def parse_state_line(self, text, details):
+        if "Датум објаве" in text:
+            date_str = text.split("еАукције")[1].strip()
+            details["publication_date"] = self.parse_serbian_date(date_str)
+        elif "Почетак еАукције" in text:
+            date_str = text.split("еАукције")[1].strip()
+            details["start_time"] = self.parse_serbian_date(date_str)
+        elif "Крај еАукције" in text:
+            date_str = text.split("еАукције")[1].strip()
+            details["end_time"] = self.parse_serbian_date(date_str)
+        elif "Почетна цена" in text:
+            details["pricing"] = details.get("pricing", {})
+            details["pricing"]["starting_price"] = self.parse_price(text.split("Почетна цена")[1].strip())
+        elif "Процењена вредност" in text:
+            details["pricing"] = details.get("pricing", {})
+            details["pricing"]["estimated_value"] = self.parse_price(text.split("Процењена вредност")[1].strip())
+        elif "Лицитациони корак" in text:
+            details["pricing"] = details.get("pricing", {})
+            details["pricing"]["bidding_step"] = self.parse_price(text.split("Лицитациони корак")[1].strip())
+
+    def extract_tab(self, driver, tab, additional_info):
+        """Activate one detail tab and read its pane into additional_info."""
+        tab_name = tab.text.strip()
+        self.stdout.write(f"Processing tab: {tab_name}")
+
+        already_active = self.is_tab_active(tab)
+        previous_text = self.get_active_pane_text(driver)
+
+        # Click tab with retry until it becomes the active one
+        call_with_retry(
+            lambda: self.activate_tab(driver, tab),
+            attempts=3,
+            retry_on=(WebDriverException,),
+            base=0.2,
+        )
+
+        # Wait for the pane to swap in instead of sleeping
+        if not already_active:
+            self.readiness.text_changed(
+                driver, 'tab', By.CLASS_NAME, "ant-tabs-tabpane-active", previous_text
+            )
+        tab_content = self.wait_for_element_load(driver, By.CLASS_NAME, "ant-tabs-tabpane-active", stage='tab')
+
+        rows = names = links = []
+        if tab_name in self.ROW_TABS:
+            rows = [line.text for line in tab_content.find_elements(By.CLASS_NAME, "info-label-row")]
+        elif tab_name in self.NAME_TABS:
+            names = [element.text for element in tab_content.find_elements(By.CLASS_NAME, "category-name")]
+            links = [
+                [link.text, link.get_attribute('href')]
+                for link in tab_content.find_elements(By.CSS_SELECTOR, "a[href]")
+            ]
+        self.parse_tab(tab_name, rows, names, additional_info, links)
+
+    def parse_tab(self, tab_name, rows, names, additional_info, links=()):
+        """
+        Parse the text of one tab pane: the info-label-row lines of the details
+        and location tabs, the category-name entries of the others. Links are
+        the [text, href] pairs of the pane's anchors, used for the documents.
+        """
+        if tab_name == "Детаљи":
+            for text in rows:
+                text = text.strip()
+                if "Опис:" in text:
+                    additional_info["description"] = text.replace("Опис:", "").strip()
+                elif "Продаја:" in text:
+                    additional_info["sale_number"] = text.replace("Продаја:", "").strip()
+
+        elif tab_name == "Локација":
+            location = {}
+            for text in rows:
+                text = text.strip()
+                if "Општина:" in text:
+                    location["municipality"] = text.replace("Општина:", "").strip()
+                elif "Место:" in text:
+                    location["city"] = text.replace("Место:", "").strip()
+                elif "Катастарска општина:" in text:
+                    location["cadastral_municipality"] = text.replace("Катастарска општина:", "").strip()
+            additional_info["location"] = location
+
+        elif tab_name == "Категорија":
+            if not names:
+                raise NoSuchElementException("No category-name element in the category tab")
+            additional_info["categories"] = names[0].strip()
+
+        elif tab_name == "Тагови":
+            additional_info["tags"] = [tag.strip() for tag in names if tag.strip()]
+
+        elif tab_name == "Јавни извршитељ":
+            if not names:
+                raise NoSuchElementException("No category-name element in the executor tab")
+            additional_info["executor"] = names[0].strip()
+
+        elif tab_name == "Документи":
+            doc_text = "".join([doc.strip() for doc in names if doc.strip()])
+            additional_info["documents"] = self.split_pdf_documents(doc_text)
+            document_urls = self.match_document_urls(additional_info["documents"], links)
+            if document_urls:
+                additional_info["document_urls"] = document_urls
+
+    def match_document_urls(self, documents, links):
+        """
+        Map document names to the download links of the documents tab by
+        their text, or by position when every document has exactly one link.
+        """
+        links = [(text.strip(), href) for text, href in links if href]
+        by_text = {}
+        for text, href in links:
+            by_text.setdefault(text, href)
+            by_text.setdefault(f"{text}.pdf", href)
+        urls = {name: by_text[name] for name in documents if name in by_text}
+        if not urls and len(links) == len(documents):
+            urls = {name: href for name, (_, href) in zip(documents, links)}
+        return urls
+
+    def extract_details_in_page(self, driver, detail_url):
+        """
+        Single-pass extraction: one injected script returns the text of every
+        field, including tab panes that are rendered but hidden, which is then
+        parsed exactly like the element-by-element path. Tabs whose pane the
+        SPA has not rendered yet are activated and read individually.
+        """
+        page = driver.execute_script(self.EXTRACT_SCRIPT)
+        if not page or not page.get('code'):
+            raise ScraperError("Auction page is not rendered")
+
+        details = {
+            "code": page['code'],
+            "status": page['status'],
+            "title": page['title'],
+            "url": detail_url,
+        }
+        for text in page['stateLines']:
+            self.parse_state_line(text, details)
+
+        additional_info = {}
+        tabs = None
+        for index, pane in enumerate(page['tabs']):
+            tab_name = pane['name'].strip()
+            if pane['rendered'] or tab_name not in self.ROW_TABS + self.NAME_TABS:
+                self.parse_tab(tab_name, pane['rows'], pane['names'], additional_info, pane['links'])
+                continue
+            if tabs is None:
+                tabs = self.wait_for_element_load(driver, By.CLASS_NAME, "ant-tabs-nav").find_elements(By.CLASS_NAME, "ant-tabs-tab")
+            self.extract_tab(driver, tabs[index], additional_info)
+        details["additional_info"] = additional_info
+        return details
+
     def extract_auctions_from_page(self, driver):
         auctions = []
         try:
-            self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item")
-            time.sleep(1)
+            self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item", stage='listing')
+            self.readiness.settle(driver)
             
             items = driver.find_elements(By.CLASS_NAME, "auction-list-item")
             
@@ -425,18 +624,41 @@ class Command(BaseCommand):
 
     def check_page_has_content(self, driver):
         try:
-            self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item")
+            self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item", stage='listing')
             return True
         except TimeoutException:
             return False
 
+    def activate_tab(self, driver, tab):
+        driver.execute_script("arguments[0].click();", tab)
+        self.readiness.wait(driver, 'tab', lambda d: self.is_tab_active(tab))
+
+    def is_tab_active(self, tab):
+        return 'ant-tabs-tab-active' in (tab.get_attribute('class') or '')
+
+    def get_active_pane_text(self, driver):
+        panes = driver.find_elements(By.CLASS_NAME, "ant-tabs-tabpane-active")
+        return panes[0].text if panes else ''
+
+    def get_first_listing_code(self, driver):
+        codes = driver.find_elements(By.CLASS_NAME, "auction-list-item__code")
+        return codes[0].text if codes else None
+
     def navigate_to_page(self, driver, base_url, page_num):
         page_url = f"{base_url}#/?stranica={page_num}"
         current_url = driver.current_url
-        driver.get(page_url)
+        # Only the hash changes between listing pages, so the old items stay in
+        # the DOM until the SPA re-renders; wait for the first code to change.
+        previous_code = self.get_first_listing_code(driver) if current_url.startswith(base_url) else None
+        with self.metrics.measure('page_load'):
+            driver.get(page_url)
         if current_url != page_url:
-            self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item")
-            time.sleep(2)
+            self.wait_for_element_load(driver, By.CLASS_NAME, "auction-list-item", stage='listing')
+            if previous_code:
+                self.readiness.text_changed(
+                    driver, 'listing', By.CLASS_NAME, "auction-list-item__code", previous_code
+                )
+            self.readiness.settle(driver)
         return page_url
 
     def save_auction_data(self, data):
@@ -501,6 +723,7 @@ class Command(BaseCommand):
                     'category': category,
                     'executor': executor,
                     'location': location,
+                    'content_hash': details_fingerprint(data),
                 }
             )
             
@@ -510,7 +733,8 @@ class Command(BaseCommand):
             
             self.create_or_update_documents(
                 auction,
-                data['additional_info'].get('documents', [])
+                data['additional_info'].get('documents', []),
+                data['additional_info'].get('document_urls')
             )
             
             return created
@@ -520,66 +744,476 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f"Data received: {data}"))
             raise
 
+    def get_listing(self, session, base_url, page_num):
+        """
+        Return the auctions listed on a page as {"code", "numeric_code"} dicts.
+        """
+        self.rate_limiter.acquire()
+        with self.metrics.measure('listing'):
+            return self.fetch_listing(session, base_url, page_num)
+
+    def fetch_listing(self, session, base_url, page_num):
+        self.listing_size = None
+        if self.api_client:
+            try:
+                auctions, self.listing_size = self.api_client.get_auction_page(page_num)
+                return auctions
+            except ScraperError as e:
+                self.stdout.write(self.style.WARNING(f"API listing failed, falling back to browser: {str(e)}"))
+
+        try:
+            return self.extract_listing(session.driver, base_url, page_num)
+        except WebDriverException:
+            if not self.restart_session(session):
+                raise
+            return self.extract_listing(session.driver, base_url, page_num)
+
+    def extract_listing(self, driver, base_url, page_num):
+        self.navigate_to_page(driver, base_url, page_num)
+        if not self.check_page_has_content(driver):
+            self.stdout.write(self.style.WARNING(f"No content found on page {page_num}"))
+            return []
+        auctions = self.extract_auctions_from_page(driver)
+        self.listing_size = self.read_page_count(driver)
+        return auctions
+
+    def read_page_count(self, driver):
+        """Number of listing pages shown by the pagination already rendered, or None."""
+        try:
+            items = driver.find_elements(By.CLASS_NAME, "ant-pagination-item")
+            pages = [int(item.text) for item in items if item.text.isdigit()]
+        except WebDriverException:
+            return None
+        return max(pages) if pages else None
+
+    def restart_session(self, session):
+        """Restart a crashed browser so the run can continue; returns True if it was restarted."""
+        if not session.restart_if_dead():
+            return False
+        self.stdout.write(self.style.WARNING("WebDriver crashed, started a new browser session"))
+        self.metrics.increment('webdriver_restarts')
+        return True
+
+    def get_details(self, session, auction_code):
+        """
+        Fetch auction details from the JSON API when the HTTP engine is active,
+        falling back to rendering the page in the browser. The time taken is
+        recorded as the auction's latency.
+        """
+        with self.metrics.measure('auction'):
+            details = self.fetch_auction(session, auction_code)
+        self.metrics.increment('auctions_extracted' if details else 'extraction_failures')
+        return details
+
+    def fetch_auction(self, session, auction_code):
+        if self.api_client:
+            try:
+                with self.metrics.measure('api_fetch'):
+                    return self.api_client.get_details(auction_code)
+            except ScraperError as e:
+                self.stdout.write(self.style.WARNING(
+                    f"API extraction failed for auction {auction_code}, falling back to browser: {str(e)}"
+                ))
+        details = self.extract_details(session.driver, auction_code)
+        if not details and self.restart_session(session):
+            details = self.extract_details(session.driver, auction_code)
+        return details
+
+    def get_max_pages(self, session, base_url, options):
+        if not options['all_pages']:
+            max_pages = options['pages']
+            self.stdout.write(self.style.SUCCESS(f"Starting scrape of {max_pages} pages"))
+            return max_pages
+
+        max_pages = None
+        if self.api_client:
+            try:
+                max_pages = self.api_client.get_total_pages()
+            except ScraperError as e:
+                self.stdout.write(self.style.WARNING(f"API pagination failed, falling back to browser: {str(e)}"))
+        if max_pages is None:
+            # Navigate to first page to get total pages
+            self.navigate_to_page(session.driver, base_url, 1)
+            max_pages = self.get_total_pages(session.driver)
+        self.stdout.write(self.style.SUCCESS(f"Found {max_pages} total pages to scrape"))
+        return max_pages
+
+    def reached_known_auctions(self, auctions, watermark):
+        """
+        Whether a listing page only holds auctions saved by earlier crawls, or
+        contains the newest auction of the last completed crawl. The listing is
+        newest first, so every later page is already known as well.
+        """
+        page_codes = {auction['code'] for auction in auctions} | {auction['numeric_code'] for auction in auctions}
+        if watermark and watermark.watermark_code in page_codes:
+            return True
+        known = Auction.objects.filter(code__in=page_codes).exclude(content_hash='').count()
+        return known >= len(auctions)
+
+    def discover_auction_codes(self, session, base_url, max_pages, watermark=None):
+        """
+        Discovery phase: collect the auction codes of every listing page
+        without opening any auction. With a watermark (incremental mode)
+        paging stops at the first page of already known auctions. Progress
+        is checkpointed after every page.
+
+        Codes are deduplicated across pages, since the listing shifts while
+        the crawl runs. Repeated codes mean auctions were published at the
+        head of the listing, so the first pages are re-read until they bring
+        nothing new. When the listing shifted, seen as repeated codes or a
+        changed listing size, the previous page is re-read as well,
+        recovering items that moved back across the page boundary; with
+        --drift-check it is re-read after every page.
+        """
+        codes = list(self.checkpoint.codes)
+        tracker = ListingTracker(codes)
+        for page_num in range(self.checkpoint.next_page, max_pages + 1):
+            auctions = self.get_listing(session, base_url, page_num)
+            if not auctions:
+                self.stdout.write(self.style.WARNING(f"[discovery] No auctions found on page {page_num}"))
+                continue
+
+            page_codes, duplicates = tracker.add_page(page_num, [auction['numeric_code'] for auction in auctions])
+            resized = tracker.size_changed(self.listing_size)
+            if duplicates:
+                self.stdout.write(self.style.WARNING(
+                    f"[discovery] Page {page_num} repeats {duplicates} auctions, the listing shifted; "
+                    f"re-reading the first pages"
+                ))
+                page_codes.extend(self.rescan_head(session, base_url, page_num, tracker))
+            elif resized:
+                self.stdout.write(self.style.WARNING(
+                    f"[discovery] Listing size changed to {tracker.size} on page {page_num}; "
+                    f"re-reading page {page_num - 1}"
+                ))
+            if page_num > 1 and (self.drift_check or duplicates or resized):
+                page_codes.extend(self.rescan_page(session, base_url, page_num - 1, tracker))
+
+            codes.extend(page_codes)
+            self.checkpoint.page_done(page_num, page_codes)
+            self.stdout.write(self.style.SUCCESS(
+                f"[discovery] Page {page_num} of {max_pages}: {len(auctions)} auctions ({len(codes)} so far)"
+            ))
+
+            if self.incremental and self.reached_known_auctions(auctions, watermark):
+                self.stdout.write(self.style.SUCCESS(
+                    f"[discovery] Reached already known auctions on page {page_num}, stopping"
+                ))
+                break
+        self.checkpoint.finish_discovery()
+        self.write_drift_summary(tracker)
+        return codes
+
+    def rescan_page(self, session, base_url, page_num, tracker):
+        """Re-read a listing page and return the codes it holds that were not seen yet."""
+        auctions = self.get_listing(session, base_url, page_num)
+        recovered = tracker.rescan_page(page_num, [auction['numeric_code'] for auction in auctions])
+        if recovered:
+            self.stdout.write(self.style.WARNING(
+                f"[discovery] Recovered {len(recovered)} auctions that shifted onto page {page_num}"
+            ))
+        return recovered
+
+    def rescan_head(self, session, base_url, page_num, tracker):
+        """Re-read the pages before page_num, newest first, until one holds no new auction."""
+        recovered = []
+        for head_page in range(1, page_num):
+            new = self.rescan_page(session, base_url, head_page, tracker)
+            if not new:
+                break
+            recovered.extend(new)
+        return recovered
+
+    def write_drift_summary(self, tracker):
+        counts = tracker.counts
+        self.metrics.increment('listing_duplicates_skipped', counts['duplicates'])
+        self.metrics.increment('listing_items_recovered', counts['recovered'])
+        self.metrics.increment('listing_drift_detected', counts['drift'])
+        if counts['duplicates'] or counts['recovered']:
+            self.stdout.write(self.style.WARNING(
+                f"[discovery] Listing drifted {counts['drift']} times: {counts['duplicates']} repeated auctions "
+                f"skipped, {counts['recovered']} skipped auctions recovered"
+            ))
+
+    def thread_session(self):
+        """The WebDriver session of the current fetch thread, started on first use."""
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = LazyWebDriver(lambda: self.setup_webdriver(self.no_headless))
+            self.local.session = session
+            with self.sessions_lock:
+                self.sessions.append(session)
+        return session
+
+    def fetch_details(self, auction_code):
+        self.stdout.write(f"[details] {threading.current_thread().name} processing auction {auction_code}")
+        return self.get_details(self.thread_session(), auction_code)
+
+    def finish_writing(self):
+        try:
+            self.writer.flush()
+        finally:
+            connection.close()
+
+    def scrape_concurrently(self, codes, concurrency, retries):
+        """
+        Detail phase on the asyncio core: up to `concurrency` auctions are
+        fetched at once, each fetch thread with its own browser session,
+        while one database thread saves the results.
+        """
+        scraper = AsyncDetailScraper(
+            fetch=self.fetch_details,
+            save=self.writer.add,
+            finish=self.finish_writing,
+            concurrency=concurrency,
+            rate_limiter=self.rate_limiter,
+            retries=retries,
+            retry_on=(ScraperError, WebDriverException),
+            log=self.stdout.write,
+        )
+        try:
+            counts = scraper.run(codes)
+        finally:
+            for session in self.sessions:
+                session.quit()
+        self.metrics.increment('fetch_retries', counts['retried'])
+        if counts['retried']:
+            self.stdout.write(f"[details] Retried {counts['retried']} fetches")
+
+    def require_details(self, session, auction_code):
+        self.rate_limiter.acquire()
+        details = self.get_details(session, auction_code)
+        if not details:
+            raise ScraperError(f"No details extracted for auction {auction_code}")
+        return details
+
+    def scrape_serially(self, session, codes, retries):
+        """
+        Detail phase visiting each auction page directly, one after another.
+        Each auction is attempted up to `retries` times with jittered backoff.
+        """
+        for index, auction_code in enumerate(codes, start=1):
+            self.stdout.write(self.style.SUCCESS(f"[details] Auction {index} of {len(codes)}: {auction_code}"))
+
+            try:
+                auction_details = call_with_retry(
+                    lambda: self.require_details(session, auction_code),
+                    attempts=max(retries, 1),
+                    retry_on=(ScraperError, WebDriverException),
+                )
+            except (ScraperError, WebDriverException) as e:
+                self.stdout.write(self.style.WARNING(f"Failed to extract details for auction {auction_code}: {str(e)}"))
+                continue
+            self.writer.add(auction_details)
+
+        self.writer.flush()
+
+    def write_cache_summary(self):
+        self.stdout.write("\nLookup cache:")
+        for model_name, stats in self.lookup_cache.stats().items():
+            self.stdout.write(
+                f"  {model_name}: {stats['hits']} hits, {stats['misses']} misses, {stats['size']} cached"
+            )
+
+    def write_stage_summary(self):
+        summary = self.metrics.stages.summary()
+        if not summary:
+            return
+        self.stdout.write("\nTime spent per stage:")
+        for stage, stats in sorted(summary.items()):
+            self.stdout.write(
+                f"  {stage}: {stats['count']} times, total {stats['total']:.1f}s, "
+                f"p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, p99 {stats['p99']:.2f}s"
+            )
+        queries = self.metrics.samples.summary().get('queries_per_auction')
+        if queries:
+            self.stdout.write(f"  queries per saved auction: avg {queries['avg']:.1f}, max {queries['max']:.1f}")
+
+    def write_run_report(self, options):
+        self.metrics.finish()
+        if options['report']:
+            self.metrics.write_report(options['report'])
+            self.stdout.write(self.style.SUCCESS(f"Run report written to {options['report']}"))
+        if options['metrics']:
+            self.metrics.write_prometheus(options['metrics'])
+            self.stdout.write(self.style.SUCCESS(f"Metrics written to {options['metrics']}"))
+
+    def write_wait_summary(self):
+        summary = self.readiness.timer.summary()
+        if not summary:
+            return
+        self.stdout.write("\nTime spent waiting per stage:")
+        for stage, stats in sorted(summary.items()):
+            self.stdout.write(
+                f"  {stage}: {stats['count']} waits, total {stats['total']:.1f}s, "
+                f"avg {stats['avg']:.2f}s, max {stats['max']:.2f}s, timeouts {stats['timeouts']}"
+            )
+
+    def checkpoint_processed(self, codes):
+        """Writer callback: remember which discovered codes are saved."""
+        self.saved_codes.update(codes)
+        self.checkpoint.mark_processed([''.join(filter(str.isdigit, code)) for code in codes])
+
+    def create_writer(self, options):
+        log = lambda message: self.stdout.write(self.style.WARNING(message))
+        if options['output'] == 'jsonl':
+            # A resumed crawl appends to the records written before the interruption
+            return AuctionJsonlWriter(
+                options['output_file'],
+                batch_size=max(options['batch_size'], 1),
+                append=options['resume'] and self.checkpoint.load(),
+                on_flush=self.checkpoint_processed,
+                log=log,
+                metrics=self.metrics,
+            )
+        return AuctionBulkWriter(
+            batch_size=max(options['batch_size'], 1),
+            cache=self.lookup_cache,
+            skip_unchanged=self.incremental,
+            fallback=self.save_auction_data,
+            log=log,
+            on_flush=self.checkpoint_processed,
+            metrics=self.metrics,
+        )
+
+    def fetch_documents(self, options):
+        """
+        Document stage, after all details are written: download the PDFs not
+        downloaded yet, including those earlier runs failed to fetch, and
+        re-validate those of the auctions saved by this run.
+        """
+        if options['output'] != 'db':
+            self.stdout.write(self.style.WARNING("[documents] Documents are only downloaded with --output=db"))
+            return
+        fetcher = DocumentFetcher(
+            workers=options['document_workers'],
+            rate_limiter=self.rate_limiter,
+            retries=options['retries'],
+            log=lambda message: self.stdout.write(self.style.WARNING(message)),
+            metrics=self.metrics,
+        )
+        try:
+            with self.metrics.measure('documents'):
+                counts = fetcher.run(self.saved_codes)
+        finally:
+            fetcher.close()
+        self.stdout.write(self.style.SUCCESS(
+            f"[documents] {counts['downloaded']} downloaded, {counts['deduplicated']} already stored, "
+            f"{counts['unchanged']} unchanged, {counts['failed']} failed"
+        ))
+
+    def write_counts_summary(self, options, max_pages):
+        counts = self.writer.counts
+        if options['output'] == 'jsonl':
+            self.stdout.write(self.style.SUCCESS(
+                f"\nScraping completed:\n"
+                f"Total pages scraped: {max_pages}\n"
+                f"Written: {counts['written']} auctions to {options['output_file']}"
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"\nScraping completed:\n"
+            f"Total pages scraped: {max_pages}\n"
+            f"Created: {counts['created']} auctions\n"
+            f"Updated: {counts['updated']} auctions\n"
+            f"Unchanged: {counts['unchanged']} auctions"
+        ))
+
     def handle(self, *args, **options):
-        driver = self.setup_webdriver(options['no_headless'])
+        base_url = options['base_url'].rstrip('/')
+        self.base_url = base_url
+        self.readiness = PageReadiness(self.parse_wait_timeouts(options['wait_timeout']))
+        self.metrics = RunMetrics(self.CRAWL_NAME, wait_timer=self.readiness.timer)
+        self.incremental = options['incremental']
+        self.no_headless = options['no_headless']
+        self.extraction = options['extraction']
+        self.browser_profile = options['browser_profile']
+        self.drift_check = options['drift_check']
+        # Listing size reported along with the last listing page read
+        self.listing_size = None
+        self.rate_limiter = TokenBucket(options['rate'], burst=max(options['workers'], 1))
+        self.local = threading.local()
+        self.sessions = []
+        self.sessions_lock = threading.Lock()
+        self.checkpoint = ScrapeCheckpoint(self.CRAWL_NAME)
+        self.saved_codes = set()
+        self.lookup_cache = LookupCache()
+        if options['warm_cache']:
+            self.lookup_cache.warm()
+        self.writer = self.create_writer(options)
+        self.api_client = AuctionApiClient(base_url, site_url=self.SITE_URL) if options['engine'] == 'http' else None
+        session = LazyWebDriver(lambda: self.setup_webdriver(options['no_headless']))
         try:
-            base_url = "https://eaukcija.sud.rs"
-            created_count = 0
-            updated_count = 0
-            
-            # Navigate to first page to get total pages if needed
-            self.navigate_to_page(driver, base_url, 1)
+            crawl_started = timezone.now()
+            watermark = CrawlState.objects.filter(name=self.CRAWL_NAME).first() if self.incremental else None
+            if watermark and watermark.watermark_code:
+                self.stdout.write(f"[discovery] Last crawl finished at {watermark.crawled_at}, newest auction {watermark.watermark_code}")
+
+            resumed = options['resume'] and self.checkpoint.load()
+            if resumed:
+                max_pages = self.checkpoint.max_pages
+                self.stdout.write(self.style.SUCCESS(
+                    f"Resuming from checkpoint: {len(self.checkpoint.codes)} auctions discovered, "
+                    f"{len(self.checkpoint.processed)} already saved"
+                ))
+            else:
+                if options['resume']:
+                    self.stdout.write(self.style.WARNING("No checkpoint found, starting a fresh crawl"))
+                # Determine number of pages to scrape
+                max_pages = self.get_max_pages(session, base_url, options)
+                self.checkpoint.start(max_pages)
             
-            # Determine number of pages to scrape
-            if options['all_pages']:
-                max_pages = self.get_total_pages(driver)
-                self.stdout.write(self.style.SUCCESS(f"Found {max_pages} total pages to scrape"))
+            # Discovery phase: collect all codes before opening any auction
+            if self.checkpoint.discovery_complete:
+                codes = list(self.checkpoint.codes)
             else:
-                max_pages = options['pages']
-                self.stdout.write(self.style.SUCCESS(f"Starting scrape of {max_pages} pages"))
+                with self.metrics.measure('discovery'):
+                    codes = self.discover_auction_codes(session, base_url, max_pages, watermark)
+            self.metrics.increment('auctions_discovered', len(codes))
+            self.stdout.write(self.style.SUCCESS(f"[discovery] Found {len(codes)} auctions on {max_pages} pages"))
             
-            # Rest of your existing scraping logic...
-            for page_num in range(1, max_pages + 1):
-                self.stdout.write(self.style.SUCCESS(f"Scraping page {page_num} of {max_pages}"))
-                
-                # Navigate to the page and check if it has content
-                page_url = self.navigate_to_page(driver, base_url, page_num)
-                
-                if not self.check_page_has_content(driver):
-                    self.stdout.write(self.style.WARNING(f"No content found on page {page_num}"))
-                    continue
-                
-                # Extract auctions from the page
-                auctions = self.extract_auctions_from_page(driver)
-                if not auctions:
-                    self.stdout.write(self.style.WARNING(f"No auctions found on page {page_num}"))
-                    continue
-                
-                # Process each auction
-                for auction in auctions:
-                    auction_code = auction['numeric_code']
-                    self.stdout.write(self.style.SUCCESS(f"Processing auction {auction_code}"))
-                    
-                    current_url = driver.current_url
-                    auction_details = self.extract_details(driver, auction_code, current_url)
-                    
-                    if auction_details:
-                        created = self.save_auction_data(auction_details)
-                        if created:
-                            created_count += 1
-                        else:
-                            updated_count += 1
-                    else:
-                        self.stdout.write(self.style.WARNING(f"Failed to extract details for auction {auction_code}"))
+            # Detail phase: visit each auction page directly, skipping the ones a previous run saved
+            pending = self.checkpoint.pending
+            if len(pending) < len(codes):
+                self.stdout.write(f"[details] Skipping {len(codes) - len(pending)} auctions saved before the interruption")
+            with self.metrics.measure('details'):
+                if options['workers'] > 1:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"[details] Fetching up to {options['workers']} auctions concurrently"
+                    ))
+                    session.quit()
+                    self.scrape_concurrently(pending, options['workers'], options['retries'])
+                else:
+                    self.scrape_serially(session, pending, options['retries'])
+            if options['documents']:
+                self.fetch_documents(options)
+            counts = self.writer.counts
+            for outcome, count in counts.items():
+                self.metrics.increment(f'auctions_{outcome}', count)
             
-            self.stdout.write(self.style.SUCCESS(
-                f"\nScraping completed:\n"
-                f"Total pages scraped: {max_pages}\n"
-                f"Created: {created_count} auctions\n"
-                f"Updated: {updated_count} auctions"
-            ))
+            if counts['failed']:
+                self.stdout.write(self.style.WARNING(f"Failed to save {counts['failed']} auctions"))
+            if codes:
+                CrawlState.objects.update_or_create(
+                    name=self.CRAWL_NAME,
+                    defaults={'watermark_code': codes[0], 'crawled_at': crawl_started}
+                )
+            self.checkpoint.clear()
+            
+            self.write_counts_summary(options, max_pages)
+            if self.metrics.counters['webdriver_restarts']:
+                self.stdout.write(f"WebDriver restarts: {self.metrics.counters['webdriver_restarts']}")
+            self.write_stage_summary()
+            self.write_wait_summary()
+            self.write_cache_summary()
             
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Error during scraping: {str(e)}"))
+            self.stdout.write(self.style.WARNING("Progress is checkpointed, rerun with --resume to continue"))
         finally:
-            driver.quit()
\ No newline at end of file
+            session.quit()
+            if options['output'] == 'jsonl':
+                self.writer.close()
+            if self.api_client:
+                self.api_client.close()
+            self.write_run_report(options)
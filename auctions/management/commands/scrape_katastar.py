@@ -1,34 +1,77 @@
-import time
 import json
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from django.core.management.base import BaseCommand
+from auctions.utils.metrics_utils import RunMetrics
+from auctions.utils.concurrency_utils import TokenBucket
+from auctions.utils.katastar_utils import KatastarClient
+from auctions.utils.scraper_utils import BrowserProfile
 
 class Command(BaseCommand):
-    help = "Scrape data from the Katastar public access page using Selenium"
-
-    def handle(self, *args, **kwargs):
-        url = "https://katastar.rgz.gov.rs/eKatastarPublic/PublicAccess.aspx"
-
+    help = "Scrape data from the Katastar public access page using Selenium or HTTP postbacks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--engine',
+            choices=['selenium', 'http'],
+            default='selenium',
+            help='Drive the form in Chrome or replay its postbacks over HTTP (default: selenium)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Municipalities fetched concurrently by the http engine (default: 4)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=4.0,
+            help='Maximum requests per second of the http engine, 0 for no limit (default: 4)'
+        )
+        parser.add_argument(
+            '--url',
+            default=KatastarClient.URL,
+            help='Address of the public access form, e.g. a local stub of it'
+        )
+        parser.add_argument(
+            '--output',
+            default='katastar_data.json',
+            help='File the scraped data is written to (default: katastar_data.json)'
+        )
+        parser.add_argument(
+            '--browser-profile',
+            choices=BrowserProfile.CHOICES,
+            default='full',
+            help='lean blocks images, fonts and analytics, uses a small viewport and eager page loads (default: full)'
+        )
+        parser.add_argument(
+            '--report',
+            metavar='PATH',
+            help='Write a JSON run report with stage timings, latency percentiles and counters'
+        )
+        parser.add_argument(
+            '--metrics',
+            metavar='PATH',
+            help='Write the run metrics in Prometheus text format'
+        )
+
+    def scrape_with_browser(self, url, browser_profile, metrics):
+        """Select every municipality in the dropdown of a real browser and read its table."""
         # Set up Selenium WebDriver
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-
-        service = Service("/usr/bin/chromedriver")
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver = BrowserProfile(
+            browser_profile,
+            arguments=["--disable-gpu", "--no-sandbox"],
+        ).start()
 
         try:
-            driver.get(url)
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_getOpstinaKO_dropOpstina"))
-            )
+            with metrics.measure('page_load'):
+                driver.get(url)
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_getOpstinaKO_dropOpstina"))
+                )
             
             # Initialize the data structure
             data = {"municipalities": []}
@@ -46,65 +89,120 @@ class Command(BaseCommand):
                     start_index = 1 if select.options[0].get_attribute("value") == "" else 0
 
                     for index in range(start_index, total_options):
-                        # Re-fetch the dropdown before each selection
-                        select_element = WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_getOpstinaKO_dropOpstina"))
-                        )
-                        select = Select(select_element)
-
-                        # Get municipality information
-                        municipality_option = select.options[index]
-                        municipality_name = municipality_option.text
-                        municipality_value = municipality_option.get_attribute("value")
-
-                        # Create municipality entry
-                        municipality_entry = {
-                            "name": municipality_name,
-                            "value": municipality_value,
-                            "cadastral_municipalities": []
-                        }
-
-                        # Select the municipality
-                        select.select_by_index(index)
-
-                        # Wait for the table to update
-                        WebDriverWait(driver, 10).until(
-                            EC.presence_of_all_elements_located((By.XPATH, "//table[@id='ContentPlaceHolder1_getOpstinaKO_GridView']/tbody/tr"))
-                        )
-                        time.sleep(2)
-
-                        # Extract table rows
-                        rows = driver.find_elements(By.XPATH, "//table[@id='ContentPlaceHolder1_getOpstinaKO_GridView']/tbody/tr")
-
-                        # Process cadastral municipalities
-                        for row in rows[1:]:  # Skip header row
-                            columns = row.find_elements(By.TAG_NAME, "td")
-                            if len(columns) >= 2:  # Ensure we have enough columns
-                                cadastral_entry = {
-                                    "name": columns[1].text.strip(),  # Name is in second column
-                                    "value": columns[2].text.strip()  # Value/code is in first column
-                                }
-                                municipality_entry["cadastral_municipalities"].append(cadastral_entry)
-
-                        # Add municipality to the main data structure
-                        data["municipalities"].append(municipality_entry)
+                        with metrics.measure('municipality'):
+                            # Re-fetch the dropdown before each selection
+                            select_element = WebDriverWait(driver, 10).until(
+                                EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_getOpstinaKO_dropOpstina"))
+                            )
+                            select = Select(select_element)
+
+                            # Get municipality information
+                            municipality_option = select.options[index]
+                            municipality_name = municipality_option.text
+                            municipality_value = municipality_option.get_attribute("value")
+
+                            # Create municipality entry
+                            municipality_entry = {
+                                "name": municipality_name,
+                                "value": municipality_value,
+                                "cadastral_municipalities": []
+                            }
+
+                            # The postback replaces the table of the previous municipality
+                            previous_table = driver.find_elements(By.ID, "ContentPlaceHolder1_getOpstinaKO_GridView")
+
+                            # Select the municipality
+                            select.select_by_index(index)
+
+                            # Wait for the table to update
+                            with metrics.measure('table_wait'):
+                                if previous_table:
+                                    WebDriverWait(driver, 10).until(EC.staleness_of(previous_table[0]))
+                                WebDriverWait(driver, 10).until(
+                                    EC.presence_of_all_elements_located((By.XPATH, "//table[@id='ContentPlaceHolder1_getOpstinaKO_GridView']/tbody/tr"))
+                                )
+
+                            with metrics.measure('table_parse'):
+                                # Extract table rows
+                                rows = driver.find_elements(By.XPATH, "//table[@id='ContentPlaceHolder1_getOpstinaKO_GridView']/tbody/tr")
+
+                                # Process cadastral municipalities
+                                for row in rows[1:]:  # Skip header row
+                                    columns = row.find_elements(By.TAG_NAME, "td")
+                                    if len(columns) >= 2:  # Ensure we have enough columns
+                                        cadastral_entry = {
+                                            "name": columns[1].text.strip(),  # Name is in second column
+                                            "value": columns[2].text.strip()  # Value/code is in first column
+                                        }
+                                        municipality_entry["cadastral_municipalities"].append(cadastral_entry)
+
+                            # Add municipality to the main data structure
+                            data["municipalities"].append(municipality_entry)
+                            metrics.increment('municipalities')
+                            metrics.increment('cadastral_municipalities', len(municipality_entry["cadastral_municipalities"]))
                         
-                        self.stdout.write(f"Processed municipality: {municipality_name}")
+                            self.stdout.write(f"Processed municipality: {municipality_name}")
 
                     # Exit loop after processing all options
                     break
 
                 except Exception as e:
                     self.stdout.write(self.style.ERROR(f"An error occurred during processing: {e}"))
+                    metrics.increment('errors')
                     break
 
+            return data
+
+        finally:
+            driver.quit()
+
+    def scrape_with_http(self, url, kwargs, metrics):
+        """Emulate the dropdown postbacks over HTTP, several municipalities at once."""
+        client = KatastarClient(
+            url,
+            pool_size=max(kwargs['workers'], 1),
+            rate_limiter=TokenBucket(kwargs['rate'], burst=max(kwargs['workers'], 1)),
+            metrics=metrics,
+        )
+
+        def processed(municipality):
+            metrics.increment('municipalities')
+            metrics.increment('cadastral_municipalities', len(municipality["cadastral_municipalities"]))
+            self.stdout.write(f"Processed municipality: {municipality['name']}")
+
+        try:
+            with metrics.measure('page_load'):
+                options = client.load_form()
+            self.stdout.write(f"Fetching {len(options)} municipalities with {kwargs['workers']} workers")
+            return client.scrape(kwargs['workers'], on_municipality=processed)
+        finally:
+            client.close()
+
+    def handle(self, *args, **kwargs):
+        url = kwargs['url']
+        output = kwargs['output']
+        metrics = RunMetrics('scrape_katastar')
+
+        try:
+            if kwargs['engine'] == 'http':
+                data = self.scrape_with_http(url, kwargs, metrics)
+            else:
+                data = self.scrape_with_browser(url, kwargs['browser_profile'], metrics)
+
             # Save the data to a JSON file
-            with open('katastar_data.json', 'w', encoding='utf-8') as f:
+            with metrics.measure('write_json'), open(output, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
                 
-            self.stdout.write(self.style.SUCCESS("Data successfully saved to katastar_data.json"))
+            self.stdout.write(self.style.SUCCESS(f"Data successfully saved to {output}"))
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"An error occurred: {e}"))
+            metrics.increment('errors')
         finally:
-            driver.quit()
\ No newline at end of file
+            metrics.finish()
+            if kwargs['report']:
+                metrics.write_report(kwargs['report'])
+                self.stdout.write(self.style.SUCCESS(f"Run report written to {kwargs['report']}"))
+            if kwargs['metrics']:
+                metrics.write_prometheus(kwargs['metrics'])
+                self.stdout.write(self.style.SUCCESS(f"Metrics written to {kwargs['metrics']}"))
\ No newline at end of file
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Name')),
+                ('watermark_code', models.CharField(blank=True, max_length=20, verbose_name='Newest auction code')),
+                ('crawled_at', models.DateTimeField(blank=True, null=True, verbose_name='Crawled at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+            ],
+            options={
+                'verbose_name': 'Crawl State',
+                'verbose_name_plural': 'Crawl States',
+            },
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Content Hash'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0002_auction_content_hash_crawlstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crawlstate',
+            name='checkpoint',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Checkpoint'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0003_crawlstate_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cadastralmunicipality',
+            name='name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='katastar_cadastral_municipality',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='locations', to='auctions.cadastralmunicipality', verbose_name='Katastar cadastral municipality'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='katastar_municipality',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='locations', to='auctions.municipality', verbose_name='Katastar municipality'),
+        ),
+        migrations.AddField(
+            model_name='municipality',
+            name='name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='cadastralmunicipality',
+            name='name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='cadastralmunicipality',
+            name='value',
+            field=models.CharField(db_index=True, max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='municipality',
+            name='name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='municipality',
+            name='value',
+            field=models.CharField(max_length=20, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='cadastralmunicipality',
+            index=models.Index(fields=['municipality', 'name_key'], name='cadastral_municipality_key_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='cadastralmunicipality',
+            constraint=models.UniqueConstraint(fields=('municipality', 'value'), name='unique_cadastral_municipality_value'),
+        ),
+    ]
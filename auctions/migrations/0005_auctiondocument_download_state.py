@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0004_katastar_indexes_location_links'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='etag',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='ETag'),
+        ),
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='fetched_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Fetched at'),
+        ),
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='SHA-256'),
+        ),
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, verbose_name='Size'),
+        ),
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='source_url',
+            field=models.URLField(blank=True, max_length=500, verbose_name='Source URL'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0005_auctiondocument_download_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='page_count',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Pages'),
+        ),
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='text_lat',
+            field=models.TextField(blank=True, editable=False, verbose_name='Text (Latin)'),
+        ),
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='text_sha256',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='text_sr',
+            field=models.TextField(blank=True, editable=False, verbose_name='Text (Cyrillic)'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0006_auctiondocument_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auction',
+            name='next_refresh_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Next refresh at'),
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='refreshed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Refreshed at'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.4 on 2026-10-18 23:40
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_auctions(apps, schema_editor):
+    for model_name in ('Category', 'Location', 'Executor', 'Tag'):
+        model = apps.get_model('auctions', model_name)
+        rows = list(model.objects.annotate(
+            counted_active_auctions=Count('auctions', filter=Q(auctions__is_active=True), distinct=True),
+            counted_auctions=Count('auctions', distinct=True),
+        ))
+        for row in rows:
+            row.active_auction_count = row.counted_active_auctions
+            row.auction_count = row.counted_auctions
+        model.objects.bulk_update(rows, ['active_auction_count', 'auction_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0007_auction_refresh_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='active_auction_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Active auctions'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='auction_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Auctions'),
+        ),
+        migrations.AddField(
+            model_name='executor',
+            name='active_auction_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Active auctions'),
+        ),
+        migrations.AddField(
+            model_name='executor',
+            name='auction_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Auctions'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='active_auction_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Active auctions'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='auction_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Auctions'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='active_auction_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Active auctions'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='auction_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Auctions'),
+        ),
+        migrations.RunPython(count_auctions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 5.1.4 on 2026-10-19 00:20
+
+from django.db import migrations
+
+# PostgreSQL: tsvector columns generated from the Latin text, GIN indexed.
+# Document text is capped to stay within the tsvector size limit.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE auctions_auction ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title_lat, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description_lat, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX auctions_auction_search_idx ON auctions_auction USING gin (search_vector)",
+    """
+    ALTER TABLE auctions_auctiondocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title_lat, '')), 'A') ||
+        setweight(to_tsvector('simple', left(coalesce(text_lat, ''), 200000)), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX auctions_auctiondocument_search_idx ON auctions_auctiondocument USING gin (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "ALTER TABLE auctions_auction DROP COLUMN search_vector",
+    "ALTER TABLE auctions_auctiondocument DROP COLUMN search_vector",
+]
+
+# SQLite: external content FTS5 tables kept in step by triggers
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE auctions_auction_fts USING fts5(
+        title_lat, description_lat, content='auctions_auction', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER auctions_auction_fts_insert AFTER INSERT ON auctions_auction BEGIN
+        INSERT INTO auctions_auction_fts(rowid, title_lat, description_lat)
+        VALUES (new.rowid, new.title_lat, new.description_lat);
+    END
+    """,
+    """
+    CREATE TRIGGER auctions_auction_fts_delete AFTER DELETE ON auctions_auction BEGIN
+        INSERT INTO auctions_auction_fts(auctions_auction_fts, rowid, title_lat, description_lat)
+        VALUES ('delete', old.rowid, old.title_lat, old.description_lat);
+    END
+    """,
+    """
+    CREATE TRIGGER auctions_auction_fts_update AFTER UPDATE OF title_lat, description_lat ON auctions_auction BEGIN
+        INSERT INTO auctions_auction_fts(auctions_auction_fts, rowid, title_lat, description_lat)
+        VALUES ('delete', old.rowid, old.title_lat, old.description_lat);
+        INSERT INTO auctions_auction_fts(rowid, title_lat, description_lat)
+        VALUES (new.rowid, new.title_lat, new.description_lat);
+    END
+    """,
+    "INSERT INTO auctions_auction_fts(auctions_auction_fts) VALUES ('rebuild')",
+    """
+    CREATE VIRTUAL TABLE auctions_auctiondocument_fts USING fts5(
+        title_lat, text_lat, content='auctions_auctiondocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER auctions_auctiondocument_fts_insert AFTER INSERT ON auctions_auctiondocument BEGIN
+        INSERT INTO auctions_auctiondocument_fts(rowid, title_lat, text_lat)
+        VALUES (new.id, new.title_lat, new.text_lat);
+    END
+    """,
+    """
+    CREATE TRIGGER auctions_auctiondocument_fts_delete AFTER DELETE ON auctions_auctiondocument BEGIN
+        INSERT INTO auctions_auctiondocument_fts(auctions_auctiondocument_fts, rowid, title_lat, text_lat)
+        VALUES ('delete', old.id, old.title_lat, old.text_lat);
+    END
+    """,
+    """
+    CREATE TRIGGER auctions_auctiondocument_fts_update AFTER UPDATE OF title_lat, text_lat ON auctions_auctiondocument BEGIN
+        INSERT INTO auctions_auctiondocument_fts(auctions_auctiondocument_fts, rowid, title_lat, text_lat)
+        VALUES ('delete', old.id, old.title_lat, old.text_lat);
+        INSERT INTO auctions_auctiondocument_fts(rowid, title_lat, text_lat)
+        VALUES (new.id, new.title_lat, new.text_lat);
+    END
+    """,
+    "INSERT INTO auctions_auctiondocument_fts(auctions_auctiondocument_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER auctions_auction_fts_insert",
+    "DROP TRIGGER auctions_auction_fts_delete",
+    "DROP TRIGGER auctions_auction_fts_update",
+    "DROP TABLE auctions_auction_fts",
+    "DROP TRIGGER auctions_auctiondocument_fts_insert",
+    "DROP TRIGGER auctions_auctiondocument_fts_delete",
+    "DROP TRIGGER auctions_auctiondocument_fts_update",
+    "DROP TABLE auctions_auctiondocument_fts",
+]
+
+STATEMENTS = {
+    'postgresql': (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+    'sqlite': (SQLITE_FORWARD, SQLITE_BACKWARD),
+}
+
+
+def run_statements(schema_editor, backward):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    # Other databases search without an index
+    if statements:
+        for statement in statements[backward]:
+            schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    run_statements(schema_editor, backward=False)
+
+
+def drop_search_index(apps, schema_editor):
+    run_statements(schema_editor, backward=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0008_auction_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
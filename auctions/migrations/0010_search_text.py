@@ -0,0 +1,139 @@
+# Generated by Django 5.1.4 on 2026-10-19 01:05
+
+from django.db import migrations, models
+
+TRIGRAM_TABLES = ('auctions_auction', 'auctions_location', 'auctions_executor', 'auctions_tag')
+
+# PostgreSQL: the auction tsvector is generated from the folded search text;
+# substring lookups on search_text use trigram indexes
+POSTGRES_FORWARD = [
+    "ALTER TABLE auctions_auction DROP COLUMN search_vector",
+    """
+    ALTER TABLE auctions_auction ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        to_tsvector('simple', search_text)
+    ) STORED
+    """,
+    "CREATE INDEX auctions_auction_search_idx ON auctions_auction USING gin (search_vector)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    *(
+        f"CREATE INDEX {table}_search_text_trgm ON {table} USING gin (search_text gin_trgm_ops)"
+        for table in TRIGRAM_TABLES
+    ),
+]
+POSTGRES_BACKWARD = [
+    *(f"DROP INDEX {table}_search_text_trgm" for table in TRIGRAM_TABLES),
+    "ALTER TABLE auctions_auction DROP COLUMN search_vector",
+    """
+    ALTER TABLE auctions_auction ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title_lat, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description_lat, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX auctions_auction_search_idx ON auctions_auction USING gin (search_vector)",
+]
+
+SQLITE_DROP_AUCTION_INDEX = [
+    "DROP TRIGGER IF EXISTS auctions_auction_fts_insert",
+    "DROP TRIGGER IF EXISTS auctions_auction_fts_delete",
+    "DROP TRIGGER IF EXISTS auctions_auction_fts_update",
+    "DROP TABLE IF EXISTS auctions_auction_fts",
+]
+
+
+def sqlite_auction_index(columns):
+    """
+    Statements (re)creating the auction FTS5 table over `columns`. Adding a
+    column rebuilds auctions_auction on SQLite, which drops its triggers and
+    renumbers its rowids, so the index is always created from scratch.
+    """
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    return [
+        *SQLITE_DROP_AUCTION_INDEX,
+        f"""
+        CREATE VIRTUAL TABLE auctions_auction_fts USING fts5(
+            {column_list}, content='auctions_auction', tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER auctions_auction_fts_insert AFTER INSERT ON auctions_auction BEGIN
+            INSERT INTO auctions_auction_fts(rowid, {column_list}) VALUES (new.rowid, {new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER auctions_auction_fts_delete AFTER DELETE ON auctions_auction BEGIN
+            INSERT INTO auctions_auction_fts(auctions_auction_fts, rowid, {column_list})
+            VALUES ('delete', old.rowid, {old_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER auctions_auction_fts_update AFTER UPDATE OF {column_list} ON auctions_auction BEGIN
+            INSERT INTO auctions_auction_fts(auctions_auction_fts, rowid, {column_list})
+            VALUES ('delete', old.rowid, {old_values});
+            INSERT INTO auctions_auction_fts(rowid, {column_list}) VALUES (new.rowid, {new_values});
+        END
+        """,
+        "INSERT INTO auctions_auction_fts(auctions_auction_fts) VALUES ('rebuild')",
+    ]
+
+
+def execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def index_search_text(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        execute(schema_editor, POSTGRES_FORWARD)
+    elif vendor == 'sqlite':
+        execute(schema_editor, sqlite_auction_index(['search_text']))
+
+
+def unindex_search_text(apps, schema_editor):
+    # Runs before search_text is dropped, which the generated column and the
+    # SQLite triggers depend on
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        execute(schema_editor, POSTGRES_BACKWARD)
+    elif vendor == 'sqlite':
+        execute(schema_editor, SQLITE_DROP_AUCTION_INDEX)
+
+
+def restore_title_index(apps, schema_editor):
+    # Runs after search_text is dropped, which rebuilds auctions_auction on SQLite
+    if schema_editor.connection.vendor == 'sqlite':
+        execute(schema_editor, sqlite_auction_index(['title_lat', 'description_lat']))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0009_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_title_index),
+        migrations.AddField(
+            model_name='auction',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='executor',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Search text'),
+        ),
+        migrations.RunPython(index_search_text, unindex_search_text),
+    ]
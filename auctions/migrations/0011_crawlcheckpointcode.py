@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0010_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlCheckpointCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, verbose_name='Code')),
+                ('position', models.PositiveIntegerField(blank=True, null=True, verbose_name='Discovery position')),
+                ('processed', models.BooleanField(default=False, verbose_name='Processed')),
+                ('state', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoint_codes', to='auctions.crawlstate')),
+            ],
+            options={
+                'verbose_name': 'Crawl Checkpoint Code',
+                'verbose_name_plural': 'Crawl Checkpoint Codes',
+                'constraints': [models.UniqueConstraint(fields=('state', 'code'), name='unique_checkpoint_code')],
+            },
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:40
+
+from django.db import migrations, models
+
+# PostgreSQL: the document tsvector is generated from the folded search text,
+# like the auction one, so folded query terms match it. Text is capped to stay
+# within the tsvector size limit.
+POSTGRES_FORWARD = [
+    "ALTER TABLE auctions_auctiondocument DROP COLUMN search_vector",
+    """
+    ALTER TABLE auctions_auctiondocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        to_tsvector('simple', left(search_text, 200000))
+    ) STORED
+    """,
+    "CREATE INDEX auctions_auctiondocument_search_idx ON auctions_auctiondocument USING gin (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "ALTER TABLE auctions_auctiondocument DROP COLUMN search_vector",
+    """
+    ALTER TABLE auctions_auctiondocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title_lat, '')), 'A') ||
+        setweight(to_tsvector('simple', left(coalesce(text_lat, ''), 200000)), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX auctions_auctiondocument_search_idx ON auctions_auctiondocument USING gin (search_vector)",
+]
+
+SQLITE_DROP_DOCUMENT_INDEX = [
+    "DROP TRIGGER IF EXISTS auctions_auctiondocument_fts_insert",
+    "DROP TRIGGER IF EXISTS auctions_auctiondocument_fts_delete",
+    "DROP TRIGGER IF EXISTS auctions_auctiondocument_fts_update",
+    "DROP TABLE IF EXISTS auctions_auctiondocument_fts",
+]
+
+
+def sqlite_document_index(columns):
+    """
+    Statements (re)creating the document FTS5 table over `columns`. Adding a
+    column rebuilds auctions_auctiondocument on SQLite, which drops its
+    triggers, so the index is always created from scratch.
+    """
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    return [
+        *SQLITE_DROP_DOCUMENT_INDEX,
+        f"""
+        CREATE VIRTUAL TABLE auctions_auctiondocument_fts USING fts5(
+            {column_list}, content='auctions_auctiondocument', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER auctions_auctiondocument_fts_insert AFTER INSERT ON auctions_auctiondocument BEGIN
+            INSERT INTO auctions_auctiondocument_fts(rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER auctions_auctiondocument_fts_delete AFTER DELETE ON auctions_auctiondocument BEGIN
+            INSERT INTO auctions_auctiondocument_fts(auctions_auctiondocument_fts, rowid, {column_list})
+            VALUES ('delete', old.id, {old_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER auctions_auctiondocument_fts_update AFTER UPDATE OF {column_list} ON auctions_auctiondocument BEGIN
+            INSERT INTO auctions_auctiondocument_fts(auctions_auctiondocument_fts, rowid, {column_list})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO auctions_auctiondocument_fts(rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+        """,
+        "INSERT INTO auctions_auctiondocument_fts(auctions_auctiondocument_fts) VALUES ('rebuild')",
+    ]
+
+
+def execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def index_search_text(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        execute(schema_editor, POSTGRES_FORWARD)
+    elif vendor == 'sqlite':
+        execute(schema_editor, sqlite_document_index(['search_text']))
+
+
+def unindex_search_text(apps, schema_editor):
+    # Runs before search_text is dropped, which the generated column and the
+    # SQLite triggers depend on
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        execute(schema_editor, POSTGRES_BACKWARD)
+    elif vendor == 'sqlite':
+        execute(schema_editor, SQLITE_DROP_DOCUMENT_INDEX)
+
+
+def restore_text_index(apps, schema_editor):
+    # Runs after search_text is dropped, which rebuilds auctions_auctiondocument on SQLite
+    if schema_editor.connection.vendor == 'sqlite':
+        execute(schema_editor, sqlite_document_index(['title_lat', 'text_lat']))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0011_crawlcheckpointcode'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_text_index),
+        migrations.AddField(
+            model_name='auctiondocument',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Search text'),
+        ),
+        migrations.RunPython(index_search_text, unindex_search_text),
+    ]
@@ -2,9 +2,10 @@ from .auction_model import Auction
 from .category_model import Category
 from .tag_model import Tag
 from .executor_model import Executor
-from .location_model import Location
+from .location_model import Location, Municipality, CadastralMunicipality
 from .image_model import Image
 from .auction_document_model import AuctionDocument
+from .crawl_state_model import CrawlState, CrawlCheckpointCode
 
 __all__ = [
     'Auction',
@@ -12,6 +13,10 @@ __all__ = [
     'Tag',
     'Executor',
     'Location',
+    'Municipality',
+    'CadastralMunicipality',
     'Image',
     'AuctionDocument',
+    'CrawlState',
+    'CrawlCheckpointCode',
 ]
\ No newline at end of file
@@ -1,9 +1,25 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from .base_model import BaseModel
+from .base_model import BaseModel, SearchTextMixin
 
-class AuctionDocument(BaseModel):
+class AuctionDocument(BaseModel, SearchTextMixin):
     file = models.FileField(_("File"), upload_to='auction_documents/')
+
+    # Download state; the file is stored under its SHA-256, shared by identical documents
+    source_url = models.URLField(_("Source URL"), max_length=500, blank=True)
+    sha256 = models.CharField(_("SHA-256"), max_length=64, blank=True, db_index=True, editable=False)
+    size = models.PositiveBigIntegerField(_("Size"), null=True, blank=True, editable=False)
+    etag = models.CharField(_("ETag"), max_length=255, blank=True, editable=False)
+    fetched_at = models.DateTimeField(_("Fetched at"), null=True, blank=True, editable=False)
+
+    # Extracted text in both scripts; text_sha256 is the file hash it was extracted from,
+    # also set with no page count when the file could not be parsed
+    text_sr = models.TextField(_("Text (Cyrillic)"), blank=True, editable=False)
+    text_lat = models.TextField(_("Text (Latin)"), blank=True, editable=False)
+    page_count = models.PositiveIntegerField(_("Pages"), null=True, blank=True, editable=False)
+    text_sha256 = models.CharField(max_length=64, blank=True, db_index=True, editable=False)
+
+    search_text_fields = ('title_sr', 'text_lat')
     
     slug = None  # Remove the slug field
     description_sr = None  # Remove the meta_description field    
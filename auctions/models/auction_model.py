@@ -1,6 +1,6 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from .base_model import BaseModel
+from .base_model import BaseModel, SearchTextMixin
 from .category_model import Category
 from .tag_model import Tag
 from .executor_model import Executor
@@ -8,11 +8,12 @@ from .location_model import Location
 from .image_model import Image
 from .auction_document_model import AuctionDocument
 
-class Auction(BaseModel):
+class Auction(BaseModel, SearchTextMixin):
     STATUS_CHOICES = [
         ('CONFIRMATION_IN_PROGRESS', _('Потврђивање у току')),
         ('CONFIRMED', _('Потврђено')),
     ]
+    search_text_fields = ('code', 'title_sr', 'description_sr')
 
     # Basic information
     code = models.CharField(_("Code"), max_length=20, primary_key=True)
@@ -49,6 +50,12 @@ class Auction(BaseModel):
     # Additional Info
     sale_number = models.CharField(_("Sale Number"), max_length=50)
 
+    # Scraping
+    content_hash = models.CharField(_("Content Hash"), max_length=64, blank=True, editable=False)
+    # Refresh scheduling: next_refresh_at orders the queue of auctions to re-fetch
+    refreshed_at = models.DateTimeField(_("Refreshed at"), null=True, blank=True, editable=False)
+    next_refresh_at = models.DateTimeField(_("Next refresh at"), null=True, blank=True, editable=False, db_index=True)
+
     # Relations
     location = models.ForeignKey(
         Location,
@@ -1,10 +1,72 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import get_language
-from django.db.models import F
+from django.db.models import Count, F, Q
 from auctions.utils.content_utils import SerbianTextConverter
 from django.urls import reverse
 
+class AuctionCountQuerySet(models.QuerySet):
+    """QuerySet of models auctions point to (categories, locations, executors, tags)"""
+
+    def with_counted_auctions(self):
+        """Annotate the counts the counter columns should hold, counted from the auctions"""
+        return self.annotate(
+            counted_active_auctions=Count('auctions', filter=Q(auctions__is_active=True), distinct=True),
+            counted_auctions=Count('auctions', distinct=True),
+        )
+
+    def reconcile_auction_counts(self):
+        """Reset the counter columns that drifted from the counted auctions; returns how many rows were fixed"""
+        drifted = [
+            obj for obj in self.with_counted_auctions()
+            if (obj.active_auction_count, obj.auction_count) != (obj.counted_active_auctions, obj.counted_auctions)
+        ]
+        for obj in drifted:
+            obj.active_auction_count = obj.counted_active_auctions
+            obj.auction_count = obj.counted_auctions
+        self.model.objects.bulk_update(drifted, ['active_auction_count', 'auction_count'], batch_size=500)
+        return len(drifted)
+
+
+class AuctionCountMixin(models.Model):
+    """
+    Counters of the auctions pointing to a row, so list pages read them
+    without touching the auction table. They are kept up to date by
+    AuctionCounters wherever auctions are written in bulk, and by signals
+    on Auction save(), delete() and tag changes. Other writes that send no
+    signals (QuerySet.update(), bulk_create(), raw SQL) leave them stale until
+    reconcile_auction_counts() corrects them.
+    """
+    active_auction_count = models.PositiveIntegerField(_("Active auctions"), default=0, editable=False)
+    auction_count = models.PositiveIntegerField(_("Auctions"), default=0, editable=False)
+
+    objects = AuctionCountQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+
+class SearchTextMixin(models.Model):
+    """
+    Folded text of a row for search in any script: the `search_text_fields`
+    run through SerbianTextConverter.fold, so one lookup on search_text
+    matches Cyrillic, Latin and diacritic-free queries alike. BaseModel.save
+    keeps it current; writes that bypass save() call build_search_text(),
+    and the backfill_search_text command fills existing rows.
+    """
+    search_text_fields = ('title_sr',)
+
+    search_text = models.TextField(_("Search text"), blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def build_search_text(self):
+        return ' '.join(filter(None, (
+            SerbianTextConverter.fold(str(getattr(self, field) or '')) for field in self.search_text_fields
+        )))
+
+
 class BaseModel(models.Model):
     # Core fields in both scripts
     title_sr = models.CharField(_("Title (Cyrillic)"), max_length=255)
@@ -83,6 +145,9 @@ class BaseModel(models.Model):
                     existing_instance=self,
                 )
 
+        if hasattr(self, 'build_search_text'):
+            self.search_text = self.build_search_text()
+
         super().save(*args, **kwargs)
 
 
@@ -1,8 +1,8 @@
 from django.utils.translation import gettext_lazy as _
-from .base_model import BaseModel
+from .base_model import AuctionCountMixin, BaseModel
 from django.db import models
 
-class Category(BaseModel):
+class Category(BaseModel, AuctionCountMixin):
     """Category model for organizing content"""
     parent = models.ForeignKey(
         'self', 
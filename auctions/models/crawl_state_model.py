@@ -0,0 +1,39 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+class CrawlState(models.Model):
+    """Watermark of the last completed crawl of a scraper and the checkpoint of a running one"""
+    name = models.CharField(_("Name"), max_length=50, unique=True)
+    watermark_code = models.CharField(_("Newest auction code"), max_length=20, blank=True)
+    crawled_at = models.DateTimeField(_("Crawled at"), null=True, blank=True)
+    checkpoint = models.JSONField(_("Checkpoint"), default=dict, blank=True)
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Crawl State")
+        verbose_name_plural = _("Crawl States")
+
+    def __str__(self):
+        return f"{self.name} ({self.crawled_at})"
+
+
+class CrawlCheckpointCode(models.Model):
+    """
+    An auction code of a running crawl's checkpoint: its place in discovery
+    order once discovered, and whether its details are saved. One row per
+    code, so checkpointing a page or a flush only writes the new codes.
+    """
+    state = models.ForeignKey(CrawlState, on_delete=models.CASCADE, related_name='checkpoint_codes')
+    code = models.CharField(_("Code"), max_length=20)
+    position = models.PositiveIntegerField(_("Discovery position"), null=True, blank=True)
+    processed = models.BooleanField(_("Processed"), default=False)
+
+    class Meta:
+        verbose_name = _("Crawl Checkpoint Code")
+        verbose_name_plural = _("Crawl Checkpoint Codes")
+        constraints = [
+            models.UniqueConstraint(fields=['state', 'code'], name='unique_checkpoint_code'),
+        ]
+
+    def __str__(self):
+        return self.code
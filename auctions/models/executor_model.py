@@ -1,10 +1,10 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from .base_model import BaseModel
+from .base_model import AuctionCountMixin, BaseModel, SearchTextMixin
 from django.utils.text import slugify
 from django.urls import reverse
 
-class Executor(BaseModel):
+class Executor(BaseModel, AuctionCountMixin, SearchTextMixin):
     email = models.EmailField(_("Email"), blank=True)
     phone = models.CharField(_("Phone"), max_length=50, blank=True)
     jurisdiction = models.CharField(_("Jurisdiction"), max_length=200, blank=True)
@@ -1,15 +1,37 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from .base_model import BaseModel
+from .base_model import AuctionCountMixin, BaseModel, SearchTextMixin
 from django.urls import reverse
 from django.utils.text import slugify
+from auctions.utils.content_utils import SerbianTextConverter
 
-class Location(BaseModel):
+
+def katastar_name_key(name):
+    """Script, case and whitespace insensitive lookup key of a katastar name"""
+    name = ' '.join((name or '').split())
+    if name and not SerbianTextConverter.is_cyrillic(name):
+        # Lowercase first so the lj/nj/dž digraphs are recognized
+        name = SerbianTextConverter.to_cyrillic(name.lower())
+    return name.upper()
+
+
+class Location(BaseModel, AuctionCountMixin, SearchTextMixin):
     municipality = models.CharField(_("Municipality"), max_length=100, blank=True)
     city = models.CharField(_("City"), max_length=100)
     cadastral_municipality = models.CharField(_("Cadastral Municipality"), max_length=100, blank=True)
 
+    # Canonical katastar rows the scraped names resolve to
+    katastar_municipality = models.ForeignKey(
+        'Municipality', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='locations', verbose_name=_("Katastar municipality")
+    )
+    katastar_cadastral_municipality = models.ForeignKey(
+        'CadastralMunicipality', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='locations', verbose_name=_("Katastar cadastral municipality")
+    )
+
     source_field = 'city'  # Use the `city` field for slug generation
+    search_text_fields = ('title_sr', 'city', 'municipality', 'cadastral_municipality')
 
     class Meta:
         verbose_name = _("Location")
@@ -26,8 +48,9 @@ class Location(BaseModel):
         return reverse('auctions:location-detail', kwargs={'slug': self.slug})
 
 class Municipality(models.Model):
-    name = models.CharField(max_length=255)
-    value = models.CharField(max_length=20)  # Using CharField as these appear to be codes
+    name = models.CharField(max_length=255, db_index=True)
+    value = models.CharField(max_length=20, unique=True)  # Using CharField as these appear to be codes
+    name_key = models.CharField(max_length=255, db_index=True, editable=False, default='')
     
     class Meta:
         verbose_name_plural = _("municipalities")
@@ -36,14 +59,29 @@ class Municipality(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.name_key = katastar_name_key(self.name)
+        super().save(*args, **kwargs)
+
 class CadastralMunicipality(models.Model):
     municipality = models.ForeignKey(Municipality, on_delete=models.CASCADE, related_name=_('cadastral_municipalities'))
-    name = models.CharField(max_length=255)
-    value = models.CharField(max_length=20)
+    name = models.CharField(max_length=255, db_index=True)
+    value = models.CharField(max_length=20, db_index=True)
+    name_key = models.CharField(max_length=255, db_index=True, editable=False, default='')
     
     class Meta:
         verbose_name_plural = _("cadastral municipalities")
         ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['municipality', 'value'], name='unique_cadastral_municipality_value'),
+        ]
+        indexes = [
+            models.Index(fields=['municipality', 'name_key'], name='cadastral_municipality_key_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.name} ({self.municipality.name})"
\ No newline at end of file
+        return f"{self.name} ({self.municipality.name})"
+
+    def save(self, *args, **kwargs):
+        self.name_key = katastar_name_key(self.name)
+        super().save(*args, **kwargs)
@@ -1,8 +1,8 @@
 from django.utils.translation import gettext_lazy as _
-from .base_model import BaseModel
+from .base_model import AuctionCountMixin, BaseModel, SearchTextMixin
 from django.urls import reverse
 
-class Tag(BaseModel):
+class Tag(BaseModel, AuctionCountMixin, SearchTextMixin):
     class Meta:
         verbose_name = _("Tag")
         verbose_name_plural = _("Tags")
@@ -0,0 +1,65 @@
+# auctions/signals.py
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Auction, AuctionDocument, Category, Executor, Image, Location, Tag
+from .utils.cache_utils import PageCache
+from .utils.counter_utils import AuctionCounters
+
+# Page cache tags invalidated by a change to each model
+CACHE_TAGS = {
+    Auction: ('auction',),
+    Category: ('category',),
+    Location: ('location',),
+    Executor: ('executor',),
+    Tag: ('tag',),
+    AuctionDocument: ('document',),
+    Image: ('auction',),
+}
+
+
+def invalidate_on_commit(*tags):
+    """Bump the tags once the change is committed, so no page renders the old rows again."""
+    transaction.on_commit(lambda: PageCache.invalidate(*tags))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_pages(sender, **kwargs):
+    if sender in CACHE_TAGS:
+        invalidate_on_commit(*CACHE_TAGS[sender])
+
+
+@receiver(m2m_changed, sender=Auction.tags.through)
+@receiver(m2m_changed, sender=Auction.images.through)
+@receiver(m2m_changed, sender=Auction.documents.through)
+def invalidate_cached_auction_relations(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_on_commit('auction', 'tag', 'document')
+
+
+@receiver(pre_save, sender=Auction)
+@receiver(pre_delete, sender=Auction)
+def snapshot_auction_counters(sender, instance, **kwargs):
+    AuctionCounters.begin(instance, [instance.pk])
+
+
+@receiver(post_save, sender=Auction)
+@receiver(post_delete, sender=Auction)
+def update_auction_counters(sender, instance, **kwargs):
+    AuctionCounters.end(instance)
+
+
+@receiver(m2m_changed, sender=Auction.tags.through)
+def update_tag_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('pre_add', 'pre_remove', 'pre_clear'):
+        if not reverse:
+            codes = [instance.pk]
+        elif pk_set is not None:
+            codes = pk_set
+        else:
+            codes = instance.auctions.values_list('pk', flat=True)
+        AuctionCounters.begin(instance, codes)
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        AuctionCounters.end(instance)
@@ -1,3 +1,3 @@
-from .auction_tasks import update_auction_status
+from .auction_tasks import update_auction_status, extract_document_texts, refresh_auctions, flush_view_counts, reconcile_auction_counters
 
-__all__ = ['update_auction_status']
\ No newline at end of file
+__all__ = ['update_auction_status', 'extract_document_texts', 'refresh_auctions', 'flush_view_counts', 'reconcile_auction_counters']
\ No newline at end of file
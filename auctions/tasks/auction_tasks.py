@@ -1,10 +1,50 @@
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from ..models.auction_model import Auction  # adjust import based on your model name
+from ..models import Category, Executor, Location, Tag
+from ..utils.cache_utils import PageCache, ViewCounter
+from ..utils.counter_utils import AuctionCounters
+from ..utils.document_utils import DocumentTextExtractor
+from ..utils.refresh_utils import AuctionRefreshScheduler
 
 @shared_task
 def update_auction_status():
-    return Auction.objects.filter(
-        is_active=True,
-        end_time__lte=timezone.now()
-    ).update(is_active=False)
\ No newline at end of file
+    with transaction.atomic():
+        codes = list(Auction.objects.select_for_update().filter(
+            is_active=True,
+            end_time__lte=timezone.now()
+        ).values_list('code', flat=True))
+        with AuctionCounters.track(codes):
+            ended = Auction.objects.filter(code__in=codes).update(is_active=False)
+    if ended:
+        PageCache.invalidate('auction')
+    return ended
+
+@shared_task
+def extract_document_texts():
+    # Celery's prefork workers cannot start a process pool, so extract inline
+    return DocumentTextExtractor(workers=1).run()
+
+@shared_task
+def refresh_auctions():
+    # Refreshes go over the JSON API only; skipped until AUCTION_REFRESH_ENABLED
+    if not settings.AUCTION_REFRESH_ENABLED:
+        return None
+    return AuctionRefreshScheduler().run()
+
+@shared_task
+def flush_view_counts():
+    # Views of pages served from the page cache are counted in the cache
+    return {
+        model._meta.model_name: ViewCounter.flush(model)
+        for model in (Auction, Category, Location, Executor, Tag)
+    }
+
+@shared_task
+def reconcile_auction_counters():
+    corrected = AuctionCounters.reconcile()
+    if any(corrected.values()):
+        PageCache.invalidate('category', 'location', 'executor', 'tag')
+    return corrected
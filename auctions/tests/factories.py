@@ -0,0 +1,42 @@
+# auctions/tests/factories.py
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from auctions.models import Auction, Category, Executor, Location
+
+
+def make_category(title_sr='Станови', **fields):
+    return Category.objects.create(title_sr=title_sr, **fields)
+
+
+def make_location(city='Чачак', **fields):
+    return Location.objects.create(title_sr=city, city=city, **fields)
+
+
+def make_executor(title_sr='Петар Петровић', **fields):
+    return Executor.objects.create(title_sr=title_sr, **fields)
+
+
+def make_auction(code, title_sr='Стан', category=None, location=None, **fields):
+    now = timezone.now()
+    values = {
+        'url': f'https://eaukcija.sud.rs/#/aukcije/{code}',
+        'publication_date': now - timedelta(days=10),
+        'start_time': now - timedelta(days=1),
+        'end_time': now + timedelta(days=7),
+        'starting_price': Decimal('1000.00'),
+        'estimated_value': Decimal('2000.00'),
+        'bidding_step': Decimal('100.00'),
+        'sale_number': '1',
+        'slug': f'auction-{code}'.lower(),
+    }
+    values.update(fields)
+    return Auction.objects.create(
+        code=code,
+        title_sr=title_sr,
+        category=category or make_category(),
+        location=location or make_location(),
+        **values,
+    )
@@ -0,0 +1,68 @@
+# auctions/tests/test_api_client.py
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from auctions.utils.replay_utils import ReplayCorpus, ReplayServer
+from auctions.utils.scraper_utils import AuctionApiClient, ScraperError
+
+# Recorded API responses; see fixtures/api_corpus/README.md for the endpoints they cover
+CORPUS = Path(__file__).parent / 'fixtures' / 'api_corpus'
+SITE_URL = 'https://eaukcija.sud.rs'
+
+
+class AuctionApiClientReplayTests(SimpleTestCase):
+    """AuctionApiClient against the replayed JSON API, over real HTTP."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ReplayServer(ReplayCorpus(CORPUS)).start()
+        cls.addClassCleanup(cls.server.stop)
+
+    def setUp(self):
+        self.client = AuctionApiClient(base_url=self.server.url, site_url=SITE_URL, retries=0)
+        self.addCleanup(self.client.close)
+
+    def test_total_pages(self):
+        self.assertEqual(self.client.get_total_pages(), 2)
+
+    def test_listing_page(self):
+        auctions, total = self.client.get_auction_page(1)
+        # Items without a code are skipped
+        self.assertEqual(auctions, [
+            {'code': '40211', 'numeric_code': '40211'},
+            {'code': '40198', 'numeric_code': '40198'},
+        ])
+        self.assertEqual(total, 5)
+        self.assertEqual([auction['code'] for auction in self.client.get_auction_codes(2)], ['40177', '40150'])
+
+    def test_details(self):
+        details = self.client.get_details('40211')
+
+        self.assertEqual(details['code'], '40211')
+        self.assertEqual(details['status'], 'Потврђено')
+        self.assertEqual(details['title'], 'Стан у Чачку, 54 m²')
+        self.assertEqual(details['url'], f'{SITE_URL}/#/aukcije/40211')
+        self.assertEqual(details['start_time'], datetime(2026, 10, 20, 8, 0, tzinfo=dt_timezone.utc))
+        self.assertIsNotNone(details['publication_date'].tzinfo)
+        self.assertEqual(details['pricing'], {
+            'starting_price': 2450000.0, 'estimated_value': 3500000.0, 'bidding_step': 35000.0,
+        })
+        info = details['additional_info']
+        self.assertEqual(info['sale_number'], '2')
+        self.assertEqual(info['location'], {'municipality': 'Чачак', 'city': 'Чачак', 'cadastral_municipality': 'Чачак'})
+        self.assertEqual(info['categories'], 'Станови')
+        self.assertEqual(info['tags'], ['Стан', 'Непокретност'])
+        self.assertEqual(info['executor'], 'Петар Петровић')
+        self.assertEqual(info['documents'], ['Закључак о продаји', 'Записник о процени', 'Скица'])
+        self.assertEqual(info['document_urls'], {
+            'Закључак о продаји': f'{SITE_URL}/api/documents/901/download',
+            # Upstream links in replayed responses point at the stand-in
+            'Записник о процени': f'{self.server.url}/api/documents/902/download',
+        })
+
+    def test_unknown_auction(self):
+        with self.assertRaisesMessage(ScraperError, 'HTTP 404'):
+            self.client.get_details('99999')
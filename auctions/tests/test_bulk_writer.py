@@ -0,0 +1,54 @@
+# auctions/tests/test_bulk_writer.py
+import json
+from pathlib import Path
+
+from django.test import TestCase
+
+from auctions.models import Auction
+from auctions.tests.factories import make_auction
+from auctions.utils.persistence_utils import AuctionBulkWriter
+from auctions.utils.scraper_utils import AuctionApiMapper
+
+AUCTION_PAYLOAD = Path(__file__).parent / 'fixtures' / 'api_corpus' / 'auction_40211.json'
+
+
+class AuctionBulkWriterCodeTests(TestCase):
+    """Auctions are written under the form of their code they are stored with."""
+
+    def details(self, code):
+        payload = json.loads(AUCTION_PAYLOAD.read_text(encoding='utf-8'))
+        return AuctionApiMapper.to_details(dict(payload, code=code), 'https://eaukcija.sud.rs/#/aukcije/40211')
+
+    def write(self, code):
+        flushed = []
+        writer = AuctionBulkWriter(on_flush=flushed.extend)
+        writer.add(self.details(code))
+        writer.flush()
+        return writer.counts, flushed
+
+    def test_api_code_updates_listing_code(self):
+        make_auction('ЕА-40211', title_sr='Стан')
+
+        counts, flushed = self.write('40211')
+
+        self.assertEqual(counts['updated'], 1)
+        self.assertEqual(flushed, ['ЕА-40211'])
+        auction = Auction.objects.get()
+        self.assertEqual(auction.code, 'ЕА-40211')
+        self.assertEqual(auction.title_sr, 'Стан у Чачку, 54 m²')
+
+    def test_listing_code_updates_api_code(self):
+        make_auction('40211', title_sr='Стан')
+
+        counts, _ = self.write('ЕА-40211')
+
+        self.assertEqual(counts['updated'], 1)
+        self.assertEqual(list(Auction.objects.values_list('code', flat=True)), ['40211'])
+
+    def test_other_number_is_a_new_auction(self):
+        make_auction('ЕА-140211', title_sr='Стан')
+
+        counts, _ = self.write('40211')
+
+        self.assertEqual(counts['created'], 1)
+        self.assertCountEqual(Auction.objects.values_list('code', flat=True), ['ЕА-140211', '40211'])
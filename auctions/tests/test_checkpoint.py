@@ -0,0 +1,54 @@
+# auctions/tests/test_checkpoint.py
+from django.test import TestCase
+
+from auctions.models import CrawlCheckpointCode, CrawlState
+from auctions.utils.checkpoint_utils import ScrapeCheckpoint
+
+
+class ScrapeCheckpointTests(TestCase):
+
+    def test_resume_restores_progress(self):
+        checkpoint = ScrapeCheckpoint('scrape_auctions')
+        checkpoint.start(max_pages=3)
+        checkpoint.page_done(1, ['30', '20'])
+        checkpoint.page_done(2, ['10'])
+        checkpoint.mark_processed(['20'])
+
+        resumed = ScrapeCheckpoint('scrape_auctions')
+        self.assertTrue(resumed.load())
+        self.assertEqual((resumed.max_pages, resumed.next_page), (3, 3))
+        self.assertEqual(resumed.codes, ['30', '20', '10'])
+        self.assertEqual(resumed.pending, ['30', '10'])
+
+    def test_checkpoint_writes_only_new_codes(self):
+        checkpoint = ScrapeCheckpoint('scrape_auctions')
+        checkpoint.start(max_pages=100)
+        for page_num in range(1, 21):
+            checkpoint.page_done(page_num, [f'{page_num}{index:02}' for index in range(20)])
+
+        # One insert of the page's codes and one update of the state, however many codes came before
+        with self.assertNumQueries(2):
+            checkpoint.page_done(21, ['9901', '9902'])
+        with self.assertNumQueries(1):
+            checkpoint.mark_processed(['101', '102', '101'])
+        with self.assertNumQueries(0):
+            checkpoint.mark_processed(['101'])
+
+    def test_clear(self):
+        checkpoint = ScrapeCheckpoint('scrape_auctions')
+        checkpoint.start(max_pages=1)
+        checkpoint.page_done(1, ['10'])
+        checkpoint.clear()
+
+        self.assertFalse(ScrapeCheckpoint('scrape_auctions').load())
+        self.assertFalse(CrawlCheckpointCode.objects.exists())
+
+    def test_loads_checkpoint_with_inline_codes(self):
+        CrawlState.objects.create(name='scrape_auctions', checkpoint={
+            'max_pages': 2, 'next_page': 2, 'discovery_complete': False,
+            'codes': ['30', '20'], 'processed': ['30'],
+        })
+
+        checkpoint = ScrapeCheckpoint('scrape_auctions')
+        self.assertTrue(checkpoint.load())
+        self.assertEqual(checkpoint.pending, ['20'])
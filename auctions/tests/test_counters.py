@@ -0,0 +1,90 @@
+# auctions/tests/test_counters.py
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from auctions.models import Auction, Category, Tag
+from auctions.tasks import update_auction_status
+from auctions.tests.factories import make_auction, make_category, make_location
+from auctions.utils.counter_utils import AuctionCounters
+
+
+class AuctionCountersTests(TestCase):
+
+    def setUp(self):
+        self.category = make_category()
+        self.location = make_location()
+        self.auction = make_auction('A-1', category=self.category, location=self.location)
+        AuctionCounters.reconcile()
+
+    def test_track_applies_the_difference(self):
+        with AuctionCounters.track(['A-1']):
+            Auction.objects.filter(code='A-1').update(is_active=False)
+        self.category.refresh_from_db()
+        self.assertEqual((self.category.active_auction_count, self.category.auction_count), (0, 1))
+
+    def test_stale_counter_does_not_block_status_updates(self):
+        Category.objects.filter(pk=self.category.pk).update(active_auction_count=0, auction_count=0)
+        Auction.objects.filter(code='A-1').update(end_time=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(update_auction_status(), 1)
+
+        self.assertFalse(Auction.objects.get(code='A-1').is_active)
+        self.category.refresh_from_db()
+        self.assertEqual((self.category.active_auction_count, self.category.auction_count), (0, 0))
+        self.assertEqual(AuctionCounters.reconcile()['category'], 1)
+        self.category.refresh_from_db()
+        self.assertEqual((self.category.active_auction_count, self.category.auction_count), (0, 1))
+
+
+class AuctionCounterSignalTests(TestCase):
+    """save(), delete() and tag changes keep the counters in step without a reconcile."""
+
+    def setUp(self):
+        self.category = make_category()
+        self.location = make_location()
+        self.tag = Tag.objects.create(title_sr='Стан')
+
+    def assertCounts(self, obj, active, total):
+        obj.refresh_from_db()
+        self.assertEqual((obj.active_auction_count, obj.auction_count), (active, total))
+
+    def test_save_and_delete(self):
+        auction = make_auction('A-1', category=self.category, location=self.location)
+        self.assertCounts(self.category, 1, 1)
+        self.assertCounts(self.location, 1, 1)
+
+        auction.is_active = False
+        auction.save()
+        self.assertCounts(self.category, 0, 1)
+
+        other = make_category('Куће')
+        auction.category = other
+        auction.save()
+        self.assertCounts(self.category, 0, 0)
+        self.assertCounts(other, 0, 1)
+
+        auction.delete()
+        self.assertCounts(other, 0, 0)
+        self.assertCounts(self.location, 0, 0)
+
+    def test_tag_changes(self):
+        auction = make_auction('A-1', category=self.category, location=self.location)
+        auction.tags.add(self.tag)
+        self.assertCounts(self.tag, 1, 1)
+        auction.tags.remove(self.tag)
+        self.assertCounts(self.tag, 0, 0)
+
+        self.tag.auctions.add(auction)
+        self.assertCounts(self.tag, 1, 1)
+        self.tag.auctions.clear()
+        self.assertCounts(self.tag, 0, 0)
+
+    def test_writes_inside_track_are_counted_once(self):
+        with AuctionCounters.track(['A-1']):
+            auction = make_auction('A-1', category=self.category, location=self.location)
+            auction.tags.add(self.tag)
+        self.assertCounts(self.category, 1, 1)
+        self.assertCounts(self.tag, 1, 1)
+        self.assertEqual(sum(AuctionCounters.reconcile().values()), 0)
@@ -0,0 +1,142 @@
+# auctions/tests/test_documents.py
+import hashlib
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from pypdf import PdfWriter
+
+from auctions.models import AuctionDocument
+from auctions.tests.factories import make_auction
+from auctions.utils.document_utils import DocumentFetcher, DocumentTextExtractor, document_storage_name
+from auctions.utils.replay_utils import ReplayCorpus, ReplayServer
+
+
+class TemporaryMediaMixin:
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+
+class DocumentTextExtractorTests(TemporaryMediaMixin, TestCase):
+
+    def store(self, title, content):
+        sha256 = hashlib.sha256(content).hexdigest()
+        name = default_storage.save(document_storage_name(sha256), ContentFile(content))
+        return AuctionDocument.objects.create(title_sr=title, file=name, sha256=sha256)
+
+    @staticmethod
+    def blank_pdf():
+        writer = PdfWriter()
+        writer.add_blank_page(width=200, height=200)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    def test_extracts_each_file_once(self):
+        document = self.store('Записник', self.blank_pdf())
+
+        self.assertEqual(DocumentTextExtractor(workers=1).run(), {'extracted': 1, 'cached': 0, 'failed': 0})
+        document.refresh_from_db()
+        self.assertEqual((document.page_count, document.text_sha256), (1, document.sha256))
+        self.assertEqual(DocumentTextExtractor(workers=1).pending(), {})
+
+    def test_unparseable_file_is_not_parsed_again(self):
+        document = self.store('Оштећен', b'not a pdf')
+
+        self.assertEqual(DocumentTextExtractor(workers=1).run()['failed'], 1)
+        document.refresh_from_db()
+        self.assertEqual((document.page_count, document.text_sr, document.text_sha256), (None, '', document.sha256))
+        self.assertEqual(DocumentTextExtractor(workers=1).run(), {'extracted': 0, 'cached': 0, 'failed': 0})
+        # force retries it
+        self.assertEqual(DocumentTextExtractor(workers=1, force=True).run()['failed'], 1)
+
+
+class DocumentFetcherTests(TemporaryMediaMixin, TestCase):
+
+    PDF = b'%PDF-1.4 stand-in document'
+
+    def serve(self, responses):
+        """Start a stand-in site serving {path: (status, body)}; returns its URL."""
+        corpus = ReplayCorpus(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, corpus.path)
+        for path, (status, body) in responses.items():
+            corpus.put(ReplayCorpus.key('GET', path), status, 'application/pdf', body)
+        server = ReplayServer(corpus).start()
+        self.addCleanup(server.stop)
+        return server.url
+
+    def fetch(self, codes=()):
+        fetcher = DocumentFetcher(workers=4, retries=1)
+        self.addCleanup(fetcher.close)
+        return fetcher.run(codes)
+
+    def test_error_response_is_not_unchanged(self):
+        url = self.serve({'/missing.pdf': (404, b'x' * 20)})
+        document = AuctionDocument.objects.create(
+            title_sr='Уклоњен', source_url=f'{url}/missing.pdf', sha256='a' * 64, size=20
+        )
+        make_auction('A-1').documents.add(document)
+
+        counts = self.fetch(['A-1'])
+
+        self.assertEqual((counts['failed'], counts['unchanged']), (1, 0))
+
+    def test_same_content_is_stored_once(self):
+        url = self.serve({f'/{number}.pdf': (200, self.PDF) for number in range(4)})
+        for number in range(4):
+            AuctionDocument.objects.create(title_sr=f'Документ {number}', source_url=f'{url}/{number}.pdf')
+
+        counts = self.fetch()
+
+        self.assertEqual((counts['downloaded'], counts['deduplicated']), (1, 3))
+        sha256 = hashlib.sha256(self.PDF).hexdigest()
+        self.assertEqual(set(AuctionDocument.objects.values_list('file', flat=True)), {document_storage_name(sha256)})
+        self.assertEqual(default_storage.listdir(f'auction_documents/sha256/{sha256[:2]}')[1], [f'{sha256}.pdf'])
+
+    def test_pending_documents_include_earlier_failures(self):
+        auction = make_auction('A-1')
+        saved = AuctionDocument.objects.create(
+            title_sr='Преузет', source_url='https://example.com/saved.pdf', sha256='a' * 64
+        )
+        auction.documents.add(saved)
+        failed = AuctionDocument.objects.create(title_sr='Није преузет', source_url='https://example.com/failed.pdf')
+        AuctionDocument.objects.create(title_sr='Без линка')
+        fetcher = DocumentFetcher()
+        self.addCleanup(fetcher.close)
+
+        self.assertEqual([document['pk'] for document in fetcher.pending_documents()], [failed.pk])
+        self.assertCountEqual(
+            [document['pk'] for document in fetcher.pending_documents(['A-1'])], [failed.pk, saved.pk]
+        )
+
+    def test_copy_renamed_by_the_storage_is_dropped(self):
+        name = document_storage_name(hashlib.sha256(self.PDF).hexdigest())
+        default_storage.save(name, ContentFile(self.PDF))
+        fetcher = DocumentFetcher()
+        self.addCleanup(fetcher.close)
+
+        # Another process stored the file between the existence check and the save
+        exists = default_storage.exists
+        checked = []
+
+        def exists_after_first_check(path):
+            if not checked:
+                checked.append(path)
+                return False
+            return exists(path)
+
+        with mock.patch.object(default_storage, 'exists', side_effect=exists_after_first_check):
+            stored = fetcher.store(name, io.BytesIO(self.PDF))
+
+        self.assertEqual(stored, (name, True))
+        self.assertEqual(default_storage.listdir(name.rsplit('/', 1)[0])[1], [name.rsplit('/', 1)[1]])
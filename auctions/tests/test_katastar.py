@@ -0,0 +1,272 @@
+# auctions/tests/test_katastar.py
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from auctions.models import CadastralMunicipality, Municipality
+from auctions.models.location_model import katastar_name_key
+from auctions.utils.katastar_utils import KatastarClient, KatastarImporter, iter_json_array
+from auctions.utils.replay_utils import ReplayCorpus, ReplayServer
+from auctions.utils.scraper_utils import ScraperError
+
+FORM_PATH = '/eKatastarPublic/PublicAccess.aspx'
+SELECT_NAME = 'ctl00$ContentPlaceHolder1$getOpstinaKO$dropOpstina'
+
+
+def webforms_page(view_state, event_validation, selected='', grid_rows=()):
+    """A PublicAccess.aspx page: hidden form state, the municipality dropdown and its GridView."""
+    options = ''.join(
+        f'<option value="{value}"{" selected" if value == selected else ""}>{name}</option>'
+        for value, name in (('', '-- Изаберите општину --'), ('70017', 'Чачак'), ('70106', 'Шабац'))
+    )
+    rows = ''.join(
+        '<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>' for row in grid_rows
+    )
+    grid = ''
+    if grid_rows:
+        grid = (
+            f'<table id="{KatastarClient.GRID_ID}"><tbody>'
+            '<tr><th>Р.бр.</th><th>Катастарска општина</th><th>Матични број</th></tr>'
+            f'{rows}'
+            # Pager row: a nested table, which is not part of the grid's rows
+            '<tr><td colspan="3"><table><tr><td>1</td><td>2</td><td>3</td></tr></table></td></tr>'
+            '</tbody></table>'
+        )
+    return f"""<html><body><form method="post" action="./PublicAccess.aspx" id="form1">
+        <input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />
+        <input type="hidden" name="__EVENTARGUMENT" id="__EVENTARGUMENT" value="" />
+        <input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{view_state}" />
+        <input type="hidden" name="__VIEWSTATEGENERATOR" id="__VIEWSTATEGENERATOR" value="8D0E13E6" />
+        <input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" value="{event_validation}" />
+        <select name="{SELECT_NAME}" id="{KatastarClient.SELECT_ID}"
+                onchange="javascript:setTimeout('__doPostBack(\\'{SELECT_NAME}\\',\\'\\')', 0)">{options}</select>
+        {grid}
+        <input type="submit" name="ctl00$btnSearch" value="Претрага" />
+    </form></body></html>""".encode('utf-8')
+
+
+def postback(value):
+    """The body of the dropdown postback for a municipality, as the browser sends it."""
+    return urlencode({
+        '__EVENTTARGET': SELECT_NAME,
+        '__EVENTARGUMENT': '',
+        '__VIEWSTATE': 'dDwtMTA4MzE0MjEwNTs7Pg==',
+        '__VIEWSTATEGENERATOR': '8D0E13E6',
+        '__EVENTVALIDATION': '/wEdAAOz0a',
+        SELECT_NAME: value,
+    }).encode('utf-8')
+
+
+class KatastarClientReplayTests(SimpleTestCase):
+    """KatastarClient against a canned WebForms page, over real HTTP."""
+
+    GRIDS = {
+        '70017': [('1', 'Атеница', '700011'), ('2', 'Чачак', '700029')],
+        '70106': [('1', 'Шабац', '701017')],
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        corpus = ReplayCorpus(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, corpus.path)
+        corpus.put(
+            ReplayCorpus.key('GET', FORM_PATH), 200, 'text/html; charset=utf-8',
+            webforms_page('dDwtMTA4MzE0MjEwNTs7Pg==', '/wEdAAOz0a'),
+        )
+        # Only a postback carrying the form state of the GET page is answered
+        for value, rows in cls.GRIDS.items():
+            corpus.put(
+                ReplayCorpus.key('POST', FORM_PATH, postback(value)), 200, 'text/html; charset=utf-8',
+                webforms_page(f'state-after-{value}', f'validation-after-{value}', selected=value, grid_rows=rows),
+            )
+        cls.server = ReplayServer(corpus).start()
+        cls.addClassCleanup(cls.server.stop)
+
+    def setUp(self):
+        self.client = KatastarClient(url=f'{self.server.url}{FORM_PATH}', retries=1)
+        self.addCleanup(self.client.close)
+
+    def test_load_form(self):
+        options = self.client.load_form()
+
+        self.assertEqual(options, [{'value': '70017', 'name': 'Чачак'}, {'value': '70106', 'name': 'Шабац'}])
+        self.assertEqual(self.client.form.select_name, SELECT_NAME)
+        self.assertEqual(self.client.form.fields['__VIEWSTATE'], 'dDwtMTA4MzE0MjEwNTs7Pg==')
+        self.assertEqual(self.client.form.fields['__EVENTVALIDATION'], '/wEdAAOz0a')
+        self.assertNotIn('ctl00$btnSearch', self.client.form.fields)
+
+    def test_scrape(self):
+        misses = self.server.counts['misses']
+
+        data = self.client.scrape(workers=2)
+
+        self.assertEqual(data, {'municipalities': [
+            {
+                'name': 'Чачак',
+                'value': '70017',
+                'cadastral_municipalities': [
+                    {'name': 'Атеница', 'value': '700011'},
+                    {'name': 'Чачак', 'value': '700029'},
+                ],
+            },
+            {
+                'name': 'Шабац',
+                'value': '70106',
+                'cadastral_municipalities': [{'name': 'Шабац', 'value': '701017'}],
+            },
+        ]})
+        self.assertEqual(self.server.counts['misses'], misses)
+
+    def test_postbacks_reuse_the_initial_form_state(self):
+        # A later postback page does not replace the state the others are sent with
+        self.client.load_form()
+        self.client.get_cadastral_municipalities('70106')
+
+        self.assertEqual(
+            self.client.get_cadastral_municipalities('70017'),
+            [{'name': 'Атеница', 'value': '700011'}, {'name': 'Чачак', 'value': '700029'}],
+        )
+
+    def test_unknown_form_state_fails(self):
+        self.client.load_form()
+        self.client.form.fields['__EVENTVALIDATION'] = 'stale'
+
+        with self.assertRaises(ScraperError):
+            self.client.get_cadastral_municipalities('70017')
+
+
+def snapshot(*municipalities):
+    """A scrape_katastar snapshot of (value, name, [(value, name), ...]) municipalities."""
+    return {
+        'scraped_at': '2026-10-18T10:00:00',
+        'municipalities': [
+            {
+                'name': name,
+                'value': value,
+                'cadastral_municipalities': [{'name': cadastral_name, 'value': cadastral_value}
+                                             for cadastral_value, cadastral_name in cadastral],
+            }
+            for value, name, cadastral in municipalities
+        ],
+    }
+
+
+class IterJsonArrayTests(SimpleTestCase):
+
+    def test_items_across_chunk_boundaries(self):
+        data = snapshot(
+            ('70017', 'Чачак', [('700011', 'Атеница'), ('700029', 'Чачак [град], "центар"')]),
+            ('70106', 'Шабац', []),
+        )
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+        for chunk_size in (1, 2, 7, 64 * 1024):
+            with self.subTest(chunk_size=chunk_size):
+                items = list(iter_json_array(io.StringIO(text), 'municipalities', chunk_size=chunk_size))
+                self.assertEqual(items, data['municipalities'])
+
+    def test_numbers_cut_by_chunk_boundaries(self):
+        text = '{"codes": [1234, 56789,0, 12.5e3]}'
+        self.assertEqual(list(iter_json_array(io.StringIO(text), 'codes', chunk_size=2)), [1234, 56789, 0, 12500.0])
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array(io.StringIO('{"municipalities": [ ]}'), 'municipalities', chunk_size=3)), [])
+
+    def test_missing_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('{"other": []}'), 'municipalities', chunk_size=4))
+
+
+class KatastarImporterTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = Path(directory) / 'katastar.json'
+
+    def run_import(self, data, **kwargs):
+        self.path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        return KatastarImporter(batch_size=1, **kwargs).run(self.path)
+
+    def stored(self):
+        return sorted(CadastralMunicipality.objects.values_list('municipality__value', 'value', 'name'))
+
+    def test_import(self):
+        diff = self.run_import(snapshot(
+            ('70017', 'Чачак', [('700011', 'Атеница'), ('700029', 'Чачак')]),
+            ('70106', ' Шабац ', [('701017', 'Шабац')]),
+        ))
+
+        self.assertEqual(len(diff['municipalities']['added']), 2)
+        self.assertEqual(len(diff['cadastral_municipalities']['added']), 3)
+        self.assertEqual(
+            dict(Municipality.objects.values_list('value', 'name')), {'70017': 'Чачак', '70106': 'Шабац'}
+        )
+        self.assertEqual(self.stored(), [
+            ('70017', '700011', 'Атеница'), ('70017', '700029', 'Чачак'), ('70106', '701017', 'Шабац'),
+        ])
+
+    def test_reimport_writes_nothing(self):
+        data = snapshot(('70017', 'Чачак', [('700011', 'Атеница'), ('700029', 'Чачак')]))
+        self.run_import(data)
+        pks = sorted(CadastralMunicipality.objects.values_list('pk', flat=True))
+
+        with CaptureQueriesContext(connection) as queries:
+            diff = self.run_import(data)
+
+        self.assertEqual(diff['municipalities'], {'added': [], 'renamed': [], 'removed': [], 'unchanged': 1})
+        self.assertEqual(diff['cadastral_municipalities'], {'added': [], 'renamed': [], 'removed': [], 'unchanged': 2})
+        writes = [q['sql'] for q in queries.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+        self.assertEqual(writes, [])
+        self.assertEqual(sorted(CadastralMunicipality.objects.values_list('pk', flat=True)), pks)
+
+    def test_renamed_and_removed(self):
+        self.run_import(snapshot(
+            ('70017', 'Чачак', [('700011', 'Атеница'), ('700029', 'Чачак')]),
+            ('70106', 'Шабац', [('701017', 'Шабац')]),
+        ))
+        renamed = CadastralMunicipality.objects.get(value='700011')
+
+        diff = self.run_import(snapshot(
+            ('70017', 'Град Чачак', [('700011', 'Атеница I'), ('700029', 'Чачак')]),
+        ))
+
+        self.assertEqual(diff['municipalities']['renamed'], [{'value': '70017', 'old_name': 'Чачак', 'name': 'Град Чачак'}])
+        self.assertEqual(diff['municipalities']['removed'], [{'value': '70106', 'name': 'Шабац'}])
+        self.assertEqual(
+            diff['cadastral_municipalities']['renamed'],
+            [{'value': ('70017', '700011'), 'old_name': 'Атеница', 'name': 'Атеница I'}],
+        )
+        self.assertEqual(diff['cadastral_municipalities']['removed'], [{'value': ('70106', '701017'), 'name': 'Шабац'}])
+        self.assertEqual(diff['cadastral_municipalities']['unchanged'], 1)
+        # A rename updates the row in place; without --prune removed rows are kept
+        renamed.refresh_from_db()
+        self.assertEqual(renamed.name, 'Атеница I')
+        self.assertEqual(renamed.name_key, katastar_name_key('Атеница I'))
+        self.assertTrue(Municipality.objects.filter(value='70106').exists())
+
+    def test_prune_deletes_removed(self):
+        self.run_import(snapshot(
+            ('70017', 'Чачак', [('700011', 'Атеница'), ('700029', 'Чачак')]),
+            ('70106', 'Шабац', [('701017', 'Шабац')]),
+        ))
+
+        self.run_import(snapshot(('70017', 'Чачак', [('700029', 'Чачак')])), prune=True)
+
+        self.assertEqual(list(Municipality.objects.values_list('value', flat=True)), ['70017'])
+        self.assertEqual(self.stored(), [('70017', '700029', 'Чачак')])
+
+    def test_dry_run_keeps_the_tables(self):
+        self.path.write_text(json.dumps(snapshot(('70017', 'Чачак', [])), ensure_ascii=False), encoding='utf-8')
+
+        diff = KatastarImporter().run(self.path, dry_run=True)
+
+        self.assertEqual(len(diff['municipalities']['added']), 1)
+        self.assertFalse(Municipality.objects.exists())
@@ -0,0 +1,58 @@
+# auctions/tests/test_list_views.py
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from auctions.models import Category
+from auctions.tests.factories import make_auction, make_category, make_executor, make_location
+from auctions.utils.counter_utils import AuctionCounters
+
+
+class ListViewQueryTests(TestCase):
+    """List pages read the counter columns, so their query count does not grow with the rows listed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.add_rows(2)
+
+    @staticmethod
+    def add_rows(count):
+        start = Category.objects.count()
+        for number in range(start, start + count):
+            make_auction(
+                f'A-{number}',
+                category=make_category(f'Категорија {number}'),
+                location=make_location(f'Град {number}'),
+                executor=make_executor(f'Извршитељ {number}'),
+            )
+        AuctionCounters.reconcile()
+
+    def setUp(self):
+        cache.clear()
+
+    def assertListQueries(self, url_name, queries):
+        url = reverse(url_name)
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.add_rows(3)
+        cache.clear()
+        with self.assertNumQueries(queries):
+            self.client.get(url)
+        # Served from the page cache
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        return response
+
+    def test_category_list(self):
+        # Paginator count, page and the active category total
+        response = self.assertListQueries('auctions:category-list', 3)
+        self.assertEqual(response.context['total_categories'], 2)
+        self.assertEqual([category.active_auction_count for category in response.context['object_list']], [1, 1])
+
+    def test_location_list(self):
+        self.assertListQueries('auctions:location-list', 2)
+
+    def test_executor_list(self):
+        self.assertListQueries('auctions:executor-list', 2)
+
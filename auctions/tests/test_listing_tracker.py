@@ -0,0 +1,31 @@
+# auctions/tests/test_listing_tracker.py
+from django.test import SimpleTestCase
+
+from auctions.utils.scraper_utils import ListingTracker
+
+
+class ListingTrackerTests(SimpleTestCase):
+
+    def test_repeated_codes_are_skipped(self):
+        tracker = ListingTracker()
+        tracker.add_page(1, ['1', '2', '3'])
+        # An auction published meanwhile pushed '3' onto page 2
+        new, duplicates = tracker.add_page(2, ['3', '4', '5'])
+        self.assertEqual((new, duplicates), (['4', '5'], 1))
+        self.assertEqual(tracker.counts['drift'], 1)
+
+    def test_size_change_is_drift(self):
+        tracker = ListingTracker()
+        self.assertFalse(tracker.size_changed(30))
+        self.assertFalse(tracker.size_changed(None))
+        self.assertFalse(tracker.size_changed(30))
+        self.assertTrue(tracker.size_changed(29))
+        self.assertEqual(tracker.counts['drift'], 1)
+
+    def test_rescan_recovers_shifted_codes(self):
+        tracker = ListingTracker()
+        tracker.add_page(1, ['1', '2', '3'])
+        # '2' was taken down, pulling '4' back onto page 1 before page 2 was read
+        tracker.add_page(2, ['5', '6', '7'])
+        self.assertEqual(tracker.rescan_page(1, ['1', '3', '4']), ['4'])
+        self.assertEqual(tracker.counts['recovered'], 1)
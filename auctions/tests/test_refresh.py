@@ -0,0 +1,101 @@
+# auctions/tests/test_refresh.py
+import json
+from datetime import timedelta
+from pathlib import Path
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from auctions.models import Auction
+from auctions.tests.factories import make_auction
+from auctions.utils.refresh_utils import AuctionRefreshScheduler, RefreshPolicy
+from auctions.utils.scraper_utils import AuctionApiMapper, ScraperError
+
+AUCTION_PAYLOAD = Path(__file__).parent / 'fixtures' / 'api_corpus' / 'auction_40211.json'
+
+
+class FailingClient:
+
+    def __init__(self):
+        self.requested = []
+
+    def get_details(self, code):
+        self.requested.append(code)
+        raise ScraperError(f"Request for {code} returned HTTP 404")
+
+
+class ApiClient:
+    """Answers like the JSON API, with the bare numeric code in the details."""
+
+    def __init__(self):
+        self.requested = []
+        self.payload = json.loads(AUCTION_PAYLOAD.read_text(encoding='utf-8'))
+
+    def get_details(self, code):
+        self.requested.append(code)
+        return AuctionApiMapper.to_details(dict(self.payload, code=code), f'https://eaukcija.sud.rs/#/aukcije/{code}')
+
+
+class RefreshPolicyTests(SimpleTestCase):
+
+    def test_ended_auction_gets_one_final_refresh(self):
+        policy = RefreshPolicy()
+        now = timezone.now()
+        end_time = now - timedelta(hours=1)
+
+        self.assertEqual(policy.next_refresh(None, end_time, now), now)
+        self.assertEqual(policy.next_refresh(None, end_time, now, refreshed_at=end_time - timedelta(minutes=5)), now)
+        self.assertIsNone(policy.next_refresh(None, end_time, now, refreshed_at=end_time + timedelta(minutes=5)))
+
+    def test_final_refresh_is_given_up(self):
+        now = timezone.now()
+        self.assertIsNone(RefreshPolicy().next_refresh(None, now - timedelta(days=2), now))
+
+
+class AuctionRefreshSchedulerTests(TestCase):
+
+    def run_scheduler(self, client):
+        return AuctionRefreshScheduler(budget_per_hour=120, interval=300, client=client).run()
+
+    def test_failed_final_refresh_is_retried(self):
+        now = timezone.now()
+        make_auction(
+            'A-1', start_time=now - timedelta(days=3), end_time=now - timedelta(hours=2), next_refresh_at=now,
+        )
+
+        counts = self.run_scheduler(FailingClient())
+
+        self.assertEqual(counts['failed'], 1)
+        auction = Auction.objects.get(code='A-1')
+        self.assertIsNone(auction.refreshed_at)
+        self.assertIsNotNone(auction.next_refresh_at)
+        self.assertGreaterEqual(auction.next_refresh_at, now + AuctionRefreshScheduler.RETRY_DELAY)
+
+    def test_pass_ends_when_the_api_keeps_failing(self):
+        now = timezone.now()
+        for number in range(6):
+            make_auction(f'A-{number}', next_refresh_at=now - timedelta(minutes=number))
+        client = FailingClient()
+
+        counts = self.run_scheduler(client)
+
+        self.assertEqual(len(client.requested), AuctionRefreshScheduler.MAX_CONSECUTIVE_FAILURES)
+        self.assertEqual(counts['failed'], AuctionRefreshScheduler.MAX_CONSECUTIVE_FAILURES)
+        # Auctions the pass did not reach stay due
+        self.assertEqual(Auction.objects.filter(next_refresh_at__lte=now).count(), 3)
+
+    def test_refresh_updates_the_stored_code(self):
+        now = timezone.now()
+        make_auction('ЕА-40211', title_sr='Стан', next_refresh_at=now - timedelta(minutes=1))
+        client = ApiClient()
+
+        counts = self.run_scheduler(client)
+
+        self.assertEqual(client.requested, ['40211'])
+        self.assertEqual(counts['refreshed'], 1)
+        # No second row under the API's code; the stored one is refreshed and no longer due
+        auction = Auction.objects.get()
+        self.assertEqual(auction.code, 'ЕА-40211')
+        self.assertEqual(auction.title_sr, 'Стан у Чачку, 54 m²')
+        self.assertIsNotNone(auction.refreshed_at)
+        self.assertGreater(auction.next_refresh_at, now)
@@ -0,0 +1,88 @@
+# auctions/tests/test_search.py
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from auctions.models import Auction, AuctionDocument
+from auctions.tests.factories import make_auction, make_category, make_location
+from auctions.utils.search_utils import AuctionSearch, ScanSearchBackend, search_terms
+
+
+class AuctionSearchViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        category = make_category()
+        location = make_location('Чачак')
+        cls.flat = make_auction('A-1', 'Стан у Чачку', category=category, location=location)
+        cls.house = make_auction('A-2', 'Кућа са окућницом', category=category, location=location)
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, query):
+        return self.client.get(reverse('auctions:auction-list'), {'q': query})
+
+    def found_codes(self, response):
+        return [auction.code for auction in response.context['object_list']]
+
+    def test_search_page_renders(self):
+        response = self.search('стан')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.found_codes(response), ['A-1'])
+
+    def test_latin_query_finds_cyrillic_auction(self):
+        for query in ('Čačku', 'cacku', 'ČAČKU'):
+            with self.subTest(query=query):
+                self.assertEqual(self.found_codes(self.search(query)), ['A-1'])
+
+    def test_terms_are_matched_as_prefixes(self):
+        self.assertEqual(self.found_codes(self.search('okućn')), ['A-2'])
+
+    def test_code_search(self):
+        self.assertEqual(self.found_codes(self.search('A-2')), ['A-2'])
+
+    def test_query_without_words_lists_everything(self):
+        response = self.search('?!')
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(self.found_codes(response), ['A-1', 'A-2'])
+
+
+class SearchBackendParityTests(TestCase):
+    """
+    The database's indexed backend finds what a scan of the folded text
+    finds, for auction and document text, in any script and with or
+    without diacritics.
+    """
+
+    QUERIES = {
+        'sabac': ['A-1', 'A-2'],
+        'šabac': ['A-1', 'A-2'],
+        'шабац': ['A-1', 'A-2'],
+        'ŠABAC': ['A-1', 'A-2'],
+        'djordja': ['A-2'],
+        'ђорђа': ['A-2'],
+        'kuca sabac': ['A-1'],
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        category = make_category()
+        location = make_location('Београд')
+        make_auction('A-1', 'Кућа у Шапцу, Шабац', category=category, location=location)
+        lot = make_auction('A-2', 'Локал', category=category, location=location)
+        document = AuctionDocument.objects.create(
+            title_sr='Записник о процени',
+            text_sr='Записник, Шабац, улица Ђорђа Вајферта',
+            text_lat='Zapisnik, Šabac, ulica Đorđa Vajferta',
+        )
+        lot.documents.add(document)
+
+    def found_codes(self, backend, query):
+        return sorted(backend.matching(Auction.objects.all(), search_terms(query)).values_list('code', flat=True))
+
+    def test_backends_agree(self):
+        for backend in (AuctionSearch.backend(), ScanSearchBackend()):
+            for query, codes in self.QUERIES.items():
+                with self.subTest(backend=type(backend).__name__, query=query):
+                    self.assertEqual(self.found_codes(backend, query), codes)
@@ -0,0 +1,123 @@
+# auctions/utils/cache_utils.py
+import hashlib
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+
+class PageCache:
+    """
+    Server-side cache of rendered pages. A page is stored with the versions
+    of the tags it depends on ('auction', 'category', 'auction:<slug>', ...)
+    built into its key, so bumping a tag invalidates every page depending on
+    it without finding those pages. Tag versions are unique timestamps
+    rather than counters, so a tag evicted from the cache never comes back
+    with a version an old page was stored under.
+    """
+
+    PREFIX = 'pagecache'
+    # The csrf token is per client; cached pages hold a placeholder instead
+    CSRF_INPUT = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+    CSRF_PLACEHOLDER = b'__csrf_token__'
+
+    @classmethod
+    def tag_key(cls, tag):
+        return f"{cls.PREFIX}:tag:{tag}"
+
+    @classmethod
+    def tag_versions(cls, tags):
+        keys = [cls.tag_key(tag) for tag in tags]
+        versions = cache.get_many(keys)
+        missing = {key: time.time_ns() for key in keys if key not in versions}
+        for key, version in missing.items():
+            # add() keeps a version another process set meanwhile
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+            versions[key] = version
+        return [versions[key] for key in keys]
+
+    @classmethod
+    def invalidate(cls, *tags):
+        if tags:
+            cache.set_many({cls.tag_key(tag): time.time_ns() for tag in set(tags)}, None)
+
+    @classmethod
+    def page_key(cls, language, path, query, tags):
+        """Key of a page: language, path, sorted query parameters and the current tag versions."""
+        params = '&'.join(f"{name}={value}" for name, value in sorted(query.lists()))
+        versions = ','.join(str(version) for version in cls.tag_versions(tags))
+        digest = hashlib.sha256(f"{language}|{path}|{params}|{versions}".encode('utf-8')).hexdigest()
+        return f"{cls.PREFIX}:page:{digest}"
+
+    @classmethod
+    def get(cls, key):
+        return cache.get(key)
+
+    @classmethod
+    def set(cls, key, response, view_count=None, timeout=None):
+        content = cls.CSRF_INPUT.sub(rb'\g<1>' + cls.CSRF_PLACEHOLDER + rb'\g<2>', response.content)
+        cache.set(key, {
+            'content': content,
+            'content_type': response['Content-Type'],
+            'view_count': view_count,
+        }, settings.PAGE_CACHE_TIMEOUT if timeout is None else timeout)
+
+    @classmethod
+    def render(cls, entry, csrf_token):
+        return entry['content'].replace(cls.CSRF_PLACEHOLDER, csrf_token.encode('ascii'))
+
+
+class ViewCounter:
+    """
+    View counts of pages served from the cache, kept in the cache and added
+    to the database in bulk by flush(), so a cache hit needs no query. Each
+    model has an index of the pks with pending views; it is updated without
+    a lock, so a lost index entry only delays those views to a later flush.
+    """
+
+    PREFIX = 'pagecache:views'
+
+    @classmethod
+    def count_key(cls, label, pk):
+        return f"{cls.PREFIX}:{label}:{pk}"
+
+    @classmethod
+    def index_key(cls, label):
+        return f"{cls.PREFIX}:{label}"
+
+    @classmethod
+    def record(cls, label, pk):
+        key = cls.count_key(label, pk)
+        cache.add(key, 0, None)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            return
+        if count == 1:
+            cls.add_to_index(label, pk)
+
+    @classmethod
+    def add_to_index(cls, label, pk):
+        index = cls.index_key(label)
+        cache.set(index, list(set(cache.get(index, [])) | {pk}), None)
+
+    @classmethod
+    def flush(cls, model):
+        """Add the pending views of `model` to view_count; returns the number of views added."""
+        label = model._meta.label_lower
+        pks = cache.get(cls.index_key(label), [])
+        cache.delete(cls.index_key(label))
+        added = 0
+        for pk in pks:
+            key = cls.count_key(label, pk)
+            count = cache.get(key) or 0
+            if count:
+                model.objects.filter(pk=pk).update(view_count=F('view_count') + count)
+                added += count
+                # Views recorded meanwhile stay pending for the next flush
+                if cache.decr(key, count):
+                    cls.add_to_index(label, pk)
+        return added
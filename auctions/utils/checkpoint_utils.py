@@ -0,0 +1,115 @@
+# auctions/utils/checkpoint_utils.py
+import threading
+
+from auctions.models import CrawlCheckpointCode, CrawlState
+
+
+class ScrapeCheckpoint:
+    """
+    Durable progress of a running crawl: how far discovery got, stored on
+    the scraper's CrawlState row, and every code it found and the codes
+    whose details are already saved, stored as CrawlCheckpointCode rows.
+    Each page and each flush only writes its own codes, so checkpointing
+    costs the same at the end of a long crawl as at its start. A crawl
+    started with --resume picks up from here instead of starting again at
+    page 1.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.max_pages = None
+        self.next_page = 1
+        self.discovery_complete = False
+        self.codes = []
+        self.processed = set()
+        self.state_id = None
+
+    @property
+    def pending(self):
+        """Discovered codes whose details have not been saved yet, in discovery order."""
+        with self.lock:
+            return [code for code in self.codes if code not in self.processed]
+
+    def load(self):
+        """Restore the stored checkpoint; returns False when there is none."""
+        row = CrawlState.objects.filter(name=self.name).values('pk', 'checkpoint').first()
+        if not row or not row['checkpoint']:
+            return False
+        state = row['checkpoint']
+        self.state_id = row['pk']
+        self.max_pages = state.get('max_pages')
+        self.next_page = state.get('next_page', 1)
+        self.discovery_complete = state.get('discovery_complete', False)
+        rows = CrawlCheckpointCode.objects.filter(state_id=self.state_id)
+        self.codes = list(
+            rows.filter(position__isnull=False).order_by('position').values_list('code', flat=True)
+        )
+        self.processed = set(rows.filter(processed=True).values_list('code', flat=True))
+        # Checkpoints written before the codes had rows of their own
+        self.codes = self.codes or state.get('codes', [])
+        self.processed.update(state.get('processed', []))
+        return True
+
+    def start(self, max_pages):
+        self.max_pages = max_pages
+        self.next_page = 1
+        self.discovery_complete = False
+        self.codes = []
+        self.processed = set()
+        self.save()
+        CrawlCheckpointCode.objects.filter(state_id=self.state_id).delete()
+
+    def page_done(self, page_num, codes):
+        with self.lock:
+            self.next_page = page_num + 1
+            start = len(self.codes)
+            self.codes.extend(codes)
+        self.write_codes(
+            [CrawlCheckpointCode(code=code, position=start + index) for index, code in enumerate(codes)],
+            'position',
+        )
+        self.save()
+
+    def finish_discovery(self):
+        self.discovery_complete = True
+        self.save()
+
+    def mark_processed(self, codes):
+        with self.lock:
+            codes = [code for code in dict.fromkeys(codes) if code not in self.processed]
+            self.processed.update(codes)
+        if codes:
+            self.write_codes([CrawlCheckpointCode(code=code, processed=True) for code in codes], 'processed')
+
+    def write_codes(self, rows, field):
+        """Insert the code rows, or set `field` on those that exist already."""
+        if self.state_id is None:
+            self.save()
+        for row in rows:
+            row.state_id = self.state_id
+        CrawlCheckpointCode.objects.bulk_create(
+            rows,
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['state', 'code'],
+            update_fields=[field],
+        )
+
+    def clear(self):
+        CrawlState.objects.filter(name=self.name).update(checkpoint={})
+        CrawlCheckpointCode.objects.filter(state__name=self.name).delete()
+
+    def save(self):
+        with self.lock:
+            state = {
+                'max_pages': self.max_pages,
+                'next_page': self.next_page,
+                'discovery_complete': self.discovery_complete,
+            }
+        if self.state_id is not None and CrawlState.objects.filter(pk=self.state_id).update(checkpoint=state):
+            return
+        crawl_state, _ = CrawlState.objects.update_or_create(name=self.name, defaults={'checkpoint': state})
+        self.state_id = crawl_state.pk
@@ -0,0 +1,142 @@
+# auctions/utils/concurrency_utils.py
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def backoff_delay(attempt, base=0.5, cap=10.0):
+    """
+    Full-jitter exponential backoff: a random delay between zero and
+    base * 2 ** attempt, capped, so retrying clients do not hit the site in step.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def call_with_retry(func, attempts=3, retry_on=(Exception,), base=0.5, cap=10.0):
+    """
+    Call func until it succeeds, sleeping a jittered backoff between attempts.
+    The last exception is re-raised once all attempts failed.
+    """
+    for attempt in range(attempts):
+        try:
+            return func()
+        except retry_on:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(backoff_delay(attempt, base, cap))
+
+
+class TokenBucket:
+    """
+    Rate limiter allowing `rate` requests per second on average with bursts
+    of up to `burst` requests. Usable from threads (acquire) and from the
+    event loop (acquire_async); both draw from the same bucket.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it."""
+        if not self.rate:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class AsyncDetailScraper:
+    """
+    Asyncio core of the detail phase. Each auction code becomes a task that
+    waits for a concurrency slot and a rate limiter token, runs the blocking
+    fetch (Selenium or HTTP) on a pool of `concurrency` threads and retries
+    it with jittered backoff. Results are saved on a single database thread,
+    so the ORM never runs on the event loop and only one writer exists.
+    """
+
+    def __init__(self, fetch, save, finish=None, concurrency=4, rate_limiter=None,
+                 retries=3, retry_on=(Exception,), log=None):
+        self.fetch = fetch
+        self.save = save
+        self.finish = finish
+        self.concurrency = max(concurrency, 1)
+        self.rate_limiter = rate_limiter
+        self.retries = max(retries, 1)
+        self.retry_on = retry_on
+        self.log = log
+        self.counts = {'fetched': 0, 'failed': 0, 'retried': 0}
+
+    def run(self, codes):
+        """Scrape all codes and return the counts; blocks until done."""
+        return asyncio.run(self.scrape_all(codes))
+
+    async def scrape_all(self, codes):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        fetch_pool = ThreadPoolExecutor(self.concurrency, thread_name_prefix='scrape-fetch')
+        db_pool = ThreadPoolExecutor(1, thread_name_prefix='scrape-db')
+        try:
+            tasks = [
+                asyncio.create_task(self.scrape_one(loop, semaphore, fetch_pool, db_pool, code))
+                for code in codes
+            ]
+            for index, task in enumerate(asyncio.as_completed(tasks), start=1):
+                await task
+                if self.log:
+                    self.log(f"[details] Completed {index} of {len(codes)} auctions")
+        finally:
+            if self.finish:
+                await loop.run_in_executor(db_pool, self.finish)
+            fetch_pool.shutdown(wait=True)
+            db_pool.shutdown(wait=True)
+        return self.counts
+
+    async def scrape_one(self, loop, semaphore, fetch_pool, db_pool, code):
+        async with semaphore:
+            details = await self.fetch_with_retry(loop, fetch_pool, code)
+        if not details:
+            self.counts['failed'] += 1
+            if self.log:
+                self.log(f"Failed to extract details for auction {code}")
+            return
+        self.counts['fetched'] += 1
+        await loop.run_in_executor(db_pool, self.save, details)
+
+    async def fetch_with_retry(self, loop, fetch_pool, code):
+        for attempt in range(self.retries):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async()
+            try:
+                details = await loop.run_in_executor(fetch_pool, self.fetch, code)
+                if details:
+                    return details
+                error = "no details extracted"
+            except self.retry_on as e:
+                error = str(e)
+            if attempt == self.retries - 1:
+                break
+            self.counts['retried'] += 1
+            delay = backoff_delay(attempt)
+            if self.log:
+                self.log(f"Retrying auction {code} in {delay:.1f}s ({error})")
+            await asyncio.sleep(delay)
+        return None
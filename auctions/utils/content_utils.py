@@ -1,4 +1,7 @@
 # auctions/content_utils.py
+import unicodedata
+
+from django.db.models import Q
 from django.utils.text import slugify
 
 class SerbianTextConverter:
@@ -97,6 +100,32 @@ class SerbianTextConverter:
 
         return latin_text.lower()
 
+    @classmethod
+    def fold(cls, text: str) -> str:
+        """
+        Fold text for script and diacritic insensitive search: Latin script,
+        lower case, no diacritics (č -> c, đ -> dj) and single spaces, so
+        "čačak", "cacak" and "чачак" fold to the same text.
+        """
+        if not text:
+            return ''
+
+        decomposed = unicodedata.normalize('NFKD', cls.normalize(text))
+        stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+        return ' '.join(stripped.split())
+
+    @staticmethod
+    def base_slug(source_text: str, model_class) -> str:
+        """
+        Build the slug a model instance would get before any uniqueness suffix.
+        """
+        if not source_text:
+            return f"unnamed-{model_class.__name__.lower()}"
+
+        # Normalize and slugify the text
+        normalized_text = SerbianTextConverter.normalize(source_text)
+        return slugify(normalized_text) or f"unnamed-{model_class.__name__.lower()}"
+
     @staticmethod
     def generate_unique_slug(source_text: str, model_class, existing_instance=None) -> str:
         """
@@ -107,16 +136,7 @@ class SerbianTextConverter:
         if getattr(model_class, 'slug', None) is None:
             return None
         
-        # Handle empty source text
-        if not source_text:
-            base_slug = f"unnamed-{model_class.__name__.lower()}"
-        else:
-            # Normalize and slugify the text
-            normalized_text = SerbianTextConverter.normalize(source_text)
-            base_slug = slugify(normalized_text)
-            
-            if not base_slug:
-                base_slug = f"unnamed-{model_class.__name__.lower()}"
+        base_slug = SerbianTextConverter.base_slug(source_text, model_class)
 
         # Check if we're updating an existing instance with a valid slug
         if existing_instance and getattr(existing_instance, 'slug', None):
@@ -146,4 +166,34 @@ class SerbianTextConverter:
             # Return new slug with incremented suffix
             return f"{base_slug}-{max_suffix + 1}"
         
-        return None
\ No newline at end of file
+        return None
+
+    @staticmethod
+    def generate_unique_slugs(source_texts, model_class) -> list:
+        """
+        Generate unique slugs for many new instances with a single query.
+        Slugs are also unique among each other, so they can be bulk created.
+        """
+        base_slugs = [SerbianTextConverter.base_slug(text, model_class) for text in source_texts]
+        if not base_slugs:
+            return []
+
+        query = Q()
+        for base_slug in set(base_slugs):
+            query |= Q(slug__startswith=base_slug)
+        taken = set(model_class.objects.filter(query).values_list('slug', flat=True))
+
+        slugs = []
+        for base_slug in base_slugs:
+            slug = base_slug
+            if slug in taken:
+                # Same suffix rule as generate_unique_slug
+                max_suffix = 0
+                for existing in taken:
+                    suffix = existing.replace(f"{base_slug}-", "")
+                    if suffix.isdigit():
+                        max_suffix = max(max_suffix, int(suffix))
+                slug = f"{base_slug}-{max_suffix + 1}"
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
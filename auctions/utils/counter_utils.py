@@ -0,0 +1,120 @@
+# auctions/utils/counter_utils.py
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from auctions.models import Auction, Category, Executor, Location, Tag
+
+
+class AuctionCounters:
+    """
+    Keeps the auction counters of categories, locations, executors and tags
+    (AuctionCountMixin) in step with bulk writes that send no signals. The
+    counted relations of the affected auctions are read before and after
+    the write, and only the difference is applied, with one F() update per
+    model and distinct delta. Use track() inside the write's transaction.
+    Counters are floored at zero, so a counter that drifted low never fails
+    the write; reconcile() recounts it.
+
+    Single-row writes (save(), delete() and tag changes, e.g. in the admin)
+    are counted by the signal handlers through begin() and end(), which do
+    nothing inside track() so a write is never counted twice.
+    """
+
+    RELATIONS = (('category_id', Category), ('location_id', Location), ('executor_id', Executor))
+    CHUNK_SIZE = 500
+    local = threading.local()
+
+    def __init__(self):
+        # {model: {pk: [active delta, total delta]}}
+        self.deltas = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+
+    @classmethod
+    def snapshot(cls, codes):
+        """{code: (is_active, [(model, pk), ...])} of the stored auctions among `codes`."""
+        codes = list(codes)
+        snapshot = {}
+        fields = [field for field, _ in cls.RELATIONS]
+        for start in range(0, len(codes), cls.CHUNK_SIZE):
+            chunk = codes[start:start + cls.CHUNK_SIZE]
+            for row in Auction.objects.filter(code__in=chunk).values('code', 'is_active', *fields):
+                snapshot[row['code']] = (
+                    row['is_active'],
+                    [(model, row[field]) for field, model in cls.RELATIONS if row[field] is not None],
+                )
+            for code, tag_id in Auction.tags.through.objects.filter(auction_id__in=chunk).values_list(
+                'auction_id', 'tag_id'
+            ):
+                if code in snapshot:
+                    snapshot[code][1].append((Tag, tag_id))
+        return snapshot
+
+    def count(self, snapshot, sign):
+        for is_active, related in snapshot.values():
+            for model, pk in related:
+                delta = self.deltas[model][pk]
+                delta[0] += sign if is_active else 0
+                delta[1] += sign
+
+    def apply(self):
+        for model, deltas in self.deltas.items():
+            groups = defaultdict(list)
+            for pk, (active, total) in deltas.items():
+                if active or total:
+                    groups[(active, total)].append(pk)
+            for (active, total), pks in groups.items():
+                model.objects.filter(pk__in=pks).update(
+                    active_auction_count=Greatest(F('active_auction_count') + active, 0),
+                    auction_count=Greatest(F('auction_count') + total, 0),
+                )
+        self.deltas.clear()
+
+    @classmethod
+    @contextmanager
+    def track(cls, codes):
+        """Apply the counter changes of whatever the block writes to the auctions with these codes."""
+        codes = list(codes)
+        counters = cls()
+        counters.count(cls.snapshot(codes), -1)
+        cls.local.depth = cls.tracking() + 1
+        try:
+            yield counters
+        finally:
+            cls.local.depth -= 1
+        counters.count(cls.snapshot(codes), 1)
+        counters.apply()
+
+    @classmethod
+    def tracking(cls):
+        """Number of track() blocks the current thread is in."""
+        return getattr(cls.local, 'depth', 0)
+
+    @classmethod
+    def begin(cls, instance, codes):
+        """Snapshot the auctions with these codes before a signalled write of `instance`."""
+        if not cls.tracking():
+            codes = list(codes)
+            instance._auction_counters = (codes, cls.snapshot(codes))
+
+    @classmethod
+    def end(cls, instance):
+        """Apply the counter changes of the write begin() was called for."""
+        pending = instance.__dict__.pop('_auction_counters', None)
+        if pending is None:
+            return
+        codes, before = pending
+        counters = cls()
+        counters.count(before, -1)
+        counters.count(cls.snapshot(codes), 1)
+        counters.apply()
+
+    @staticmethod
+    def reconcile():
+        """Recount every counter from the auctions; returns the number of rows corrected per model."""
+        return {
+            model._meta.model_name: model.objects.reconcile_auction_counts()
+            for model in (Category, Location, Executor, Tag)
+        }
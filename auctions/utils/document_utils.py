@@ -0,0 +1,354 @@
+# auctions/utils/document_utils.py
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import urllib3
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import F
+from django.utils import timezone
+
+from auctions.models import AuctionDocument
+from .cache_utils import PageCache
+from .concurrency_utils import call_with_retry
+from .content_utils import SerbianTextConverter
+from .metrics_utils import RunMetrics
+from .pdf_utils import extract_pdf_text
+from .scraper_utils import ScraperError
+
+
+def document_storage_name(sha256):
+    """Content address of a document: identical PDFs map to one stored file."""
+    return f"auction_documents/sha256/{sha256[:2]}/{sha256}.pdf"
+
+
+class DocumentFetcher:
+    """
+    Downloads the PDFs of auction documents into the default storage. Up to
+    `workers` files are fetched at once over one pooled connection manager,
+    behind the run's rate limiter. Bodies are streamed to a temporary file
+    while being hashed, so no file is held in memory, and stored under their
+    SHA-256. A document whose ETag, or failing that whose size, matches the
+    last download is not fetched again. Files are stored under a per-hash
+    lock, so threads fetching the same content store it once. Only the
+    calling thread touches the database.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, workers=4, rate_limiter=None, retries=3, timeout=60, log=None, metrics=None):
+        self.workers = max(workers, 1)
+        self.rate_limiter = rate_limiter
+        self.retries = max(retries, 1)
+        self.log = log
+        self.metrics = metrics or RunMetrics('document_fetcher')
+        self.http = urllib3.PoolManager(
+            maxsize=self.workers,
+            block=True,
+            timeout=urllib3.Timeout(connect=10, read=timeout),
+            retries=urllib3.Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        self.counts = {'downloaded': 0, 'deduplicated': 0, 'unchanged': 0, 'failed': 0}
+        self.store_locks = defaultdict(threading.Lock)
+        self.store_locks_lock = threading.Lock()
+
+    def is_unchanged(self, document, response):
+        if not document['sha256']:
+            return False
+        if response.status == 304:
+            return True
+        etag = response.headers.get('ETag', '')
+        if etag and document['etag']:
+            return etag == document['etag']
+        length = response.headers.get('Content-Length')
+        return length is not None and document['size'] is not None and int(length) == document['size']
+
+    def download(self, document):
+        """
+        Fetch one document; returns the fields to update on it, or None when it
+        has not changed. Runs on a fetch thread.
+        """
+        headers = {'If-None-Match': document['etag']} if document['etag'] and document['sha256'] else {}
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        try:
+            response = self.http.request('GET', document['source_url'], headers=headers, preload_content=False)
+        except urllib3.exceptions.HTTPError as e:
+            raise ScraperError(f"Request to {document['source_url']} failed: {e}") from e
+
+        try:
+            # An error page is never "unchanged", whatever its headers say
+            if response.status >= 400:
+                raise ScraperError(f"Request to {document['source_url']} returned HTTP {response.status}")
+            if self.is_unchanged(document, response):
+                return None
+
+            digest = hashlib.sha256()
+            size = 0
+            with tempfile.TemporaryFile() as f:
+                for chunk in response.stream(self.CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+                sha256 = digest.hexdigest()
+                name, deduplicated = self.store(document_storage_name(sha256), f)
+        except urllib3.exceptions.HTTPError as e:
+            raise ScraperError(f"Download of {document['source_url']} failed: {e}") from e
+        finally:
+            response.release_conn()
+
+        return {
+            'file': name,
+            'sha256': sha256,
+            'size': size,
+            'etag': response.headers.get('ETag', ''),
+            'deduplicated': deduplicated,
+        }
+
+    def store(self, name, f):
+        """
+        Store the file at its content address unless it is there already;
+        returns (name, whether it was already stored).
+        """
+        with self.store_locks_lock:
+            lock = self.store_locks[name]
+        with lock:
+            if default_storage.exists(name):
+                return name, True
+            f.seek(0)
+            saved = default_storage.save(name, File(f))
+        if saved != name:
+            # Another process stored the same content meanwhile and the storage
+            # renamed this copy; keep the content address
+            default_storage.delete(saved)
+            return name, True
+        return name, False
+
+    def fetch_one(self, document):
+        with self.metrics.measure('document_fetch'):
+            try:
+                return document, call_with_retry(
+                    lambda: self.download(document),
+                    attempts=self.retries,
+                    retry_on=(ScraperError, OSError),
+                ), None
+            except (ScraperError, OSError) as e:
+                return document, None, e
+
+    def pending_documents(self, codes=(), chunk_size=500):
+        """
+        Download state of the documents to fetch, each document once: every
+        document not downloaded yet (including earlier failures), and the
+        documents of the given auctions, which are re-validated.
+        """
+        fields = ('pk', 'source_url', 'sha256', 'etag', 'size')
+        documents = {
+            document['pk']: document
+            for document in AuctionDocument.objects.exclude(source_url='').filter(sha256='').values(*fields)
+        }
+        codes = list(codes)
+        for start in range(0, len(codes), chunk_size):
+            for document in AuctionDocument.objects.filter(
+                auctions__code__in=codes[start:start + chunk_size]
+            ).exclude(source_url='').values(*fields):
+                documents[document['pk']] = document
+        return list(documents.values())
+
+    def run(self, codes=()):
+        """
+        Fetch the documents not downloaded yet and those of the auctions with
+        the given codes, and save their new download state in bulk. Returns
+        the counts.
+        """
+        updated = []
+        with ThreadPoolExecutor(self.workers, thread_name_prefix='document-fetch') as pool:
+            for document, result, error in pool.map(self.fetch_one, self.pending_documents(codes)):
+                if error is not None:
+                    self.counts['failed'] += 1
+                    if self.log:
+                        self.log(f"Could not fetch document {document['source_url']}: {str(error)}")
+                    continue
+                if result is None:
+                    self.counts['unchanged'] += 1
+                    continue
+                self.counts['deduplicated' if result.pop('deduplicated') else 'downloaded'] += 1
+                updated.append(AuctionDocument(pk=document['pk'], fetched_at=timezone.now(), **result))
+
+        if updated:
+            AuctionDocument.objects.bulk_update(
+                updated, ['file', 'sha256', 'size', 'etag', 'fetched_at'], batch_size=500
+            )
+            PageCache.invalidate('document')
+        for outcome, count in self.counts.items():
+            self.metrics.increment(f'documents_{outcome}', count)
+        return self.counts
+
+    def close(self):
+        self.http.clear()
+
+
+class DocumentTextExtractor:
+    """
+    Extracts the text of downloaded auction documents and stores it in both
+    scripts for the auction search. PDFs are parsed page by page on a process
+    pool of `workers` processes (inline with a single worker, e.g. inside a
+    Celery worker that may not fork). Text is cached by file hash: each hash
+    is extracted once, documents sharing a hash already extracted elsewhere
+    copy that text, and documents whose text matches their current file are
+    skipped unless `force` is set. A file that cannot be parsed is recorded
+    like an extracted one, with empty text and no page count, so it is not
+    parsed again on every run; `force` retries it.
+    """
+
+    UPDATE_FIELDS = ['text_sr', 'text_lat', 'page_count', 'text_sha256', 'search_text']
+
+    def __init__(self, workers=2, batch_size=50, force=False, log=None, metrics=None):
+        self.workers = max(workers, 1)
+        self.batch_size = max(batch_size, 1)
+        self.force = force
+        self.log = log
+        self.metrics = metrics or RunMetrics('document_text')
+        self.counts = {'extracted': 0, 'cached': 0, 'failed': 0}
+
+    @staticmethod
+    def script_texts(text):
+        """(Cyrillic, Latin) versions of extracted text."""
+        text_sr = text if SerbianTextConverter.is_cyrillic(text) else SerbianTextConverter.to_cyrillic(text)
+        return text_sr, SerbianTextConverter.to_latin(text)
+
+    def pending(self):
+        """{file hash: [document pks]} of the documents whose text is missing or stale."""
+        documents = AuctionDocument.objects.exclude(sha256='')
+        if not self.force:
+            documents = documents.exclude(text_sha256=F('sha256'))
+        pending = {}
+        for pk, sha256 in documents.order_by('pk').values_list('pk', 'sha256'):
+            pending.setdefault(sha256, []).append(pk)
+        return pending
+
+    def cached_texts(self, hashes):
+        """Text already extracted for any of these file hashes, keyed by hash."""
+        cached = {}
+        for row in AuctionDocument.objects.filter(text_sha256__in=hashes).values(
+            'text_sha256', 'page_count', 'text_sr', 'text_lat'
+        ):
+            cached.setdefault(row['text_sha256'], row)
+        return cached
+
+    @staticmethod
+    def local_path(name):
+        """
+        A filesystem path of a stored file, and whether it is a temporary copy
+        (for storages without local paths) the caller has to delete.
+        """
+        try:
+            return default_storage.path(name), False
+        except NotImplementedError:
+            with default_storage.open(name, 'rb') as source, tempfile.NamedTemporaryFile(
+                suffix='.pdf', delete=False
+            ) as copy:
+                shutil.copyfileobj(source, copy)
+            return copy.name, True
+
+    def extract_batch(self, pool, hashes):
+        """
+        Extract one file per hash; returns {hash: (page count, text)} of those
+        that succeeded, and {hash: None} of the files that could not be parsed.
+        Files that could not be read from the storage are left out.
+        """
+        files = dict(
+            AuctionDocument.objects.filter(sha256__in=hashes).order_by('pk').values_list('sha256', 'file')
+        )
+        paths = {}
+        temporary = []
+        results = {}
+        try:
+            for sha256 in hashes:
+                try:
+                    paths[sha256], is_copy = self.local_path(files[sha256])
+                except (KeyError, OSError) as e:
+                    self.fail(sha256, e)
+                    continue
+                if is_copy:
+                    temporary.append(paths[sha256])
+
+            if pool is None:
+                for sha256, path in paths.items():
+                    try:
+                        results[sha256] = extract_pdf_text(path)
+                    except ValueError as e:
+                        self.fail(sha256, e)
+                        results[sha256] = None
+            else:
+                futures = {pool.submit(extract_pdf_text, path): sha256 for sha256, path in paths.items()}
+                for future in as_completed(futures):
+                    try:
+                        results[futures[future]] = future.result()
+                    except ValueError as e:
+                        self.fail(futures[future], e)
+                        results[futures[future]] = None
+        finally:
+            for path in temporary:
+                os.remove(path)
+        return results
+
+    def fail(self, sha256, error):
+        self.counts['failed'] += 1
+        if self.log:
+            self.log(f"Could not extract the text of document {sha256}: {str(error)}")
+
+    def run(self):
+        """Extract the text of every pending document and return the counts."""
+        pending = self.pending()
+        hashes = list(pending)
+        pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            for start in range(0, len(hashes), self.batch_size):
+                batch = hashes[start:start + self.batch_size]
+                with self.metrics.measure('text_extraction'):
+                    cached = {} if self.force else self.cached_texts(batch)
+                    texts = {
+                        sha256: (row['page_count'], row['text_sr'], row['text_lat'])
+                        for sha256, row in cached.items()
+                    }
+                    self.counts['cached'] += sum(len(pending[sha256]) for sha256 in texts)
+                    for sha256, result in self.extract_batch(
+                        pool, [sha256 for sha256 in batch if sha256 not in texts]
+                    ).items():
+                        if result is None:
+                            # Unparseable: stored as extracted with no text, so the next run skips it
+                            texts[sha256] = (None, '', '')
+                            continue
+                        page_count, text = result
+                        texts[sha256] = (page_count, *self.script_texts(text))
+                        self.counts['extracted'] += len(pending[sha256])
+
+                titles = dict(AuctionDocument.objects.filter(
+                    pk__in=[pk for sha256 in texts for pk in pending[sha256]]
+                ).values_list('pk', 'title_sr'))
+                documents = [
+                    AuctionDocument(
+                        pk=pk, title_sr=titles.get(pk, ''), page_count=page_count,
+                        text_sr=text_sr, text_lat=text_lat, text_sha256=sha256
+                    )
+                    for sha256, (page_count, text_sr, text_lat) in texts.items()
+                    for pk in pending[sha256]
+                ]
+                for document in documents:
+                    document.search_text = document.build_search_text()
+                AuctionDocument.objects.bulk_update(documents, self.UPDATE_FIELDS)
+                if texts:
+                    PageCache.invalidate('document')
+                if self.log:
+                    self.log(f"Extracted text of {min(start + self.batch_size, len(hashes))} of {len(hashes)} files")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        for outcome, count in self.counts.items():
+            self.metrics.increment(f'document_texts_{outcome}', count)
+        return self.counts
@@ -0,0 +1,462 @@
+# auctions/utils/katastar_utils.py
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlencode
+
+import urllib3
+from django.db import transaction
+from django.db.models import Q
+
+from auctions.models import CadastralMunicipality, Location, Municipality
+from auctions.models.location_model import katastar_name_key
+from .concurrency_utils import call_with_retry
+from .metrics_utils import RunMetrics
+from .scraper_utils import ScraperError
+
+
+class WebFormsPageParser(HTMLParser):
+    """
+    Reads what a postback needs from an ASP.NET WebForms page without a
+    browser: the values of all form inputs (including __VIEWSTATE and
+    __EVENTVALIDATION), the options and field name of one dropdown and the
+    cell texts of one GridView table.
+    """
+
+    def __init__(self, select_id, grid_id):
+        super().__init__(convert_charrefs=True)
+        self.select_id = select_id
+        self.grid_id = grid_id
+        self.fields = {}
+        self.select_name = None
+        self.options = []
+        self.rows = []
+        self._in_select = False
+        self._option = None
+        self._grid_depth = 0
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'input' and attrs.get('name'):
+            if attrs.get('type', 'text').lower() not in ('submit', 'button', 'image', 'checkbox', 'radio'):
+                self.fields[attrs['name']] = attrs.get('value') or ''
+        elif tag == 'select' and attrs.get('id') == self.select_id:
+            self._in_select = True
+            self.select_name = attrs.get('name')
+        elif tag == 'option' and self._in_select:
+            self._option = {'value': attrs.get('value', ''), 'name': ''}
+        elif tag == 'table':
+            if self._grid_depth:
+                self._grid_depth += 1
+            elif attrs.get('id') == self.grid_id:
+                self._grid_depth = 1
+        elif self._grid_depth == 1 and tag == 'tr':
+            self._row = []
+        elif self._grid_depth == 1 and tag in ('td', 'th') and self._row is not None:
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if tag == 'select' and self._in_select:
+            self._in_select = False
+        elif tag == 'option' and self._option is not None:
+            self._option['name'] = self._option['name'].strip()
+            self.options.append(self._option)
+            self._option = None
+        elif tag == 'table' and self._grid_depth:
+            self._grid_depth -= 1
+        elif self._grid_depth == 1 and tag in ('td', 'th') and self._cell is not None:
+            self._row.append(' '.join(''.join(self._cell).split()))
+            self._cell = None
+        elif self._grid_depth == 1 and tag == 'tr' and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._option is not None:
+            self._option['name'] += data
+        elif self._cell is not None:
+            self._cell.append(data)
+
+
+class KatastarClient:
+    """
+    HTTP client for the eKatastar public access form. Selecting a
+    municipality is an ASP.NET postback; the client replays it as a POST of
+    the initial form state (__VIEWSTATE, __EVENTVALIDATION and the session
+    cookie) with the dropdown set to the municipality, so every municipality
+    can be fetched independently and concurrently over pooled connections.
+    """
+
+    URL = "https://katastar.rgz.gov.rs/eKatastarPublic/PublicAccess.aspx"
+    SELECT_ID = "ContentPlaceHolder1_getOpstinaKO_dropOpstina"
+    GRID_ID = "ContentPlaceHolder1_getOpstinaKO_GridView"
+
+    def __init__(self, url=None, pool_size=10, timeout=30, retries=3, rate_limiter=None, metrics=None):
+        self.url = url or self.URL
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics or RunMetrics('katastar_client')
+        self.retries = retries
+        self.http = urllib3.PoolManager(
+            maxsize=pool_size,
+            block=True,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=urllib3.Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        self.form = None
+        self.cookies = {}
+
+    def parse(self, html):
+        parser = WebFormsPageParser(self.SELECT_ID, self.GRID_ID)
+        parser.feed(html)
+        parser.close()
+        return parser
+
+    def request(self, method, **kwargs):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        headers = kwargs.pop('headers', {})
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{name}={value}" for name, value in self.cookies.items())
+        try:
+            response = self.http.request(method, self.url, headers=headers, **kwargs)
+        except urllib3.exceptions.HTTPError as e:
+            raise ScraperError(f"Request to {self.url} failed: {e}") from e
+        if response.status >= 400:
+            raise ScraperError(f"Request to {self.url} returned HTTP {response.status}")
+        return response
+
+    def load_form(self):
+        """GET the form, keep its state and session cookie, and return the municipality options."""
+        response = self.request('GET')
+        for header in response.headers.getlist('Set-Cookie'):
+            name, _, value = header.split(';', 1)[0].partition('=')
+            self.cookies[name.strip()] = value.strip()
+        self.form = self.parse(response.data.decode('utf-8', errors='replace'))
+        if not self.form.select_name or '__VIEWSTATE' not in self.form.fields:
+            raise ScraperError("Municipality dropdown or view state not found on the form")
+        return self.municipality_options
+
+    @property
+    def municipality_options(self):
+        # Skip the placeholder option
+        return [option for option in self.form.options if option['value']]
+
+    def postback_body(self, municipality_value):
+        fields = dict(self.form.fields)
+        fields['__EVENTTARGET'] = self.form.select_name
+        fields['__EVENTARGUMENT'] = ''
+        fields[self.form.select_name] = municipality_value
+        return urlencode(fields)
+
+    def get_cadastral_municipalities(self, municipality_value):
+        """Emulate selecting one municipality and parse its GridView rows."""
+        response = self.request(
+            'POST',
+            body=self.postback_body(municipality_value),
+            headers={'Content-Type': 'application/x-www-form-urlencoded'},
+        )
+        page = self.parse(response.data.decode('utf-8', errors='replace'))
+        cadastral_municipalities = []
+        for columns in page.rows[1:]:  # Skip header row
+            if len(columns) >= 3:
+                cadastral_municipalities.append({
+                    "name": columns[1].strip(),  # Name is in second column
+                    "value": columns[2].strip()
+                })
+        return cadastral_municipalities
+
+    def get_municipality(self, option):
+        with self.metrics.measure('municipality'):
+            cadastral_municipalities = call_with_retry(
+                lambda: self.get_cadastral_municipalities(option['value']),
+                attempts=self.retries,
+                retry_on=(ScraperError,),
+            )
+        return {
+            "name": option['name'],
+            "value": option['value'],
+            "cadastral_municipalities": cadastral_municipalities,
+        }
+
+    def scrape(self, workers=4, on_municipality=None):
+        """
+        Return {"municipalities": [...]} in dropdown order, fetching up to
+        `workers` municipalities at once.
+        """
+        options = self.load_form() if self.form is None else self.municipality_options
+        with ThreadPoolExecutor(max(workers, 1), thread_name_prefix='katastar') as pool:
+            municipalities = []
+            for municipality in pool.map(self.get_municipality, options):
+                municipalities.append(municipality)
+                if on_municipality:
+                    on_municipality(municipality)
+        return {"municipalities": municipalities}
+
+    def close(self):
+        self.http.clear()
+
+
+def iter_json_array(f, key, chunk_size=64 * 1024):
+    """
+    Yield the items of the array stored under `key` of the JSON object in the
+    text file `f` one at a time, reading the file in chunks, so the whole
+    document is never held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+
+    def read_more():
+        nonlocal buffer, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer += chunk
+
+    # Find the opening bracket of the array
+    marker = json.dumps(key, ensure_ascii=False)
+    while True:
+        start = buffer.find(marker)
+        bracket = buffer.find('[', start + len(marker)) if start >= 0 else -1
+        if bracket >= 0:
+            buffer = buffer[bracket + 1:]
+            break
+        if eof:
+            raise ValueError(f"No {marker} array in the document")
+        read_more()
+
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,')
+        if buffer.startswith(']'):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()
+            continue
+        if end == len(buffer) and not eof:
+            # A number cut off by the chunk boundary decodes too; read on to be sure
+            read_more()
+            continue
+        yield item
+        buffer = buffer[end:]
+
+
+class KatastarImporter:
+    """
+    Loads a scrape_katastar snapshot into the Municipality and
+    CadastralMunicipality tables. The file is streamed and written in
+    batches; only added or renamed rows are upserted (keyed by the katastar
+    codes), so re-importing the same snapshot writes nothing. The result is a
+    diff of the snapshot against the rows already stored.
+    """
+
+    def __init__(self, batch_size=100, prune=False, log=None):
+        self.batch_size = max(batch_size, 1)
+        self.prune = prune
+        self.log = log or (lambda message: None)
+
+    @staticmethod
+    def new_diff():
+        return {'added': [], 'renamed': [], 'removed': [], 'unchanged': 0}
+
+    def load_stored(self):
+        self.municipalities = {
+            value: (pk, name) for pk, value, name in Municipality.objects.values_list('pk', 'value', 'name')
+        }
+        self.cadastral_municipalities = {
+            (municipality_value, value): (pk, name)
+            for pk, municipality_value, value, name in CadastralMunicipality.objects.values_list(
+                'pk', 'municipality__value', 'value', 'name'
+            )
+        }
+
+    def compare(self, stored, key, name, diff):
+        """Record the change of one row in the diff and return whether it must be written."""
+        if key not in stored:
+            diff['added'].append({'value': key, 'name': name})
+            return True
+        old_name = stored[key][1]
+        if old_name != name:
+            diff['renamed'].append({'value': key, 'old_name': old_name, 'name': name})
+            return True
+        diff['unchanged'] += 1
+        return False
+
+    def write_batch(self, batch):
+        municipalities = {}
+        cadastral_municipalities = {}
+        for municipality in batch:
+            value = str(municipality['value']).strip()
+            name = ' '.join(municipality['name'].split())
+            if value in self.seen_municipalities:
+                continue
+            self.seen_municipalities.add(value)
+            if self.compare(self.municipalities, value, name, self.diff['municipalities']):
+                municipalities[value] = name
+            for cadastral in municipality.get('cadastral_municipalities', []):
+                key = (value, str(cadastral['value']).strip())
+                if key in self.seen_cadastral_municipalities:
+                    continue
+                self.seen_cadastral_municipalities.add(key)
+                cadastral_name = ' '.join(cadastral['name'].split())
+                if self.compare(self.cadastral_municipalities, key, cadastral_name, self.diff['cadastral_municipalities']):
+                    cadastral_municipalities[key] = cadastral_name
+
+        if municipalities:
+            Municipality.objects.bulk_create(
+                [Municipality(value=value, name=name, name_key=katastar_name_key(name)) for value, name in municipalities.items()],
+                update_conflicts=True,
+                unique_fields=['value'],
+                update_fields=['name', 'name_key'],
+            )
+            # Re-read the primary keys of new rows for the cadastral municipality foreign keys
+            for pk, value, name in Municipality.objects.filter(value__in=municipalities).values_list('pk', 'value', 'name'):
+                self.municipalities[value] = (pk, name)
+
+        if cadastral_municipalities:
+            CadastralMunicipality.objects.bulk_create(
+                [
+                    CadastralMunicipality(
+                        municipality_id=self.municipalities[municipality_value][0],
+                        value=value,
+                        name=name,
+                        name_key=katastar_name_key(name),
+                    )
+                    for (municipality_value, value), name in cadastral_municipalities.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['municipality', 'value'],
+                update_fields=['name', 'name_key'],
+            )
+
+    def prune_removed(self):
+        removed_cadastral = sorted(set(self.cadastral_municipalities) - self.seen_cadastral_municipalities)
+        removed = sorted(set(self.municipalities) - self.seen_municipalities)
+        self.diff['cadastral_municipalities']['removed'] = [
+            {'value': key, 'name': self.cadastral_municipalities[key][1]} for key in removed_cadastral
+        ]
+        self.diff['municipalities']['removed'] = [
+            {'value': value, 'name': self.municipalities[value][1]} for value in removed
+        ]
+        if self.prune:
+            CadastralMunicipality.objects.filter(
+                pk__in=[self.cadastral_municipalities[key][0] for key in removed_cadastral]
+            ).delete()
+            Municipality.objects.filter(pk__in=[self.municipalities[value][0] for value in removed]).delete()
+
+    def run(self, path, dry_run=False):
+        """Import the snapshot at `path` and return its diff against the stored rows."""
+        self.diff = {'municipalities': self.new_diff(), 'cadastral_municipalities': self.new_diff()}
+        self.seen_municipalities = set()
+        self.seen_cadastral_municipalities = set()
+
+        with transaction.atomic():
+            self.load_stored()
+            batch = []
+            with open(path, encoding='utf-8') as f:
+                for municipality in iter_json_array(f, 'municipalities'):
+                    batch.append(municipality)
+                    if len(batch) >= self.batch_size:
+                        self.write_batch(batch)
+                        self.log(f"Imported {len(self.seen_municipalities)} municipalities")
+                        batch = []
+                if batch:
+                    self.write_batch(batch)
+            self.prune_removed()
+            if dry_run:
+                transaction.set_rollback(True)
+        KatastarResolver.clear()
+        return self.diff
+
+
+class KatastarResolver:
+    """
+    Resolves the municipality and cadastral municipality names of a scraped
+    location to their canonical katastar rows by an indexed lookup of the
+    script and case insensitive name key. Results, misses included, are
+    memoized for the process; call clear() after the tables change.
+    """
+
+    lock = threading.Lock()
+    municipalities = {}
+    cadastral_municipalities = {}
+
+    @classmethod
+    def clear(cls):
+        with cls.lock:
+            cls.municipalities.clear()
+            cls.cadastral_municipalities.clear()
+
+    @classmethod
+    def municipality_id(cls, name):
+        key = katastar_name_key(name)
+        if not key:
+            return None
+        with cls.lock:
+            if key in cls.municipalities:
+                return cls.municipalities[key]
+        pk = Municipality.objects.filter(name_key=key).values_list('pk', flat=True).first()
+        with cls.lock:
+            cls.municipalities[key] = pk
+        return pk
+
+    @classmethod
+    def cadastral_municipality_id(cls, name, municipality_id=None):
+        key = (municipality_id, katastar_name_key(name))
+        if not key[1]:
+            return None
+        with cls.lock:
+            if key in cls.cadastral_municipalities:
+                return cls.cadastral_municipalities[key]
+        queryset = CadastralMunicipality.objects.filter(name_key=key[1])
+        if municipality_id:
+            queryset = queryset.filter(municipality_id=municipality_id)
+        # Without a municipality the name only resolves when it is unambiguous
+        pks = list(queryset.values_list('pk', flat=True)[:2])
+        pk = pks[0] if len(pks) == 1 else None
+        with cls.lock:
+            cls.cadastral_municipalities[key] = pk
+        return pk
+
+    @classmethod
+    def resolve(cls, municipality, cadastral_municipality):
+        """Return the foreign key values of a location with these names."""
+        municipality_id = cls.municipality_id(municipality)
+        return {
+            'katastar_municipality_id': municipality_id,
+            'katastar_cadastral_municipality_id': cls.cadastral_municipality_id(cadastral_municipality, municipality_id),
+        }
+
+    @classmethod
+    def link_locations(cls, batch_size=500):
+        """Resolve the katastar rows of stored locations that have none and return how many were linked."""
+        locations = Location.objects.filter(
+            Q(katastar_municipality__isnull=True) | Q(katastar_cadastral_municipality__isnull=True)
+        ).only('pk', 'municipality', 'cadastral_municipality', 'katastar_municipality', 'katastar_cadastral_municipality')
+
+        fields = ['katastar_municipality', 'katastar_cadastral_municipality']
+        linked = []
+        count = 0
+        for location in locations.iterator(chunk_size=batch_size):
+            resolved = cls.resolve(location.municipality, location.cadastral_municipality)
+            if (resolved['katastar_municipality_id'], resolved['katastar_cadastral_municipality_id']) == (
+                location.katastar_municipality_id, location.katastar_cadastral_municipality_id
+            ):
+                continue
+            location.katastar_municipality_id = resolved['katastar_municipality_id']
+            location.katastar_cadastral_municipality_id = resolved['katastar_cadastral_municipality_id']
+            linked.append(location)
+            if len(linked) >= batch_size:
+                Location.objects.bulk_update(linked, fields)
+                count += len(linked)
+                linked = []
+        if linked:
+            Location.objects.bulk_update(linked, fields)
+            count += len(linked)
+        return count
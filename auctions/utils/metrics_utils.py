@@ -0,0 +1,166 @@
+# auctions/utils/metrics_utils.py
+import json
+import os
+import resource
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import connection
+from django.utils import timezone
+
+from .scraper_utils import StageTimer
+
+
+class QueryCount:
+    """Number of SQL queries executed inside a RunMetrics.count_queries() block."""
+
+    def __init__(self):
+        self.count = 0
+
+
+class PeakMemory:
+    """
+    Samples the resident set size of this process in a background thread
+    while the block runs and keeps the peak, so consecutive runs in one
+    process can each report their own high-water mark. Browser processes
+    are separate and not included.
+    """
+
+    INTERVAL = 0.05
+
+    def __init__(self):
+        self.peak = 0
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def current_rss():
+        """Resident set size in bytes; falls back to the process maximum where /proc is missing."""
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def sample(self):
+        while not self.stopped.is_set():
+            self.peak = max(self.peak, self.current_rss())
+            time.sleep(self.INTERVAL)
+
+    def __enter__(self):
+        self.peak = self.current_rss()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+        self.peak = max(self.peak, self.current_rss())
+
+
+class RunMetrics:
+    """
+    Instrumentation of one scraper run: per-stage timers with latency
+    percentiles, readiness waits, numeric samples (such as queries per saved
+    auction) and counters. Safe to share between threads. The result is
+    written as a JSON run report and/or Prometheus text exposition.
+    """
+
+    PROMETHEUS_PREFIX = 'scraper'
+    QUANTILES = ('p50', 'p95', 'p99')
+
+    def __init__(self, command, wait_timer=None):
+        self.command = command
+        self.stages = StageTimer()
+        self.waits = wait_timer or StageTimer()
+        self.samples = StageTimer()
+        self.counters = defaultdict(int)
+        self.lock = threading.Lock()
+        self.started_at = timezone.now()
+        self.finished_at = None
+
+    def measure(self, stage):
+        return self.stages.measure(stage)
+
+    def observe(self, series, value):
+        self.samples.record(series, value)
+
+    def increment(self, counter, amount=1):
+        with self.lock:
+            self.counters[counter] += amount
+
+    @contextmanager
+    def count_queries(self):
+        """Count the queries the current thread's connection runs inside the block."""
+        queries = QueryCount()
+
+        def wrapper(execute, sql, params, many, context):
+            queries.count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(wrapper):
+            yield queries
+        self.increment('db_queries', queries.count)
+
+    def finish(self):
+        self.finished_at = timezone.now()
+
+    def report(self):
+        finished_at = self.finished_at or timezone.now()
+        with self.lock:
+            counters = dict(self.counters)
+        return {
+            "command": self.command,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": finished_at.isoformat(),
+            "duration_seconds": (finished_at - self.started_at).total_seconds(),
+            "counters": counters,
+            "stages": self.stages.summary(),
+            "waits": self.waits.summary(),
+            "samples": self.samples.summary(),
+        }
+
+    def write_report(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def prometheus_text(self):
+        """Render the run in the Prometheus text exposition format (textfile collector)."""
+        report = self.report()
+        prefix = self.PROMETHEUS_PREFIX
+        command = f'command="{self.command}"'
+        lines = [
+            f"# HELP {prefix}_run_duration_seconds Wall time of the last run.",
+            f"# TYPE {prefix}_run_duration_seconds gauge",
+            f"{prefix}_run_duration_seconds{{{command}}} {report['duration_seconds']}",
+        ]
+        for section, unit, help_text in (
+            ('stages', 'seconds', 'Time spent per scraping stage.'),
+            ('waits', 'seconds', 'Time spent in page readiness waits per stage.'),
+            ('samples', 'value', 'Observed values per series.'),
+        ):
+            name = f"{prefix}_{section[:-1]}_{unit}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for stage, stats in sorted(report[section].items()):
+                labels = f'{command},{"series" if section == "samples" else "stage"}="{stage}"'
+                for quantile in self.QUANTILES:
+                    lines.append(f'{name}{{{labels},quantile="0.{quantile[1:]}"}} {stats[quantile]}')
+                lines.append(f"{name}_sum{{{labels}}} {stats['total']}")
+                lines.append(f"{name}_count{{{labels}}} {stats['count']}")
+        timeouts = f"{prefix}_wait_timeouts_total"
+        lines.append(f"# TYPE {timeouts} counter")
+        for stage, stats in sorted(report['waits'].items()):
+            lines.append(f'{timeouts}{{{command},stage="{stage}"}} {stats["timeouts"]}')
+        for counter, value in sorted(report['counters'].items()):
+            name = f"{prefix}_{counter}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{{{command}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
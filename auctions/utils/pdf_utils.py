@@ -0,0 +1,28 @@
+# auctions/utils/pdf_utils.py
+# Runs in extraction worker processes: keep it free of Django imports.
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+
+def normalize_page_text(text):
+    """Collapse the layout whitespace of one page into single spaces."""
+    return ' '.join((text or '').replace('\x00', '').split())
+
+
+def extract_pdf_text(path):
+    """
+    Return (page count, text) of the PDF at `path`, or raise ValueError when
+    it cannot be read. Pages are read one at a time from the open file, so
+    the whole document is never loaded; pages are separated by blank lines.
+    """
+    try:
+        with open(path, 'rb') as f:
+            reader = PdfReader(f)
+            pages = []
+            for page in reader.pages:
+                text = normalize_page_text(page.extract_text())
+                if text:
+                    pages.append(text)
+            return len(reader.pages), '\n\n'.join(pages)
+    except (PdfReadError, OSError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Could not read {path}: {e}") from e
@@ -0,0 +1,492 @@
+# auctions/utils/persistence_utils.py
+import threading
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from auctions.models import Auction, AuctionDocument, Category, Executor, Location, Tag
+from .cache_utils import PageCache
+from .content_utils import SerbianTextConverter
+from .counter_utils import AuctionCounters
+from .katastar_utils import KatastarResolver
+from .metrics_utils import RunMetrics
+from .scraper_utils import details_fingerprint
+
+
+class LookupCache:
+    """
+    Identity map of Category, Executor, Location and Tag rows for one scrape
+    run, keyed by their natural keys (title_sr, or the municipality, city and
+    cadastral municipality of a location). Safe to share between threads.
+    """
+
+    KEY_FIELDS = {
+        Category: ('title_sr',),
+        Executor: ('title_sr',),
+        Location: ('municipality', 'city', 'cadastral_municipality'),
+        Tag: ('title_sr',),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = defaultdict(dict)
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    def get(self, model, key):
+        with self.lock:
+            obj = self.entries[model].get(key)
+            if obj is None:
+                self.misses[model] += 1
+            else:
+                self.hits[model] += 1
+            return obj
+
+    def get_many(self, model, keys):
+        """Return ({key: obj} for cached keys, set of keys that missed)."""
+        found = {}
+        with self.lock:
+            for key in keys:
+                obj = self.entries[model].get(key)
+                if obj is None:
+                    self.misses[model] += 1
+                else:
+                    self.hits[model] += 1
+                    found[key] = obj
+        return found, set(keys) - found.keys()
+
+    def put(self, model, key, obj):
+        with self.lock:
+            self.entries[model][key] = obj
+
+    def put_many(self, model, objects):
+        with self.lock:
+            self.entries[model].update(objects)
+
+    def warm(self):
+        """Load every existing lookup row, so a run starts with what earlier runs created."""
+        for model, key_fields in self.KEY_FIELDS.items():
+            objects = {}
+            for obj in model.objects.order_by('pk'):
+                objects.setdefault(tuple(getattr(obj, field) for field in key_fields), obj)
+            self.put_many(model, objects)
+
+    def stats(self):
+        with self.lock:
+            return {
+                model.__name__: {
+                    'hits': self.hits[model],
+                    'misses': self.misses[model],
+                    'size': len(self.entries[model]),
+                }
+                for model in self.KEY_FIELDS
+            }
+
+
+class AuctionBulkWriter:
+    """
+    Buffers scraped auction details and persists them in batches. Each batch
+    resolves its categories, executors, locations and tags with one IN query
+    per model, bulk creates the missing ones, upserts the auctions with a
+    single bulk_create(update_conflicts=True) and writes the tag and
+    document through-rows in bulk, all inside one transaction. The auction
+    counters of the lookups are moved by what the batch changed. When a batch fails it is rolled back and its
+    records are handed to the fallback one by one. An auction already stored
+    under another form of its code (see stored_forms) is written under that
+    form, so the browser and JSON API engines update the same rows.
+    """
+
+    # Fields refreshed when an auction already exists; the slug is kept stable
+    AUCTION_UPDATE_FIELDS = [
+        'status',
+        'title_sr', 'description_sr', 'meta_title_sr', 'meta_description_sr',
+        'title_lat', 'description_lat', 'meta_title_lat', 'meta_description_lat',
+        'url', 'publication_date', 'start_time', 'end_time',
+        'starting_price', 'estimated_value', 'bidding_step', 'sale_number',
+        'category', 'executor', 'location', 'content_hash', 'search_text', 'updated_at',
+    ]
+    # Page cache tags of everything a batch may create or change
+    CACHE_TAGS = ('auction', 'category', 'executor', 'location', 'tag', 'document')
+
+    def __init__(self, batch_size=50, skip_unchanged=False, fallback=None, log=None, cache=None, on_flush=None,
+                 metrics=None):
+        self.batch_size = batch_size
+        self.cache = cache or LookupCache()
+        self.metrics = metrics or RunMetrics('bulk_writer')
+        self.on_flush = on_flush
+        self.skip_unchanged = skip_unchanged
+        self.fallback = fallback
+        self.log = log
+        self.buffer = []
+        self.counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
+
+    def add(self, details):
+        """Buffer one details dict and write the batch once it is full."""
+        self.buffer.append(details)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered auctions in one transaction."""
+        batch, self.buffer = self.buffer, []
+        if not batch:
+            return
+        with self.metrics.measure('db_save'), self.metrics.count_queries() as queries:
+            try:
+                done = self.write_batch(batch)
+            except Exception as e:
+                if self.log:
+                    self.log(f"Batch write of {len(batch)} auctions failed, saving one by one: {str(e)}")
+                done = [details['code'] for details in batch if self.save_one(details)]
+        self.metrics.observe('queries_per_auction', queries.count / len(batch))
+        if self.on_flush:
+            self.on_flush(done)
+
+    def save_one(self, details):
+        if self.fallback is None:
+            self.counts['failed'] += 1
+            return False
+        try:
+            with transaction.atomic(), AuctionCounters.track([details.get('code')]):
+                created = self.fallback(details)
+        except Exception:
+            self.counts['failed'] += 1
+            return False
+        self.counts['created' if created else 'updated'] += 1
+        return True
+
+    # Lookup entities
+
+    @staticmethod
+    def lookup_defaults(name_sr):
+        name_lat = SerbianTextConverter.to_latin(name_sr)
+        return {
+            'title_sr': name_sr,
+            'title_lat': name_lat,
+            'meta_title_sr': name_sr,
+            'meta_title_lat': name_lat,
+            'meta_description_sr': name_sr,
+            'meta_description_lat': name_lat,
+        }
+
+    @staticmethod
+    def executor_name(name_sr):
+        # Executors sometimes come in Latin script; they are stored in Cyrillic
+        if name_sr and not SerbianTextConverter.is_cyrillic(name_sr):
+            return SerbianTextConverter.to_cyrillic(name_sr)
+        return name_sr
+
+    @staticmethod
+    def location_key(location_data):
+        location_data = location_data or {}
+        return (
+            location_data.get('municipality', ''),
+            location_data.get('city', ''),
+            location_data.get('cadastral_municipality', ''),
+        )
+
+    @classmethod
+    def location_defaults(cls, key):
+        title_sr = ' '.join(filter(None, key))
+        title_lat = ' '.join(filter(None, (SerbianTextConverter.to_latin(part) for part in key)))
+        return {
+            'municipality': key[0],
+            'city': key[1],
+            'cadastral_municipality': key[2],
+            'title_sr': title_sr,
+            'title_lat': title_lat,
+            'meta_title_sr': title_sr,
+            'meta_title_lat': title_lat,
+            'meta_description_sr': title_sr,
+            'meta_description_lat': title_lat,
+            **KatastarResolver.resolve(key[0], key[2]),
+        }
+
+    def fetch_by_keys(self, model, key_fields, keys):
+        if len(key_fields) == 1:
+            queryset = model.objects.filter(**{f'{key_fields[0]}__in': [key[0] for key in keys]})
+        else:
+            query = Q()
+            for key in keys:
+                query |= Q(**dict(zip(key_fields, key)))
+            queryset = model.objects.filter(query)
+
+        found = {}
+        for obj in queryset.order_by('pk'):
+            # Like get_or_create, the oldest row wins when duplicates exist
+            found.setdefault(tuple(getattr(obj, field) for field in key_fields), obj)
+        return found
+
+    def resolve_lookups(self, model, key_fields, keys, build_defaults):
+        """
+        Return {natural key: instance} for the given keys, creating the missing
+        rows with bulk_create. Slugs for new rows are generated on a miss only.
+        """
+        keys = {key for key in keys if any(key)}
+        if not keys:
+            return {}
+
+        found, uncached = self.cache.get_many(model, keys)
+        if not uncached:
+            return found
+
+        stored = self.fetch_by_keys(model, key_fields, uncached)
+        self.cache.put_many(model, stored)
+        found.update(stored)
+        missing = sorted(uncached - stored.keys())
+        if missing:
+            defaults = [build_defaults(key) for key in missing]
+            slugs = SerbianTextConverter.generate_unique_slugs(
+                [SerbianTextConverter.normalize(values['title_sr']) for values in defaults], model
+            )
+            objects = [model(slug=slug, **values) for slug, values in zip(slugs, defaults)]
+            for obj in objects:
+                # bulk_create skips save(), which fills the search text
+                if hasattr(obj, 'build_search_text'):
+                    obj.search_text = obj.build_search_text()
+            model.objects.bulk_create(objects)
+            # Re-read instead of relying on bulk_create returning primary keys
+            created = self.fetch_by_keys(model, key_fields, missing)
+            found.update(created)
+            # Only cache new rows once the batch transaction has committed
+            transaction.on_commit(lambda: self.cache.put_many(model, created))
+        return found
+
+    # Batch writing
+
+    @staticmethod
+    def code_number(code):
+        return ''.join(filter(str.isdigit, code)) or code
+
+    def stored_forms(self, codes):
+        """
+        {code: (stored code, content hash, slug)} of the codes whose auction is
+        stored under another form of the same code. The listing shows a code
+        with a prefix the JSON API leaves out, so an auction is matched by the
+        number of its code and keeps the form it was first stored with.
+        """
+        if not codes:
+            return {}
+        numbers = {self.code_number(code): code for code in codes}
+        query = Q()
+        for number in numbers:
+            query |= Q(code__endswith=number)
+        found = {}
+        for stored_code, content_hash, slug in Auction.objects.filter(query).order_by('code').values_list(
+            'code', 'content_hash', 'slug'
+        ):
+            code = numbers.get(self.code_number(stored_code))
+            if code is not None:
+                found.setdefault(code, (stored_code, content_hash, slug))
+        return found
+
+    def write_batch(self, batch):
+        """Write one batch and return the codes that are now stored up to date."""
+        # Later duplicates of the same auction win, as they would with update_or_create
+        records = {}
+        invalid = 0
+        for details in batch:
+            if not details.get('code') or not details.get('title'):
+                invalid += 1
+                continue
+            records[details['code']] = details
+
+        stored = {
+            code: (content_hash, slug)
+            for code, content_hash, slug in Auction.objects.filter(code__in=records).values_list('code', 'content_hash', 'slug')
+        }
+        for code, (stored_code, content_hash, slug) in self.stored_forms(
+            [code for code in records if code not in stored]
+        ).items():
+            details = records.pop(code)
+            details['code'] = stored_code
+            records[stored_code] = details
+            stored[stored_code] = (content_hash, slug)
+        done = list(records)
+        fingerprints = {code: details_fingerprint(details) for code, details in records.items()}
+        unchanged = 0
+        if self.skip_unchanged:
+            for code in list(records):
+                if code in stored and stored[code][0] == fingerprints[code]:
+                    del records[code]
+                    unchanged += 1
+        if not records:
+            self.counts['failed'] += invalid
+            self.counts['unchanged'] += unchanged
+            return done
+
+        with transaction.atomic():
+            infos = {code: details.get('additional_info', {}) for code, details in records.items()}
+
+            categories = self.resolve_lookups(
+                Category, ['title_sr'],
+                {(info.get('categories'),) for info in infos.values()},
+                lambda key: self.lookup_defaults(key[0]),
+            )
+            executors = self.resolve_lookups(
+                Executor, ['title_sr'],
+                {(self.executor_name(info.get('executor')),) for info in infos.values()},
+                lambda key: self.lookup_defaults(key[0]),
+            )
+            locations = self.resolve_lookups(
+                Location, ['municipality', 'city', 'cadastral_municipality'],
+                {self.location_key(info.get('location')) for info in infos.values()},
+                self.location_defaults,
+            )
+            tags = self.resolve_lookups(
+                Tag, ['title_sr'],
+                {(name,) for info in infos.values() for name in info.get('tags', []) if name},
+                lambda key: self.lookup_defaults(key[0]),
+            )
+
+            new_codes = [code for code in records if code not in stored]
+            slugs = {code: slug for code, (_, slug) in stored.items()}
+            slugs.update(zip(new_codes, SerbianTextConverter.generate_unique_slugs(
+                [SerbianTextConverter.normalize(records[code]['title']) for code in new_codes], Auction
+            )))
+
+            auctions = []
+            for code, details in records.items():
+                info = infos[code]
+                auctions.append(self.build_auction(
+                    details,
+                    slug=slugs[code],
+                    category=categories.get((info.get('categories'),)),
+                    executor=executors.get((self.executor_name(info.get('executor')),)),
+                    location=locations.get(self.location_key(info.get('location'))),
+                    content_hash=fingerprints[code],
+                ))
+
+            with AuctionCounters.track(records):
+                Auction.objects.bulk_create(
+                    auctions,
+                    update_conflicts=True,
+                    unique_fields=['code'],
+                    update_fields=self.AUCTION_UPDATE_FIELDS,
+                )
+                self.write_tags(records, infos, tags)
+            self.write_documents(records, infos)
+            # Bulk writes send no model signals: drop the cached pages here
+            transaction.on_commit(lambda: PageCache.invalidate(*self.CACHE_TAGS))
+
+        self.counts['failed'] += invalid
+        self.counts['unchanged'] += unchanged
+        self.counts['created'] += len(new_codes)
+        self.counts['updated'] += len(records) - len(new_codes)
+        return done
+
+    def build_auction(self, data, slug, category, executor, location, content_hash):
+        """Build an unsaved Auction with the same field values as save_auction_data."""
+        info = data.get('additional_info', {})
+        title_sr = data['title']
+        description_sr = info.get('description', '')
+        title_lat = SerbianTextConverter.to_latin(title_sr)
+        description_lat = SerbianTextConverter.to_latin(description_sr)
+
+        auction = Auction(
+            code=data['code'],
+            slug=slug,
+            status=data['status'],
+            title_sr=title_sr,
+            description_sr=description_sr,
+            meta_title_sr=f"{title_sr} - еАукција {data['code']}",
+            meta_description_sr=description_sr[:160] + '...' if len(description_sr) > 160 else description_sr,
+            title_lat=title_lat,
+            description_lat=description_lat,
+            meta_title_lat=f"{title_lat} - eAukcija {data['code']}",
+            meta_description_lat=description_lat[:160] + '...' if len(description_lat) > 160 else description_lat,
+            url=data['url'],
+            publication_date=data['publication_date'],
+            start_time=data['start_time'],
+            end_time=data['end_time'],
+            starting_price=data['pricing']['starting_price'],
+            estimated_value=data['pricing']['estimated_value'],
+            bidding_step=data['pricing']['bidding_step'],
+            sale_number=info.get('sale_number', ''),
+            category=category,
+            executor=executor,
+            location=location,
+            content_hash=content_hash,
+        )
+        auction.search_text = auction.build_search_text()
+        return auction
+
+    def write_tags(self, records, infos, tags):
+        through = Auction.tags.through
+        wanted = {
+            (code, tags[(name,)].pk)
+            for code, info in infos.items()
+            for name in info.get('tags', [])
+            if name and (name,) in tags
+        }
+        existing = set(through.objects.filter(auction_id__in=records).values_list('auction_id', 'tag_id'))
+
+        stale = existing - wanted
+        if stale:
+            query = Q()
+            for auction_id, tag_id in stale:
+                query |= Q(auction_id=auction_id, tag_id=tag_id)
+            through.objects.filter(query).delete()
+        through.objects.bulk_create(
+            [through(auction_id=code, tag_id=tag_id) for code, tag_id in wanted - existing],
+            ignore_conflicts=True,
+        )
+
+    def write_documents(self, records, infos):
+        """Documents are matched by title per auction, as in create_or_update_documents."""
+        through = Auction.documents.through
+        existing = {}
+        for row in through.objects.filter(auction_id__in=records).values(
+            'pk', 'auction_id', 'auctiondocument_id', 'auctiondocument__title_sr', 'auctiondocument__source_url'
+        ):
+            existing[(row['auction_id'], row['auctiondocument__title_sr'])] = row
+
+        wanted = {
+            (code, name)
+            for code, info in infos.items()
+            for name in info.get('documents', [])
+        }
+        urls = {
+            (code, name): url
+            for code, info in infos.items()
+            for name, url in info.get('document_urls', {}).items()
+        }
+
+        stale_ids = [row['pk'] for key, row in existing.items() if key not in wanted]
+        if stale_ids:
+            through.objects.filter(pk__in=stale_ids).delete()
+
+        # Keep the download links of documents that are still listed current
+        moved = [
+            AuctionDocument(pk=row['auctiondocument_id'], source_url=urls[key])
+            for key, row in existing.items()
+            if key in wanted and key in urls and urls[key] != row['auctiondocument__source_url']
+        ]
+        if moved:
+            AuctionDocument.objects.bulk_update(moved, ['source_url'])
+
+        missing = sorted(wanted - existing.keys())
+        if not missing:
+            return
+        documents = [
+            AuctionDocument(
+                title_sr=name,
+                title_lat=SerbianTextConverter.to_latin(name),
+                file=f'auction_documents/{code}/{name}',
+                source_url=urls.get((code, name), ''),
+            )
+            for code, name in missing
+        ]
+        for document in documents:
+            document.search_text = document.build_search_text()
+        if connection.features.can_return_rows_from_bulk_insert:
+            AuctionDocument.objects.bulk_create(documents)
+        else:
+            # Primary keys are needed for the through-rows
+            for document in documents:
+                document.save()
+        through.objects.bulk_create([
+            through(auction_id=code, auctiondocument_id=document.pk)
+            for (code, _), document in zip(missing, documents)
+        ])
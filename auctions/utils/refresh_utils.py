@@ -0,0 +1,206 @@
+# auctions/utils/refresh_utils.py
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from auctions.models import Auction, CrawlState
+from .metrics_utils import RunMetrics
+from .persistence_utils import AuctionBulkWriter
+from .scraper_utils import AuctionApiClient, ScraperError
+
+
+class RefreshPolicy:
+    """
+    How soon an auction should be fetched again, from how close `now` is to
+    its start or end: every few minutes around those moments, rarely when
+    nothing is about to happen. A refresh is also due right after the start
+    and the end, and an ended auction gets one last refresh to record its
+    final state, then none. A final refresh that keeps failing is given up
+    FINAL_REFRESH_WINDOW after the end.
+    """
+
+    # (distance to the nearest start/end, refresh interval), nearest first
+    TIERS = (
+        (timedelta(hours=1), timedelta(minutes=5)),
+        (timedelta(hours=6), timedelta(minutes=30)),
+        (timedelta(days=1), timedelta(hours=2)),
+        (timedelta(days=7), timedelta(hours=12)),
+    )
+    DEFAULT_INTERVAL = timedelta(days=2)
+    # An event counts as near for a while after it passed, while the site settles the status
+    AFTER_EVENT = timedelta(minutes=30)
+    # Delay after an event before the refresh that observes it
+    EVENT_DELAY = timedelta(minutes=1)
+    FINAL_REFRESH_WINDOW = timedelta(days=1)
+
+    def next_refresh(self, start_time, end_time, now, refreshed_at=None):
+        """Return when to refresh next, or None when the auction needs no more refreshes."""
+        if end_time and end_time + self.AFTER_EVENT <= now:
+            # Ended: refresh once after the end, then stop
+            final_done = refreshed_at is not None and refreshed_at >= end_time + self.EVENT_DELAY
+            if final_done or now >= end_time + self.FINAL_REFRESH_WINDOW:
+                return None
+            return now
+
+        events = [event for event in (start_time, end_time) if event]
+        distance = min((abs(event - now) for event in events), default=None)
+        interval = self.DEFAULT_INTERVAL
+        if distance is not None:
+            interval = next((step for limit, step in self.TIERS if distance <= limit), self.DEFAULT_INTERVAL)
+
+        next_refresh = now + interval
+        upcoming = [event + self.EVENT_DELAY for event in events if event > now]
+        if upcoming:
+            next_refresh = min(next_refresh, min(upcoming))
+        return next_refresh
+
+
+class AuctionRefreshScheduler:
+    """
+    Re-fetches stored auctions over the JSON API in order of urgency, within
+    a global budget of page fetches per hour. The queue is the indexed
+    Auction.next_refresh_at column: each pass takes the most overdue auctions
+    first, saves them through AuctionBulkWriter (unchanged content is not
+    rewritten) and schedules each one again with the RefreshPolicy. The
+    fetches of the last hour are logged on the scheduler's CrawlState row;
+    the budget is spread evenly over the passes, so a pass never fetches
+    more than its share nor more than the hour has left.
+
+    A failed fetch leaves refreshed_at as it was and is retried after
+    RETRY_DELAY. When MAX_CONSECUTIVE_FAILURES fetches fail in a row the API
+    is taken to be down and the pass ends, so the budget is not spent on
+    errors; only the fetches made count against it.
+    """
+
+    STATE_NAME = 'refresh_auctions'
+    RETRY_DELAY = timedelta(minutes=10)
+    MAX_CONSECUTIVE_FAILURES = 3
+
+    def __init__(self, budget_per_hour=None, interval=None, client=None, policy=None, log=None, metrics=None):
+        self.budget_per_hour = settings.AUCTION_REFRESH_BUDGET_PER_HOUR if budget_per_hour is None else budget_per_hour
+        self.interval = settings.AUCTION_REFRESH_INTERVAL if interval is None else interval
+        self.client = client
+        self.policy = policy or RefreshPolicy()
+        self.log = log or (lambda message: None)
+        self.metrics = metrics or RunMetrics('refresh_auctions')
+        self.counts = {'refreshed': 0, 'failed': 0, 'scheduled': 0}
+
+    def recent_fetches(self, now):
+        """[[timestamp, fetches]] of the passes in the last hour."""
+        state = CrawlState.objects.filter(name=self.STATE_NAME).values_list('checkpoint', flat=True).first() or {}
+        since = (now - timedelta(hours=1)).isoformat()
+        return [entry for entry in state.get('fetches', []) if entry[0] > since]
+
+    def record_fetches(self, now, count):
+        fetches = self.recent_fetches(now) + [[now.isoformat(), count]]
+        CrawlState.objects.update_or_create(
+            name=self.STATE_NAME, defaults={'checkpoint': {'fetches': fetches}, 'crawled_at': now}
+        )
+
+    def quota(self, now):
+        """Fetches this pass may make: its share of the hourly budget, at most what the hour has left."""
+        used = sum(count for _, count in self.recent_fetches(now))
+        share = math.ceil(self.budget_per_hour * self.interval / 3600)
+        return max(0, min(share, self.budget_per_hour - used))
+
+    def schedule_new(self, now):
+        """Give running auctions the scheduler has not seen yet a place in the queue."""
+        auctions = list(
+            Auction.objects.filter(
+                next_refresh_at__isnull=True,
+                refreshed_at__isnull=True,
+                end_time__gt=now - self.policy.AFTER_EVENT,
+            ).only('code', 'start_time', 'end_time')
+        )
+        for auction in auctions:
+            auction.next_refresh_at = self.policy.next_refresh(auction.start_time, auction.end_time, now)
+        if auctions:
+            Auction.objects.bulk_update(auctions, ['next_refresh_at'], batch_size=500)
+        self.counts['scheduled'] += len(auctions)
+
+    def due(self, now, limit):
+        return list(
+            Auction.objects.filter(next_refresh_at__lte=now)
+            .order_by('next_refresh_at')
+            .only('code', 'start_time', 'end_time', 'refreshed_at')[:limit]
+        )
+
+    def fetch(self, auction):
+        code = ''.join(filter(str.isdigit, auction.code)) or auction.code
+        try:
+            with self.metrics.measure('refresh_fetch'):
+                return self.client.get_details(code)
+        except ScraperError as e:
+            self.log(f"Could not refresh auction {auction.code}: {str(e)}")
+            return None
+
+    def run(self):
+        """Run one pass and return the counts."""
+        now = timezone.now()
+        self.schedule_new(now)
+        quota = self.quota(now)
+        auctions = self.due(now, quota) if quota else []
+        if not auctions:
+            return self.counts
+
+        own_client = self.client is None
+        if own_client:
+            self.client = AuctionApiClient()
+        writer = AuctionBulkWriter(skip_unchanged=True, metrics=self.metrics)
+        attempted = []
+        fetched = {}
+        failures = 0
+        try:
+            for auction in auctions:
+                attempted.append(auction)
+                details = self.fetch(auction)
+                if details:
+                    # Written under the stored code, which the request may have stripped
+                    details['code'] = auction.code
+                    writer.add(details)
+                    fetched[auction.code] = details
+                    failures = 0
+                    continue
+                failures += 1
+                if failures >= self.MAX_CONSECUTIVE_FAILURES:
+                    self.log(f"{failures} refreshes failed in a row, the API looks unavailable; ending the pass")
+                    break
+            writer.flush()
+        finally:
+            if own_client:
+                self.client.close()
+                self.client = None
+
+        refreshed_at = timezone.now()
+        self.record_fetches(refreshed_at, len(attempted))
+        for auction in attempted:
+            details = fetched.get(auction.code)
+            if details:
+                self.counts['refreshed'] += 1
+                auction.refreshed_at = refreshed_at
+                auction.next_refresh_at = self.policy.next_refresh(
+                    details.get('start_time') or auction.start_time,
+                    details.get('end_time') or auction.end_time,
+                    refreshed_at,
+                    refreshed_at=refreshed_at,
+                )
+                continue
+            # Not refreshed: keep following the schedule (an ended auction still
+            # owes its final refresh), but do not hammer an auction that keeps failing
+            self.counts['failed'] += 1
+            auction.next_refresh_at = self.policy.next_refresh(
+                auction.start_time, auction.end_time, refreshed_at, refreshed_at=auction.refreshed_at
+            )
+            if auction.next_refresh_at:
+                auction.next_refresh_at = max(auction.next_refresh_at, refreshed_at + self.RETRY_DELAY)
+        Auction.objects.bulk_update(attempted, ['refreshed_at', 'next_refresh_at'])
+
+        for outcome, count in self.counts.items():
+            self.metrics.increment(f'auctions_{outcome}', count)
+        self.log(
+            f"Refreshed {self.counts['refreshed']} auctions ({writer.counts['updated']} changed), "
+            f"{self.counts['failed']} failed, {quota - len(attempted)} fetches of the budget unused"
+        )
+        return self.counts
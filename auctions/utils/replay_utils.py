@@ -0,0 +1,197 @@
+# auctions/utils/replay_utils.py
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import urllib3
+from django.db import connections
+
+
+class ReplayCorpus:
+    """
+    Recorded HTTP responses on disk: an index.json holding the recorded
+    upstream site and a map of each request key (method, path with query
+    string and a hash of the request body) to the status, content type and
+    body file of the response.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.upstream = None
+        self.entries = {}
+        index = self.path / self.INDEX_FILE
+        if index.exists():
+            with open(index, encoding='utf-8') as f:
+                data = json.load(f)
+            self.upstream = data.get('upstream')
+            self.entries = data.get('responses', {})
+
+    @staticmethod
+    def key(method, path, body=b''):
+        key = f"{method} {path}"
+        if body:
+            key = f"{key} {hashlib.sha256(body).hexdigest()[:16]}"
+        return key
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Return (status, content_type, body) of a recorded response, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        body = (self.path / entry['file']).read_bytes()
+        return entry['status'], entry['content_type'], body
+
+    def put(self, key, status, content_type, body):
+        name = f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]}.body"
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / name).write_bytes(body)
+        with self.lock:
+            self.entries[key] = {'status': status, 'content_type': content_type, 'file': name}
+
+    def save(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self.lock, open(self.path / self.INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'upstream': self.upstream, 'responses': self.entries},
+                f, ensure_ascii=False, indent=2, sort_keys=True,
+            )
+
+
+class ReplayServer:
+    """
+    Local stand-in for a scraped site. In record mode every request is
+    forwarded to the upstream site and its response stored in the corpus;
+    in replay mode responses are served from the corpus only (unknown
+    requests get a 404 and are counted as misses). Absolute upstream URLs in
+    text responses are rewritten to the local address so the browser keeps
+    talking to the stand-in. An artificial per-response latency can be added
+    to model the remote site.
+    """
+
+    TEXT_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+    FORWARDED_HEADERS = ('Accept', 'Accept-Language', 'Content-Type', 'User-Agent', 'X-Requested-With')
+
+    def __init__(self, corpus, upstream=None, record=False, latency=0.0, host='127.0.0.1', port=0):
+        if record and not upstream:
+            raise ValueError("Recording needs an upstream URL")
+        self.corpus = corpus
+        upstream = upstream or corpus.upstream
+        self.upstream = upstream.rstrip('/') if upstream else None
+        if record:
+            corpus.upstream = self.upstream
+        self.record = record
+        self.latency = latency
+        self.http = urllib3.PoolManager(maxsize=10, block=True) if record else None
+        self.counts = {'hits': 0, 'misses': 0, 'recorded': 0}
+        self.counts_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self.handler_class())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handler_class(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                replay.respond(self)
+
+            def do_POST(self):
+                replay.respond(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def count(self, name):
+        with self.counts_lock:
+            self.counts[name] += 1
+
+    def fetch_upstream(self, request, body):
+        headers = {name: request.headers[name] for name in self.FORWARDED_HEADERS if request.headers.get(name)}
+        response = self.http.request(
+            request.command, f"{self.upstream}{request.path}",
+            body=body or None, headers=headers, redirect=True,
+        )
+        content_type = response.headers.get('Content-Type', 'application/octet-stream')
+        return response.status, content_type, response.data
+
+    def respond(self, request):
+        length = int(request.headers.get('Content-Length') or 0)
+        body = request.rfile.read(length) if length else b''
+        key = ReplayCorpus.key(request.command, request.path, body)
+
+        response = self.corpus.get(key)
+        if response is not None:
+            self.count('hits')
+        elif self.record:
+            try:
+                response = self.fetch_upstream(request, body)
+            except urllib3.exceptions.HTTPError as e:
+                response = (502, 'text/plain', f"Upstream request failed: {e}".encode('utf-8'))
+            else:
+                self.corpus.put(key, *response)
+                self.count('recorded')
+        else:
+            self.count('misses')
+            response = (404, 'text/plain', f"Not recorded: {key}".encode('utf-8'))
+
+        status, content_type, payload = response
+        if self.upstream and content_type.startswith(self.TEXT_TYPES):
+            payload = payload.replace(self.upstream.encode('utf-8'), self.url.encode('utf-8'))
+        if self.latency:
+            time.sleep(self.latency)
+
+        request.send_response(status)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.record:
+            self.corpus.save()
+            self.http.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+@contextmanager
+def scratch_database(alias='default'):
+    """
+    Run the block against a freshly migrated throwaway database (the test
+    database of the alias), so recording and benchmarking never touch real data.
+    """
+    connection = connections[alias]
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
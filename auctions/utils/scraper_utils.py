@@ -0,0 +1,554 @@
+# auctions/utils/scraper_utils.py
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlencode, urljoin
+
+import urllib3
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+
+class ScraperError(Exception):
+    """Raised when a page or API response cannot be turned into auction data."""
+
+
+def details_fingerprint(details):
+    """
+    Stable SHA-256 of an extracted details dict, used to detect auctions
+    that have not changed since they were last saved.
+    """
+    payload = json.dumps(details, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ListingTracker:
+    """
+    Seen-set of the auction codes a crawl discovered across listing pages.
+    The listing is newest first and paginated by offset, so it drifts while
+    a crawl runs: auctions published meanwhile push earlier items onto the
+    next page (they show up twice), and auctions taken down pull later items
+    onto pages already read (they would be skipped). The tracker keeps a
+    snapshot of every page so a re-scan shows what moved, and counts the
+    duplicates avoided and the items recovered.
+    """
+
+    def __init__(self, seen=()):
+        self.seen = set(seen)
+        self.snapshots = {}
+        self.size = None
+        self.counts = {'duplicates': 0, 'recovered': 0, 'drift': 0}
+
+    def take_new(self, codes):
+        new = []
+        for code in codes:
+            if code not in self.seen:
+                self.seen.add(code)
+                new.append(code)
+        return new
+
+    def add_page(self, page_num, codes):
+        """Record a freshly read page; returns (codes not seen before, number of repeats)."""
+        self.snapshots[page_num] = list(codes)
+        new = self.take_new(codes)
+        duplicates = len(codes) - len(new)
+        self.counts['duplicates'] += duplicates
+        if duplicates:
+            self.counts['drift'] += 1
+        return new, duplicates
+
+    def size_changed(self, size):
+        """
+        Record the listing size reported along with a page (total auctions or
+        pages, None when unknown); returns whether it changed since the last
+        page, meaning auctions were published or taken down meanwhile.
+        """
+        if size is None:
+            return False
+        previous, self.size = self.size, size
+        if previous is None or previous == size:
+            return False
+        self.counts['drift'] += 1
+        return True
+
+    def rescan_page(self, page_num, codes):
+        """Record a re-read of a page; returns the codes that were missed so far."""
+        previous = self.snapshots.get(page_num)
+        self.snapshots[page_num] = list(codes)
+        new = self.take_new(codes)
+        self.counts['recovered'] += len(new)
+        if new and previous is not None and previous != list(codes):
+            self.counts['drift'] += 1
+        return new
+
+
+class StageTimer:
+    """
+    Thread-safe recorder of how long each scraping stage took.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = defaultdict(list)
+        self.timeouts = defaultdict(int)
+
+    def record(self, stage, seconds, timed_out=False):
+        with self.lock:
+            self.durations[stage].append(seconds)
+            if timed_out:
+                self.timeouts[stage] += 1
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            yield
+        except TimeoutException:
+            timed_out = True
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - started, timed_out)
+
+    @staticmethod
+    def percentile(sorted_values, fraction):
+        """Nearest-rank percentile of an already sorted list."""
+        index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+        return sorted_values[min(index, len(sorted_values) - 1)]
+
+    def summary(self):
+        """
+        Return {stage: {"count", "total", "avg", "max", "p50", "p95", "p99",
+        "timeouts"}} in seconds.
+        """
+        with self.lock:
+            durations = {stage: sorted(values) for stage, values in self.durations.items()}
+            timeouts = dict(self.timeouts)
+        return {
+            stage: {
+                "count": len(values),
+                "total": sum(values),
+                "avg": sum(values) / len(values),
+                "max": values[-1],
+                "p50": self.percentile(values, 0.50),
+                "p95": self.percentile(values, 0.95),
+                "p99": self.percentile(values, 0.99),
+                "timeouts": timeouts.get(stage, 0),
+            }
+            for stage, values in durations.items()
+        }
+
+
+class PageReadiness:
+    """
+    Event-driven waits for the eaukcija.sud.rs single page app. Instead of
+    sleeping for a fixed time, each wait polls a concrete condition: an
+    element appearing, a tab pane changing, the DOM going quiet (mutation
+    observer) or in-flight fetch/XHR requests reaching zero (tracker injected
+    over CDP). Every wait belongs to a stage with its own timeout and its
+    duration is recorded on the timer.
+    """
+
+    DEFAULT_TIMEOUTS = {
+        'detail': 20,
+        'element': 10,
+        'listing': 10,
+        'tab': 5,
+        'settle': 5,
+    }
+    POLL_FREQUENCY = 0.1
+    IDLE_MS = 300
+
+    # Counts in-flight requests and records the time of the last DOM mutation
+    TRACKER_SCRIPT = """
+        (function () {
+            if (window.__scraperTracker) { return; }
+            window.__scraperTracker = true;
+            window.__scraperPending = 0;
+            window.__scraperLastActivity = Date.now();
+            var touch = function () { window.__scraperLastActivity = Date.now(); };
+            var done = function () { window.__scraperPending--; touch(); };
+            if (window.fetch) {
+                var originalFetch = window.fetch;
+                window.fetch = function () {
+                    window.__scraperPending++; touch();
+                    return originalFetch.apply(this, arguments).finally(done);
+                };
+            }
+            var originalSend = XMLHttpRequest.prototype.send;
+            XMLHttpRequest.prototype.send = function () {
+                window.__scraperPending++; touch();
+                this.addEventListener('loadend', done);
+                return originalSend.apply(this, arguments);
+            };
+            new MutationObserver(touch).observe(document, {
+                childList: true, subtree: true, characterData: true, attributes: true
+            });
+        })();
+    """
+    IDLE_SCRIPT = """
+        if (!window.__scraperTracker) {
+            return document.readyState === 'complete' ? arguments[0] : -1;
+        }
+        return window.__scraperPending > 0 ? -1 : Date.now() - window.__scraperLastActivity;
+    """
+
+    def __init__(self, timeouts=None, timer=None):
+        self.timeouts = {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.timer = timer or StageTimer()
+
+    @classmethod
+    def install(cls, driver):
+        """Inject the request/mutation tracker into every document the driver loads."""
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': cls.TRACKER_SCRIPT})
+        except (AttributeError, WebDriverException):
+            # Not a Chromium driver; settle() falls back to document.readyState
+            pass
+
+    def wait(self, driver, stage, condition, timeout=None):
+        timeout = timeout or self.timeouts.get(stage, self.timeouts['element'])
+        with self.timer.measure(stage):
+            return WebDriverWait(driver, timeout, poll_frequency=self.POLL_FREQUENCY).until(condition)
+
+    def element(self, driver, stage, by, selector, timeout=None):
+        return self.wait(driver, stage, EC.presence_of_element_located((by, selector)), timeout)
+
+    def settle(self, driver, stage='settle', idle_ms=None):
+        """
+        Wait until there are no pending requests and no DOM mutations for idle_ms.
+        Timing out here is not an error: the page is used as it is.
+        """
+        idle_ms = idle_ms or self.IDLE_MS
+        try:
+            self.wait(driver, stage, lambda d: d.execute_script(self.IDLE_SCRIPT, idle_ms) >= idle_ms)
+            return True
+        except TimeoutException:
+            return False
+
+    def text_changed(self, driver, stage, by, selector, previous_text, timeout=None):
+        """Wait until the first element matching the locator has text other than previous_text."""
+        def changed(d):
+            elements = d.find_elements(by, selector)
+            return elements and elements[0].text != previous_text and elements[0]
+        try:
+            return self.wait(driver, stage, changed, timeout)
+        except TimeoutException:
+            return None
+
+
+class BrowserProfile:
+    """
+    Chrome set-up shared by the scrapers. The "full" profile loads pages the
+    way a desktop browser does. The "lean" profile skips everything the
+    extraction never reads: images are disabled, fonts, media and analytics
+    requests are blocked over CDP, extensions are off, the viewport is small
+    and fixed, and navigation returns at DOMContentLoaded (the readiness
+    waits take over from there).
+    """
+
+    CHOICES = ('full', 'lean')
+    CHROMEDRIVER_PATH = "/usr/bin/chromedriver"
+    WINDOW_SIZE = (1280, 900)
+    BLOCKED_URL_PATTERNS = [
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+        '*.mp4', '*.webm',
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*facebook.net*', '*hotjar.com*', '*fonts.googleapis.com*', '*fonts.gstatic.com*',
+    ]
+
+    def __init__(self, name='full', headless=True, arguments=(), performance_log=False):
+        if name not in self.CHOICES:
+            raise ValueError(f"Unknown browser profile: {name}")
+        self.name = name
+        self.headless = headless
+        self.arguments = list(arguments)
+        self.performance_log = performance_log
+
+    @property
+    def lean(self):
+        return self.name == 'lean'
+
+    def options(self):
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless")
+        for argument in self.arguments:
+            options.add_argument(argument)
+        if self.lean:
+            width, height = self.WINDOW_SIZE
+            options.add_argument("--disable-extensions")
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_argument(f"--window-size={width},{height}")
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+            options.page_load_strategy = 'eager'
+        if self.performance_log:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        return options
+
+    def start(self):
+        driver = webdriver.Chrome(service=Service(self.CHROMEDRIVER_PATH), options=self.options())
+        if self.lean:
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.BLOCKED_URL_PATTERNS})
+            except WebDriverException:
+                # Blocking is an optimisation; images stay disabled either way
+                pass
+        else:
+            driver.maximize_window()
+        return driver
+
+
+class LazyWebDriver:
+    """
+    Holds a WebDriver that is only started the first time it is needed,
+    so HTTP-only runs never pay for a Chrome start-up. A driver whose
+    browser has crashed can be replaced in place with restart_if_dead().
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._driver = None
+        self.restarts = 0
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self.factory()
+        return self._driver
+
+    @property
+    def started(self):
+        return self._driver is not None
+
+    def is_alive(self):
+        if self._driver is None:
+            return True
+        try:
+            self._driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def restart_if_dead(self):
+        """Replace a crashed driver with a fresh one; returns True when it restarted."""
+        if self.is_alive():
+            return False
+        try:
+            self._driver.quit()
+        except WebDriverException:
+            pass
+        self._driver = self.factory()
+        self.restarts += 1
+        return True
+
+    def quit(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except WebDriverException:
+                pass
+            self._driver = None
+
+
+class AuctionApiClient:
+    """
+    Client for the JSON API the eaukcija.sud.rs single page app loads its data from.
+    A single pooled connection manager is shared, so the client is safe to use
+    from several worker threads at once. The endpoints and payloads it expects
+    are pinned by the replay corpus in auctions/tests/fixtures/api_corpus; they
+    are not confirmed against the live site yet.
+    """
+
+    BASE_URL = "https://eaukcija.sud.rs"
+    LIST_ENDPOINT = "/api/auctions"
+    DETAIL_ENDPOINT = "/api/auctions/{code}"
+    PAGE_PARAM = "page"
+
+    def __init__(self, base_url=None, pool_size=10, timeout=20, retries=3, site_url=None):
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        # Public address stored as the auction URL, which differs from base_url when replaying
+        self.site_url = (site_url or self.base_url).rstrip('/')
+        self.http = urllib3.PoolManager(
+            maxsize=pool_size,
+            block=True,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=urllib3.Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+            headers={'Accept': 'application/json'},
+        )
+
+    def get_json(self, path, **params):
+        url = f"{self.base_url}{path}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        try:
+            response = self.http.request('GET', url)
+        except urllib3.exceptions.HTTPError as e:
+            raise ScraperError(f"Request to {url} failed: {e}") from e
+
+        if response.status >= 400:
+            raise ScraperError(f"Request to {url} returned HTTP {response.status}")
+        try:
+            return json.loads(response.data.decode('utf-8'))
+        except ValueError as e:
+            raise ScraperError(f"Invalid JSON from {url}: {e}") from e
+
+    def get_listing(self, page_num):
+        return self.get_json(self.LIST_ENDPOINT, **{self.PAGE_PARAM: page_num})
+
+    def get_total_pages(self):
+        listing = self.get_listing(1)
+        return int(listing.get('totalPages') or 1)
+
+    def get_auction_codes(self, page_num):
+        """
+        Return the auctions of a listing page in the same shape as the
+        Selenium listing extraction: a list of {"code", "numeric_code"} dicts.
+        """
+        return self.get_auction_page(page_num)[0]
+
+    def get_auction_page(self, page_num):
+        """The auctions of a listing page, as get_auction_codes, and the total number of auctions listed."""
+        listing = self.get_listing(page_num)
+        auctions = []
+        for item in listing.get('content', []):
+            code = str(item.get('code', ''))
+            numeric_code = ''.join(filter(str.isdigit, code))
+            if numeric_code:
+                auctions.append({"code": code, "numeric_code": numeric_code})
+        total = listing.get('totalElements')
+        return auctions, int(total) if total is not None else None
+
+    def get_details(self, auction_code):
+        data = self.get_json(self.DETAIL_ENDPOINT.format(code=auction_code))
+        detail_url = f"{self.site_url}/#/aukcije/{auction_code}"
+        return AuctionApiMapper.to_details(data, detail_url)
+
+    def close(self):
+        self.http.clear()
+
+
+class AuctionApiMapper:
+    """
+    Maps an API auction payload onto the details dict produced by the Selenium
+    extraction and consumed by save_auction_data.
+    """
+
+    # API field names, kept in one place so they can follow changes on the site
+    FIELDS = {
+        'code': 'code',
+        'status': 'status',
+        'title': 'title',
+        'publication_date': 'publicationDate',
+        'start_time': 'startTime',
+        'end_time': 'endTime',
+        'starting_price': 'startingPrice',
+        'estimated_value': 'estimatedValue',
+        'bidding_step': 'biddingStep',
+        'description': 'description',
+        'sale_number': 'saleNumber',
+        'municipality': 'municipality',
+        'city': 'place',
+        'cadastral_municipality': 'cadastralMunicipality',
+        'category': 'category',
+        'tags': 'tags',
+        'executor': 'executor',
+        'documents': 'documents',
+    }
+    # Keys of a document object that may hold its download link
+    DOCUMENT_URL_KEYS = ('url', 'downloadUrl', 'href')
+
+    @classmethod
+    def field(cls, data, key, default=None):
+        value = data.get(cls.FIELDS[key], default)
+        return default if value is None else value
+
+    @staticmethod
+    def name_of(value):
+        """Lookups come either as plain strings or as objects with a name."""
+        if isinstance(value, dict):
+            value = value.get('name') or value.get('title') or ''
+        return str(value or '').strip()
+
+    @classmethod
+    def document_urls(cls, documents, detail_url):
+        """{name: absolute download URL} of the documents that carry a link."""
+        urls = {}
+        for document in documents:
+            if not isinstance(document, dict):
+                continue
+            name = cls.name_of(document)
+            link = next((document[key] for key in cls.DOCUMENT_URL_KEYS if document.get(key)), None)
+            if name and link:
+                urls[name] = urljoin(detail_url, str(link))
+        return urls
+
+    @staticmethod
+    def parse_datetime(value):
+        if not value:
+            return None
+        parsed = parse_datetime(str(value))
+        if parsed is None:
+            raise ScraperError(f"Invalid date: {value}")
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    @staticmethod
+    def parse_price(value):
+        if value in (None, ''):
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ScraperError(f"Invalid price: {value}")
+
+    @classmethod
+    def to_details(cls, data, detail_url):
+        if not isinstance(data, dict) or not data.get(cls.FIELDS['code']):
+            raise ScraperError("Auction payload has no code")
+
+        additional_info = {
+            "description": str(cls.field(data, 'description', '')).strip(),
+            "sale_number": str(cls.field(data, 'sale_number', '')).strip(),
+            "location": {
+                "municipality": cls.name_of(cls.field(data, 'municipality')),
+                "city": cls.name_of(cls.field(data, 'city')),
+                "cadastral_municipality": cls.name_of(cls.field(data, 'cadastral_municipality')),
+            },
+            "categories": cls.name_of(cls.field(data, 'category')),
+            "tags": [name for name in (cls.name_of(tag) for tag in cls.field(data, 'tags', [])) if name],
+            "executor": cls.name_of(cls.field(data, 'executor')),
+            "documents": [name for name in (cls.name_of(doc) for doc in cls.field(data, 'documents', [])) if name],
+        }
+        document_urls = cls.document_urls(cls.field(data, 'documents', []), detail_url)
+        if document_urls:
+            additional_info["document_urls"] = document_urls
+
+        return {
+            "code": str(cls.field(data, 'code')),
+            "status": cls.name_of(cls.field(data, 'status')),
+            "title": str(cls.field(data, 'title', '')).strip(),
+            "url": detail_url,
+            "publication_date": cls.parse_datetime(cls.field(data, 'publication_date')),
+            "start_time": cls.parse_datetime(cls.field(data, 'start_time')),
+            "end_time": cls.parse_datetime(cls.field(data, 'end_time')),
+            "pricing": {
+                "starting_price": cls.parse_price(cls.field(data, 'starting_price')),
+                "estimated_value": cls.parse_price(cls.field(data, 'estimated_value')),
+                "bidding_step": cls.parse_price(cls.field(data, 'bidding_step')),
+            },
+            "additional_info": additional_info,
+        }
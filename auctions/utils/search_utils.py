@@ -0,0 +1,179 @@
+# auctions/utils/search_utils.py
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from auctions.models import Auction, AuctionDocument
+from .content_utils import SerbianTextConverter
+
+# Search indexes created by migrations 0009_search_index, 0010_search_text
+# and 0012_auctiondocument_search_text
+AUCTION_FTS_TABLE = 'auctions_auction_fts'
+DOCUMENT_FTS_TABLE = 'auctions_auctiondocument_fts'
+
+
+def search_terms(query):
+    """Words of a search query folded like the search_text columns the index is built from."""
+    return re.findall(r'\w+', SerbianTextConverter.fold(query))
+
+
+def backfill_search_text(model, batch_size=500):
+    """
+    Fill search_text of the rows of `model` whose folded text is missing or
+    stale, in primary key order; returns the number of rows updated.
+    """
+    fields = [model._meta.pk.name, 'search_text', *model.search_text_fields]
+    updated = 0
+    last = None
+    while True:
+        rows = model.objects.only(*fields).order_by('pk')
+        if last is not None:
+            rows = rows.filter(pk__gt=last)
+        rows = list(rows[:batch_size])
+        if not rows:
+            return updated
+        last = rows[-1].pk
+        stale = []
+        for row in rows:
+            search_text = row.build_search_text()
+            if search_text != row.search_text:
+                row.search_text = search_text
+                stale.append(row)
+        model.objects.bulk_update(stale, ['search_text'])
+        updated += len(stale)
+
+
+class PostgresSearchBackend:
+    """
+    Searches the `search_vector` tsvector columns generated by PostgreSQL
+    from the folded search text of auctions and documents, through their
+    GIN indexes. Every term of the query is
+    matched as a prefix; results are ranked with ts_rank.
+    """
+
+    def rebuild(self):
+        # Generated columns are always current
+        return False
+
+    @staticmethod
+    def tsquery(terms):
+        return ' & '.join(f"{term}:*" for term in terms)
+
+    def matching(self, queryset, terms):
+        query = self.tsquery(terms)
+        auction = Auction._meta.db_table
+        through = Auction.documents.through._meta.db_table
+        document = AuctionDocument._meta.db_table
+        in_auctions = RawSQL(
+            f"SELECT code FROM {auction} WHERE search_vector @@ to_tsquery('simple', %s)",
+            [query],
+        )
+        in_documents = RawSQL(
+            f'SELECT t.auction_id FROM {through} t JOIN {document} d ON d.id = t.auctiondocument_id '
+            f"WHERE d.search_vector @@ to_tsquery('simple', %s)",
+            [query],
+        )
+        return queryset.filter(Q(pk__in=in_auctions) | Q(pk__in=in_documents)).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({auction}.search_vector, to_tsquery('simple', %s))", [query], output_field=FloatField()
+            ),
+        )
+
+
+class SqliteSearchBackend:
+    """
+    Searches the FTS5 tables over the folded search text of auctions and
+    documents, kept in step with their tables by triggers. Every term is
+    matched as a prefix; results are ranked with bm25.
+    """
+
+    def rebuild(self):
+        """
+        Re-read the FTS tables from their content tables. The auction index
+        refers to auction rowids, which VACUUM may renumber.
+        """
+        with connection.cursor() as cursor:
+            for table in (AUCTION_FTS_TABLE, DOCUMENT_FTS_TABLE):
+                cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+        return True
+
+    @staticmethod
+    def match_expression(terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def matching(self, queryset, terms):
+        query = self.match_expression(terms)
+        auction = Auction._meta.db_table
+        through = Auction.documents.through._meta.db_table
+        in_auctions = RawSQL(
+            f'SELECT code FROM {auction} WHERE rowid IN '
+            f'(SELECT rowid FROM {AUCTION_FTS_TABLE} WHERE {AUCTION_FTS_TABLE} MATCH %s)',
+            [query],
+        )
+        in_documents = RawSQL(
+            f'SELECT auction_id FROM {through} WHERE auctiondocument_id IN '
+            f'(SELECT rowid FROM {DOCUMENT_FTS_TABLE} WHERE {DOCUMENT_FTS_TABLE} MATCH %s)',
+            [query],
+        )
+        # bm25 is lower for better matches; auctions only matched through documents rank last
+        return queryset.filter(Q(pk__in=in_auctions) | Q(pk__in=in_documents)).annotate(
+            search_rank=RawSQL(
+                f'COALESCE((SELECT -bm25({AUCTION_FTS_TABLE}) FROM {AUCTION_FTS_TABLE} '
+                f'WHERE {AUCTION_FTS_TABLE} MATCH %s AND rowid = {auction}.rowid), 0)',
+                [query],
+                output_field=FloatField(),
+            ),
+        )
+
+
+class ScanSearchBackend:
+    """Databases without a search index: substring scans of the folded search text, unranked."""
+
+    def rebuild(self):
+        return False
+
+    def matching(self, queryset, terms):
+        condition = Q()
+        for term in terms:
+            condition &= Q(search_text__contains=term) | Q(documents__search_text__contains=term)
+        return queryset.filter(condition).distinct().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class AuctionSearch:
+    """
+    Full-text search of auctions by code, title, description and document
+    text, in either script. The index is the database's own: tsvector
+    columns with GIN indexes on PostgreSQL, FTS5 tables on SQLite, so a
+    search costs index lookups rather than a scan of the auction table.
+    Auctions and documents are indexed by their folded search_text and
+    queries are folded the same way, so "cacak", "čačak" and "чачак" find
+    the same auctions on every backend.
+    """
+
+    BACKENDS = {
+        'postgresql': PostgresSearchBackend,
+        'sqlite': SqliteSearchBackend,
+    }
+
+    @classmethod
+    def backend(cls):
+        return cls.BACKENDS.get(connection.vendor, ScanSearchBackend)()
+
+    @classmethod
+    def search(cls, queryset, query):
+        """
+        Filter `queryset` to the auctions matching `query`, annotated with
+        `search_rank` (higher is better); the queryset is returned unchanged
+        when the query has no words.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return queryset
+        return cls.backend().matching(queryset, terms)
+
+    @classmethod
+    def rebuild(cls):
+        """Rebuild the search index where it is not maintained by the database; returns whether it was."""
+        return cls.backend().rebuild()
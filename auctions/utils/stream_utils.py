@@ -0,0 +1,127 @@
+# auctions/utils/stream_utils.py
+import gzip
+import io
+import json
+import sys
+
+from django.utils.dateparse import parse_datetime
+
+from .metrics_utils import RunMetrics
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Details fields holding datetimes; they travel as ISO 8601 strings
+DATETIME_FIELDS = ('publication_date', 'start_time', 'end_time')
+
+
+def encode_record(details):
+    """One details dict as a single JSONL line."""
+    record = dict(details)
+    for field in DATETIME_FIELDS:
+        if record.get(field) is not None:
+            record[field] = record[field].isoformat()
+    return json.dumps(record, ensure_ascii=False, sort_keys=True) + '\n'
+
+
+def decode_record(line):
+    """The details dict of one JSONL line, as the scraper extracted it."""
+    details = json.loads(line)
+    if not isinstance(details, dict):
+        raise ValueError("Record is not a JSON object")
+    for field in DATETIME_FIELDS:
+        if details.get(field):
+            value = parse_datetime(details[field])
+            if value is None:
+                raise ValueError(f"Invalid {field}: {details[field]}")
+            details[field] = value
+    return details
+
+
+def open_output(path, append=False):
+    """Open a JSONL file for writing; a .gz suffix writes gzip."""
+    mode = 'at' if append else 'wt'
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def open_input(path):
+    """
+    Open a JSONL stream for reading, `-` being stdin. Gzip is recognized by
+    its magic bytes, so compressed files need no particular suffix.
+    """
+    raw = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    stream = io.BufferedReader(raw) if not isinstance(raw, io.BufferedReader) else raw
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+    return io.TextIOWrapper(stream, encoding='utf-8')
+
+
+def iter_records(path, on_error=None):
+    """
+    Yield (line number, details) for every record of a JSONL stream, one line
+    at a time. Blank lines are skipped; undecodable lines are passed to
+    on_error(line number, error) and skipped, or raise without it.
+    """
+    with open_input(path) as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                details = decode_record(line)
+            except ValueError as e:
+                if on_error is None:
+                    raise
+                on_error(number, e)
+                continue
+            yield number, details
+
+
+class AuctionJsonlWriter:
+    """
+    Streams scraped auction details to a JSONL file, one normalized record
+    per line, instead of writing them to the database. Every record is
+    flushed as soon as it is written; the codes are reported to on_flush
+    once per batch, like AuctionBulkWriter does after a commit, so the scrape
+    checkpoint only covers records already on disk.
+    """
+
+    def __init__(self, path, batch_size=50, append=False, on_flush=None, log=None, metrics=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.stream = open_output(path, append=append)
+        self.metrics = metrics or RunMetrics('jsonl_writer')
+        self.on_flush = on_flush
+        self.log = log
+        self.pending = []
+        self.counts = {'written': 0, 'failed': 0}
+
+    def add(self, details):
+        """Write one details dict and report the batch once it is full."""
+        if not details.get('code') or not details.get('title'):
+            self.counts['failed'] += 1
+            return
+        with self.metrics.measure('output_write'):
+            try:
+                line = encode_record(details)
+            except (TypeError, ValueError, AttributeError) as e:
+                self.counts['failed'] += 1
+                if self.log:
+                    self.log(f"Could not encode auction {details['code']}: {str(e)}")
+                return
+            self.stream.write(line)
+            self.stream.flush()
+        self.counts['written'] += 1
+        self.pending.append(details['code'])
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        done, self.pending = self.pending, []
+        if done and self.on_flush:
+            self.on_flush(done)
+
+    def close(self):
+        self.flush()
+        self.stream.close()
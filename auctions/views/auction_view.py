@@ -1,24 +1,21 @@
 # views/auction_view.py
 from django.utils import timezone
 from .base_view import BaseListView, BaseDetailView
+from .mixins_view import PageCacheMixin
 from django.utils.translation import gettext_lazy as _, gettext
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_control
 from ..models import Auction, Category, Location
-from django.db.models import Q
+from ..utils.search_utils import AuctionSearch
 from django.utils.timezone import now
 
 @method_decorator(cache_control(public=True, max_age=3600), name='dispatch')
-class AuctionListView(BaseListView):
+class AuctionListView(PageCacheMixin, BaseListView):
     model = Auction
     template_name = 'auctions/auction_list.html'
     ordering = 'end_time'
+    cache_tags = ('auction', 'category', 'location', 'document')
     
-    def get_search_fields(self):
-        """Get language-specific search fields"""
-        fields = self.get_language_specific_fields()
-        return [fields['title'], fields['description']]
-        
     def get_queryset(self):
         queryset = super().get_queryset()
         
@@ -31,14 +28,12 @@ class AuctionListView(BaseListView):
         if filters:
             queryset = queryset.filter(**filters)
             
-        # Apply search
+        # Apply search, best matches first
         search_query = self.request.GET.get('q')
         if search_query:
-            search_fields = self.get_search_fields()
-            q_objects = Q()
-            for field in search_fields:
-                q_objects |= Q(**{f"{field}__icontains": search_query})
-            queryset = queryset.filter(q_objects)
+            queryset = AuctionSearch.search(queryset, search_query)
+            if 'search_rank' in queryset.query.annotations:
+                queryset = queryset.order_by('-search_rank', self.ordering)
         
         return queryset
     
@@ -59,35 +54,13 @@ class AuctionListView(BaseListView):
         if location:
             title_parts.append(str(location.title))
 
-        # Get base active auctions queryset
-        active_auctions = self.model.objects.filter(
-            is_active=True
-        ) 
-               
-        # Apply filters to active auctions count
-        filters = {}
-        if category:
-            filters['category'] = category
-        if location:
-            filters['location'] = location
-        
-        if filters:
-            active_auctions = active_auctions.filter(**filters)
-        
-        # Apply search to active auctions if exists
-        if search_query:
-            search_fields = self.get_search_fields()
-            q_objects = Q()
-            for field in search_fields:
-                q_objects |= Q(**{f"{field}__icontains": search_query})
-            active_auctions = active_auctions.filter(q_objects)        
-               
         context.update({
             'meta_title': ' | '.join(title_parts),
             'meta_description': self.get_meta_description(category, search_query),
             'categories': Category.objects.filter(is_active=True),
             'locations': Location.objects.filter(is_active=True),
-            'active_auctions': active_auctions.count()
+            # The paginator has already counted the filtered active auctions
+            'active_auctions': context['paginator'].count
         })
         
         return context
@@ -102,15 +75,15 @@ class AuctionListView(BaseListView):
                 parts.append(str(location.title))
         
         if category:
-            parts.append(_('{category} auctions').format(category=category.title))
+            parts.append(gettext('{category} auctions').format(category=category.title))
         else:
-            parts.append(_('auctions'))
+            parts.append(gettext('auctions'))
             
         if not search_query and not category and not location_slug:
             return _('Browse our latest auctions')
         
         if search_query:
-            parts.append(_('Search results for {query}').format(query=search_query))   
+            parts.append(gettext('Search results for {query}').format(query=search_query))   
                      
         return _('Browse {description}').format(description=' '.join(parts))
 
@@ -159,10 +132,17 @@ class AuctionListView(BaseListView):
         return breadcrumbs
 
 @method_decorator(cache_control(public=True, max_age=3600), name='dispatch')
-class AuctionDetailView(BaseDetailView):
+class AuctionDetailView(PageCacheMixin, BaseDetailView):
     """Detail view for displaying auction information with related auctions and navigation."""
     model = Auction
     template_name = 'auctions/auction_detail.html'
+    # Neighbouring and related auctions are on the page too
+    cache_tags = ('auction', 'category', 'location', 'executor', 'tag', 'document')
+    
+    def get_cache_timeout(self):
+        """Do not keep the page past the end of the auction, when it stops being shown."""
+        remaining = (self.object.end_time - timezone.now()).total_seconds()
+        return max(0, min(super().get_cache_timeout(), int(remaining)))
     
     def get_queryset(self):
         """Optimize queryset with required related fields."""
@@ -1,5 +1,6 @@
 # views/category_views.py
 from .base_view import BaseListView, BaseDetailView
+from .mixins_view import PageCacheMixin
 from ..models import Category, Auction
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
@@ -8,11 +9,12 @@ from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
 @method_decorator(cache_control(public=True, max_age=3600), name='dispatch')
-class CategoryListView(BaseListView):
+class CategoryListView(PageCacheMixin, BaseListView):
     """View for listing categories"""
     model = Category
     template_name = 'auctions/category_list.html'
     ordering = 'title_sr'  # Order by Serbian title by default
+    cache_tags = ('category', 'auction')
     
     def get_queryset(self):
         """Get only root categories (no parent)"""
@@ -21,15 +23,6 @@ class CategoryListView(BaseListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Add auction counts for each category
-        categories = context['object_list']
-        for category in categories:
-            category.active_auction_count = Auction.objects.filter(
-                category=category,
-                is_active=True,
-                end_time__gt=timezone.now()
-            ).count()
-        
         context.update({
             'meta_title': _('Categories | Auctions'),
             'meta_description': _('Browse auction categories'),
@@ -1,5 +1,6 @@
 # views/executor_view.py
 from .base_view import BaseListView, BaseDetailView
+from .mixins_view import PageCacheMixin
 from ..models import Executor, Auction
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_control
@@ -7,28 +8,21 @@ from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
 @method_decorator(cache_control(public=True, max_age=3600), name='dispatch')
-class ExecutorListView(BaseListView):
+class ExecutorListView(PageCacheMixin, BaseListView):
     """View for listing executors"""
     model = Executor
     template_name = 'auctions/executor_list.html'
     ordering = 'title_sr'  # Order by Serbian title by default
+    cache_tags = ('executor', 'auction')
 
-    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Add auction counts for each executor
-        executors = context['object_list']
-        for executor in executors:
-            executor.active_auction_count = Auction.objects.filter(
-                executor=executor,
-                is_active=True,
-            ).count()
-        
         context.update({
             'meta_title': _('Executors| Auctions'),
             'meta_description': _('Browse auction executors'),
-            'total_executors': self.model.objects.filter(is_active=True).count()
+            # The paginator has already counted the active executors
+            'total_executors': context['paginator'].count
         })
         
         return context
@@ -1,6 +1,10 @@
 # views/mixins_view.py
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
 from django.utils.translation import gettext_lazy as _, get_language
 from django.urls import reverse
+from ..utils.cache_utils import PageCache, ViewCounter
 
 class LanguageAwareMixin:
     """Mixin for handling language-specific content and URLs"""
@@ -125,4 +129,52 @@ class URLHandlerMixin:
             'alternate_sr': alternate_sr,
             'alternate_lat': alternate_lat,
             'current_url': current_url,
-        }
\ No newline at end of file
+        }
+
+class PageCacheMixin:
+    """
+    Mixin serving rendered pages from PageCache. Only anonymous GET requests
+    are cached: a request carrying a session or pending messages renders
+    normally. A cached page is keyed by language, URL and query parameters
+    and the versions of `cache_tags`, which the model signals bump, so a hit
+    needs no query; views of cached detail pages go through ViewCounter.
+    """
+    cache_tags = ()
+    # Cookies that make a page personal
+    uncached_cookies = (settings.SESSION_COOKIE_NAME, 'messages')
+
+    def get_cache_tags(self):
+        return self.cache_tags
+
+    def get_cache_timeout(self):
+        return settings.PAGE_CACHE_TIMEOUT
+
+    def is_page_cacheable(self, request):
+        return request.method == 'GET' and not any(name in request.COOKIES for name in self.uncached_cookies)
+
+    def get_view_count_key(self):
+        """(model label, pk) to count views of a cached page under, if the page counts views."""
+        obj = getattr(self, 'object', None)
+        if obj is not None and hasattr(obj, 'increment_view_count'):
+            return obj._meta.label_lower, obj.pk
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = PageCache.page_key(
+            get_language(), request.build_absolute_uri(request.path), request.GET, self.get_cache_tags()
+        )
+        entry = PageCache.get(key)
+        if entry is not None:
+            if entry['view_count']:
+                ViewCounter.record(*entry['view_count'])
+            return HttpResponse(PageCache.render(entry, get_token(request)), content_type=entry['content_type'])
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(
+                lambda rendered: PageCache.set(key, rendered, self.get_view_count_key(), self.get_cache_timeout())
+            )
+        return response
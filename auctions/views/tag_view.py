@@ -1,17 +1,13 @@
 # views/tag_view.py
-from django.db.models import Count
 from .base_view import BaseListView, BaseDetailView
+from .mixins_view import PageCacheMixin
 from ..models import Tag, Auction
 
-class TagListView(BaseListView):
+class TagListView(PageCacheMixin, BaseListView):
     model = Tag
     template_name = 'auctions/tag_list.html'
     context_object_name = 'tags'
-    
-    def get_queryset(self):
-        return super().get_queryset().annotate(
-            auction_count=Count('auction')
-        )
+    cache_tags = ('tag', 'auction')
     
     def get_breadcrumbs(self):
         return [
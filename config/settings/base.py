@@ -126,6 +126,24 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Uploaded and scraped files (auction documents)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Cache of rendered pages (see auctions.utils.cache_utils.PageCache); pages
+# are invalidated when the models they show change, the timeout only bounds
+# how long time-dependent content (running vs. ended auctions) can lag.
+# The local memory cache is per process: invalidations and view counts from
+# the scraper or Celery only reach the web process with a shared cache, which
+# production configures
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auctions',
+    }
+}
+PAGE_CACHE_TIMEOUT = 3600
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -138,10 +156,34 @@ CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
 
+# The site's JSON API (AuctionApiClient) is not confirmed against recorded
+# responses yet; scrape_auctions offers --engine=http only once it is enabled
+AUCTION_API_ENABLED = False
+
+# Auction refresh scheduler: page fetches allowed per hour across all passes,
+# and seconds between passes. The scheduler fetches over the JSON API only
+# (AuctionApiClient), which is not confirmed yet, so the refresh_auctions task
+# does nothing and has no beat entry until it is enabled
+AUCTION_REFRESH_ENABLED = False
+AUCTION_REFRESH_BUDGET_PER_HOUR = 120
+AUCTION_REFRESH_INTERVAL = 300
+
 # Celery Beat Settings
 CELERY_BEAT_SCHEDULE = {
     'update-auction-status': {
         'task': 'auctions.tasks.auction_tasks.update_auction_status',
         'schedule': 60.0,  # every minute - adjust as needed
     },
+    'extract-document-texts': {
+        'task': 'auctions.tasks.auction_tasks.extract_document_texts',
+        'schedule': 30 * 60.0,  # documents without text are picked up every 30 minutes
+    },
+    'flush-view-counts': {
+        'task': 'auctions.tasks.auction_tasks.flush_view_counts',
+        'schedule': 5 * 60.0,  # views of cached pages reach the database every 5 minutes
+    },
+    'reconcile-auction-counters': {
+        'task': 'auctions.tasks.auction_tasks.reconcile_auction_counters',
+        'schedule': 6 * 60 * 60.0,  # counters are recounted from the auctions every 6 hours
+    },
 }
\ No newline at end of file
@@ -22,6 +22,16 @@ DATABASES = {
     }
 }
 
+# Shared page cache, so invalidations and view counts from the scraper and
+# Celery reach every web process; prefixed, as other apps may share the database
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://your-production-redis-url:6379/1',
+        'KEY_PREFIX': 'auctions',
+    }
+}
+
 # Production Celery settings
 CELERY_BROKER_URL = 'redis://your-production-redis-url:6379/0'
 CELERY_RESULT_BACKEND = 'redis://your-production-redis-url:6379/0'
\ No newline at end of file
@@ -0,0 +1,9 @@
+from .development import *
+
+# Tests run in one process and need no Redis server
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auctions-tests',
+    }
+}